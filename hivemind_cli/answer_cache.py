@@ -0,0 +1,90 @@
+"""Cache of librarian answers for repeated questions.
+
+Answers are keyed by the normalized question plus a hash of the exact
+librarian prompt that was sent, so any change to the expert catalog (or to
+the prompt chosen for a question) makes old answers unreachable. Entries
+expire after a TTL and the least recently used ones are evicted beyond a
+maximum count.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+
+
+def cache_key(question: str, prompt: str) -> str:
+    """Key for a question asked against a specific librarian prompt."""
+    prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+    return hashlib.sha256(
+        f"{normalize_question(question)}\0{prompt_hash}".encode()
+    ).hexdigest()
+
+
+class AnswerCache:
+    """JSON-file answer cache with TTL expiry and LRU eviction."""
+
+    # Serializes read-modify-write cycles between threads (batch queries)
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._path = path
+        self._ttl = ttl
+        self._max_entries = max_entries
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self._path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, entries: dict) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(f".{self._path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entries))
+        os.replace(tmp, self._path)
+
+    def get(self, key: str) -> str | None:
+        """Return a fresh cached answer, or None."""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            now = time.time()
+            if entry is None or now - entry["created"] > self._ttl:
+                return None
+            entry["used"] = now
+            self._save(entries)
+            return entry["answer"]
+
+    def put(self, key: str, answer: str) -> None:
+        """Store an answer, dropping expired and least recently used entries."""
+        with self._lock:
+            now = time.time()
+            entries = {
+                k: e for k, e in self._load().items() if now - e["created"] <= self._ttl
+            }
+            entries[key] = {"answer": answer, "created": now, "used": now}
+            if len(entries) > self._max_entries:
+                keep = sorted(entries, key=lambda k: entries[k]["used"])
+                for k in keep[: len(entries) - self._max_entries]:
+                    del entries[k]
+            self._save(entries)
@@ -0,0 +1,275 @@
+"""Compact, token-budgeted librarian catalog entries.
+
+Each expert gets a descriptor: its agent.md description plus the first prose
+paragraph of summary.md, cleaned of markdown noise. Descriptors are cached
+per HEAD commit, so they are computed once when an expert is analyzed or
+switched rather than on every regeneration.
+
+fit_catalog() renders descriptors into catalog entries under a token budget.
+When over budget, lower priority experts are shortened first, one level at a
+time: drop the overview, then truncate the description, then list the
+expert by name only.
+
+fit_descriptions() does the same for the agent descriptions assistants load
+into every session: keep one sentence, then truncate, then leave the expert
+undeployed.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+
+DESCRIPTOR_VERSION = 1
+DEFAULT_MAX_TOKENS = 6000
+
+# Longest overview kept in a descriptor, in sentences
+OVERVIEW_SENTENCES = 3
+
+# Description length once an expert is shortened to its second level
+TRUNCATED_DESCRIPTION_TOKENS = 40
+
+# Agent description length once trimmed to fit the context budget
+TRIMMED_DESCRIPTION_TOKENS = 25
+
+ENTRY_SEPARATOR = "\n\n---\n\n"
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z`*\"'(])")
+
+# Opening sentence of generated agent descriptions
+_LEAD_RE = re.compile(r"Expert on\b")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the model token count of text.
+
+    Counts words and punctuation, with long words costing extra; close to
+    BPE tokenizers for English prose and markdown without needing one.
+    """
+    tokens = 0
+    for piece in re.findall(r"\w+|[^\w\s]", text):
+        tokens += 1 + len(piece) // 8
+    return tokens
+
+
+def _clean(text: str) -> str:
+    """Strip inline markdown (emphasis, code, links) and collapse whitespace."""
+    text = re.sub(r"!?\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"[*_`]{1,3}([^*_`]+)[*_`]{1,3}", r"\1", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _first_sentences(text: str, count: int) -> str:
+    return " ".join(_SENTENCE_END_RE.split(text)[:count])
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text at a word boundary to about max_tokens."""
+    words: list[str] = []
+    tokens = 0
+    for word in text.split():
+        tokens += estimate_tokens(word)
+        if tokens > max_tokens:
+            return " ".join(words).rstrip(",;:") + " …"
+        words.append(word)
+    return text
+
+
+def extract_overview(summary: str) -> str:
+    """Return the first prose paragraph of summary.md, skipping headings,
+    lists, tables, quotes and code blocks."""
+    paragraph: list[str] = []
+    in_code = False
+    for line in summary.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        prose = stripped and not in_code and not re.match(r"[#|>\-*+]|\d+\.", stripped)
+        if prose:
+            paragraph.append(stripped)
+        elif paragraph:
+            break
+    return _first_sentences(_clean(" ".join(paragraph)), OVERVIEW_SENTENCES)
+
+
+def build_descriptor(name: str, description: str, summary: str) -> dict:
+    """Build the compact descriptor for an expert."""
+    description = _clean(description)
+    overview = extract_overview(summary)
+    return {"name": name, "description": description, "overview": overview}
+
+
+def _render(descriptor: dict, level: int) -> str:
+    """Catalog entry at a detail level (0 = full ... 2 = truncated description)."""
+    heading = f"### expert-{descriptor['name']}"
+    description = descriptor["description"]
+    if level >= 2:
+        description = _truncate(description, TRUNCATED_DESCRIPTION_TOKENS)
+    if level == 0 and descriptor["overview"]:
+        return f"{heading}\n{description}\n\n{descriptor['overview']}"
+    return f"{heading}\n{description}"
+
+
+def _priority(name: str, patterns: list[str]) -> int:
+    """Index of the first matching priority pattern (lower is kept longer)."""
+    for i, pattern in enumerate(patterns):
+        if fnmatch.fnmatchcase(name, pattern):
+            return i
+    return len(patterns)
+
+
+def fit_catalog(
+    descriptors: list[dict],
+    *,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    priority: list[str] | None = None,
+) -> tuple[str, list[str]]:
+    """Render a catalog of expert entries that fits within a token budget.
+
+    Args:
+        descriptors: Expert descriptors in catalog order
+        max_tokens: Budget for all entries together
+        priority: fnmatch patterns; earlier matches are shortened last, and
+            unmatched experts are shortened first
+
+    Returns:
+        (catalog text with entries in catalog order, names of experts listed
+        by name only)
+    """
+    patterns = priority or []
+    separator = estimate_tokens(ENTRY_SEPARATOR)
+    levels = {d["name"]: 0 for d in descriptors}
+    rendered = {d["name"]: _render(d, 0) for d in descriptors}
+    costs = {name: estimate_tokens(text) + separator for name, text in rendered.items()}
+    total = sum(costs.values())
+
+    # Cheapest to lose first: lowest priority, then the largest entries
+    order = sorted(
+        descriptors,
+        key=lambda d: (-_priority(d["name"], patterns), -costs[d["name"]]),
+    )
+    for level in (1, 2, 3):
+        for descriptor in order:
+            if total <= max_tokens:
+                break
+            name = descriptor["name"]
+            if levels[name] >= level:
+                continue
+            levels[name] = level
+            text = "" if level == 3 else _render(descriptor, level)
+            # Name-only experts share one line; count each name on its own
+            if level == 3:
+                cost = estimate_tokens(f"expert-{name}, ")
+            else:
+                cost = estimate_tokens(text) + separator
+            total += cost - costs[name]
+            rendered[name], costs[name] = text, cost
+
+    entries = [rendered[d["name"]] for d in descriptors if levels[d["name"]] < 3]
+    name_only = [d["name"] for d in descriptors if levels[d["name"]] == 3]
+    if name_only:
+        entries.append(
+            "### Other experts\n" + ", ".join(f"expert-{name}" for name in name_only)
+        )
+    return ENTRY_SEPARATOR.join(entries), name_only
+
+
+def listing_tokens(agent: str, description: str) -> int:
+    """Estimated tokens an agent's listing (name and description) adds to a session."""
+    return estimate_tokens(f"{agent}: {description}")
+
+
+def _trim_description(description: str, level: int) -> str:
+    """Agent description at a trim level (0 = full, 1 = one sentence, 2 = truncated).
+
+    The kept sentence skips a leading "Expert on <repo>." (see the agent.md
+    template), which only restates the agent's name, so trimming keeps the
+    topics that route questions to the expert.
+    """
+    if level >= 1:
+        sentences = _SENTENCE_END_RE.split(description)
+        if len(sentences) > 1 and _LEAD_RE.match(sentences[0]):
+            sentences = sentences[1:]
+        description = sentences[0]
+    if level >= 2:
+        description = _truncate(description, TRIMMED_DESCRIPTION_TOKENS)
+    return description
+
+
+def fit_descriptions(
+    descriptions: dict[str, str],
+    *,
+    max_tokens: int | None = None,
+    max_experts: int | None = None,
+    priority: list[str] | None = None,
+    usage: dict[str, int] | None = None,
+    reserved: int = 0,
+) -> tuple[dict[str, str], list[str]]:
+    """Fit deployed agent descriptions into a session context budget.
+
+    With max_experts, only that many experts (highest priority, then most
+    used first) are deployed. Then, while over max_tokens, lower priority experts are
+    shortened first, one level at a time: keep one sentence (past the
+    "Expert on <repo>." lead), then truncate, then leave the expert
+    undeployed.
+
+    Args:
+        descriptions: Expert name -> agent description, in catalog order
+        max_tokens: Budget for all agent listings, including reserved
+        max_experts: Most experts to deploy
+        priority: fnmatch patterns; earlier matches are trimmed last
+        usage: Expert name -> delegation count; among equal priority, the
+            least used are trimmed first
+        reserved: Tokens already taken by other agents (e.g. the librarian)
+
+    Returns:
+        (expert name -> description for deployed experts, in catalog order;
+        names of experts not deployed)
+    """
+    patterns = priority or []
+    usage = usage or {}
+    # Cheapest to lose first: lowest priority, least used, then the longest
+    # descriptions
+    order = sorted(
+        descriptions,
+        key=lambda n: (
+            -_priority(n, patterns),
+            usage.get(n, 0),
+            -estimate_tokens(descriptions[n]),
+        ),
+    )
+    levels = {name: 0 for name in descriptions}
+    if max_experts is not None:
+        by_priority = sorted(
+            descriptions, key=lambda n: (_priority(n, patterns), -usage.get(n, 0))
+        )
+        for name in by_priority[max_experts:]:
+            levels[name] = 3
+
+    def cost(name: str) -> int:
+        if levels[name] == 3:
+            return 0
+        text = _trim_description(descriptions[name], levels[name])
+        return listing_tokens(f"expert-{name}", text)
+
+    costs = {name: cost(name) for name in descriptions}
+    total = reserved + sum(costs.values())
+    if max_tokens is not None:
+        for level in (1, 2, 3):
+            for name in order:
+                if total <= max_tokens:
+                    break
+                if levels[name] >= level:
+                    continue
+                levels[name] = level
+                total -= costs[name]
+                costs[name] = cost(name)
+                total += costs[name]
+
+    fitted = {
+        name: _trim_description(description, levels[name])
+        for name, description in descriptions.items()
+        if levels[name] < 3
+    }
+    return fitted, [name for name in descriptions if levels[name] == 3]
@@ -2,107 +2,70 @@
 
 from __future__ import annotations
 
-import asyncio
-import json
-import os
-import shutil
-import subprocess
-import tempfile
-import time
 import typing
 from pathlib import Path
 
 import typer
-from rich import box
-from rich.console import Console
-from rich.live import Live
-from rich.panel import Panel
-from rich.table import Table
-from rich.theme import Theme
-from rich.traceback import install as install_traceback
-
-from hivemind_cli.templates import (
-    create_expert_prompt,
-)
-from hivemind_cli.core import (
-    _load_json,
-    _save_json,
-    _load_config,
-    _save_config,
-    _load_repos,
-    _save_repos,
-    _load_private_repos,
-    _save_private_repos,
-    _is_private_expert,
-    _get_expert_dir,
-    _get_provider,
-    _expert_names,
-    _get_head_commit,
-    _count_versions,
-    _ensure_repos_link,
-    _ensure_external_docs_link,
-    _deploy_agent,
-    _undeploy_agent,
-    _deploy_expert,
-    _undeploy_expert,
-    _clone_repo,
-    _analyze_repo,
-    _update_librarian,
-    update_expert,
-    enable_expert as core_enable_expert,
-    disable_expert as core_disable_expert,
-    redeploy_all_agents,
-    switch_provider,
-    UpdatePhase,
-    ProgressInfo,
-    HIVEMIND_ROOT,
-    CACHE_DIR,
-    REPOS_DIR,
-    REPOS_LINK,
-    EXTERNAL_DOCS_DIR,
-    EXTERNAL_DOCS_LINK,
-    REPOS_JSON,
-    CONFIG_JSON,
-    AGENTS_DIR,
-    EXPERTS_DIR,
-    PRIVATE_EXPERTS_DIR,
-    PRIVATE_REPOS_JSON,
-    COMMANDS_DIR,
-    SETTINGS_JSON,
-)
 
-THEME = Theme(
-    {
-        "success": "green",
-        "error": "red",
-        "warning": "yellow",
-        "info": "cyan",
-        "heading": "bold",
-        "commit": "cyan",
-    }
-)
+# Heavy dependencies (rich, core, providers, templates) are imported inside the
+# commands that use them so that `--help`, shell completion and quick status
+# checks don't pay for the whole stack at startup.
+
+THEME = {
+    "success": "green",
+    "error": "red",
+    "warning": "yellow",
+    "info": "cyan",
+    "heading": "bold",
+    "commit": "cyan",
+}
 
 app = typer.Typer(
     name="hivemind",
     help="Manage expert agents for AI coding platforms.",
     no_args_is_help=True,
 )
-console = Console(theme=THEME)
-install_traceback(show_locals=True, console=console)
 
-# Paths imported from core module
 
+class _LazyConsole:
+    """Rich console proxy that builds the real console on first use."""
+
+    _console = None
+
+    def __getattr__(self, attr: str):
+        if self._console is None:
+            from rich.console import Console
+            from rich.theme import Theme
+            from rich.traceback import install as install_traceback
+
+            self._console = Console(theme=Theme(THEME))
+            install_traceback(show_locals=True, console=self._console)
+        return getattr(self._console, attr)
+
+    # Rich's Live and Progress use the console as a context manager, and
+    # special methods are looked up on the type, bypassing __getattr__
+    def __enter__(self):
+        return self.__getattr__("__enter__")()
+
+    def __exit__(self, *exc_info) -> None:
+        self.__getattr__("__exit__")(*exc_info)
+
+
+console = _LazyConsole()
+
+
+def _complete_expert(incomplete: str) -> list[tuple[str, str]]:
+    """Shell completion for expert names, with status hints."""
+    from hivemind_cli.completion import expert_candidates
 
-def _complete_expert(incomplete: str) -> list[str]:
-    """Shell completion for expert names."""
-    return [n for n in _expert_names() if n.startswith(incomplete)]
+    return expert_candidates(incomplete)
 
 
 def _complete_provider(incomplete: str) -> list[str]:
     """Shell completion for provider names."""
-    from hivemind_cli.providers import PROVIDER_CLASSES
+    from hivemind_cli.completion import provider_candidates
 
-    return [n for n in PROVIDER_CLASSES if n.startswith(incomplete)]
+    return provider_candidates(incomplete)
 
 
 def _setup_symlink(target: Path, link: Path, label: str) -> None:
@@ -129,82 +92,55 @@ def _setup_symlink(target: Path, link: Path, label: str) -> None:
     console.print(f"  [success]✓[/success] {label} → {target}")
 
 
-# Wrapper functions to add console output to core module functions
-def _deploy_agent_cli(name: str) -> bool:
-    """Wrapper for _deploy_agent that adds console output."""
-    result = _deploy_agent(name)
-    if result:
-        console.print(f"  [success]✓[/success] {name}: agent deployed")
-    else:
-        expert_dir = _get_expert_dir(name)
-        head_link = expert_dir / "HEAD"
-        if not head_link.exists():
-            console.print(
-                f"  [warning]![/warning] {name}: no HEAD, skipping agent deploy"
-            )
-        else:
-            console.print(
-                f"  [warning]![/warning] {name}: no agent.md in HEAD, skipping agent deploy"
-            )
-    return result
-
+def _daemon_client():
+    """Return a client for the running daemon, or None to work in-process."""
+    from hivemind_cli.daemon import DaemonClient
 
-def _undeploy_agent_cli(name: str) -> None:
-    """Wrapper for _undeploy_agent that adds console output."""
-    _undeploy_agent(name)
-    console.print(f"  [success]✓[/success] {name}: agent removed")
+    return DaemonClient.connect()
 
 
-def _deploy_expert_cli(name: str) -> bool:
-    """Wrapper for _deploy_expert that adds console output."""
-    result = _deploy_expert(name)
-    if result:
-        console.print(f"  [success]✓[/success] {name}: expert deployed")
-    else:
-        console.print(f"  [warning]![/warning] {name}: expert directory not found")
-    return result
-
-
-def _clone_repo_cli(name: str, repos: dict) -> bool:
-    """Wrapper for _clone_repo that adds console output."""
-    if name not in repos:
-        console.print(
-            f"  [warning]![/warning] {name}: not in repos.json, skipping clone"
-        )
-        return False
+def _daemon_call(client, method: str, params: dict | None = None, on_event=None):
+    """Call the daemon, turning daemon-side failures into a CLI error."""
+    from hivemind_cli.daemon import DaemonError
 
-    repo_dir = REPOS_DIR / name
-    if repo_dir.is_dir():
-        return True  # Already cloned
+    try:
+        return client.call(method, params, on_event=on_event)
+    except DaemonError as e:
+        console.print(f"[error]Error (daemon): {e}[/error]")
+        raise typer.Exit(1)
 
-    repo = repos[name]
-    commit = repo.get("commit", "")
-    ref_name = repo.get("ref_name", "")
 
-    if commit:
-        console.print(f"  Cloning {name} at {commit[:12]}...")
-    elif ref_name:
-        console.print(f"  Cloning {name} at ref {ref_name}...")
-    else:
-        console.print(f"  Cloning {name} (default branch)...")
+def _print_update_progress(info, prefix: str = "  ") -> None:
+    """Print an update ProgressInfo the way `hivemind update` shows it."""
+    from hivemind_cli.core import UpdatePhase
 
-    result = _clone_repo(name, repos, silent=False)
+    if info.phase == UpdatePhase.ANALYZING:
+        console.print(f"{prefix}[info]→[/info] {info.message}")
+    elif info.phase not in [UpdatePhase.CLONING, UpdatePhase.FETCHING]:
+        console.print(f"{prefix}[success]✓[/success] {info.message}")
 
-    if result:
-        if commit:
-            console.print(
-                f"  [success]✓[/success] {name}: cloned at commit {commit[:12]}"
-            )
-        elif ref_name:
-            console.print(f"  [success]✓[/success] {name}: cloned at ref {ref_name}")
-        else:
-            console.print(f"  [success]✓[/success] {name}: cloned (default branch)")
 
-    return result
+def _print_update_result(result: dict, prefix: str = "  ") -> bool:
+    """Print the outcome of an expert update; returns True if it changed HEAD."""
+    if not result["success"]:
+        console.print(f"{prefix}[error]✗[/error] {result['error']}")
+        return False
+    if result.get("already_up_to_date"):
+        console.print(
+            f"{prefix}[success]✓[/success] Already up to date ({result['new_commit'][:12]})"
+        )
+        return False
+    old_display = result["old_commit"][:12] if result["old_commit"] else "none"
+    console.print(
+        f"{prefix}[success]✓[/success] Updated from {old_display} to {result['new_commit'][:12]}"
+    )
+    return True
 
 
 def _update_librarian_cli() -> None:
     """Wrapper for _update_librarian that adds console output."""
+    from hivemind_cli.core import _update_librarian
+
     _update_librarian()
     console.print("  [success]✓[/success] Librarian updated")
 
@@ -212,23 +148,105 @@ def _update_librarian_cli() -> None:
 # --- Commands ---
 
 
+def _init_experts_cli(events) -> dict:
+    """Show init_experts() events: a line per expert under an aggregate progress bar.
+
+    Returns:
+        The redeploy_all_agents() result that activated the agents trees
+    """
+    from rich.progress import (
+        BarColumn,
+        MofNCompleteColumn,
+        Progress,
+        TextColumn,
+        TimeElapsedColumn,
+    )
+
+    start = next(events)
+    if start["cloning"]:
+        console.print(f"  Cloning {len(start['cloning'])} repos...")
+    progress = Progress(
+        TextColumn("[heading]{task.description}"),
+        BarColumn(bar_width=None),
+        MofNCompleteColumn(),
+        TextColumn("[dim]{task.fields[left]}"),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    )
+    remaining = set(start["cloning"])
+    failed = 0
+    with progress:
+        task_id = progress.add_task("Experts", total=start["total"], left="")
+        for event in events:
+            if event["event"] == "activated":
+                break
+            name = event["name"]
+            remaining.discard(name)
+            if event["event"] == "failed":
+                failed += 1
+                progress.console.print(f"  [error]✗[/error] {name}: clone failed: {event['error']}")
+            elif event["cloned"]:
+                progress.console.print(f"  [success]✓[/success] {name}: cloned")
+            elif not event["in_repos"]:
+                progress.console.print(
+                    f"  [warning]![/warning] {name}: not in repos.json, skipping clone"
+                )
+            if event["deployed"]:
+                progress.console.print(f"  [success]✓[/success] {name}: expert deployed")
+            else:
+                progress.console.print(f"  [warning]![/warning] {name}: expert directory not found")
+            left = f"{len(remaining)} clone{'s' if len(remaining) != 1 else ''} left"
+            progress.update(task_id, advance=1, left=left if remaining else "")
+    if failed:
+        console.print(
+            f"  [warning]{failed} clone{'s' if failed != 1 else ''} failed; "
+            "run hivemind init again to retry[/warning]"
+        )
+    return event["result"]
+
+
 @app.command()
-def init() -> None:
+def init(
+    jobs: int = typer.Option(4, "--jobs", "-j", help="Repos to clone at once"),
+    full: bool = typer.Option(
+        False, "--full", help="Make full clones instead of partial (blobless) ones"
+    ),
+) -> None:
     """Set up provider directory symlinks and enable agents."""
-    provider = _get_provider()
+    import shutil
+
+    from hivemind_cli.core import (
+        COMMANDS_DIR,
+        EXTERNAL_DOCS_DIR,
+        HIVEMIND_ROOT,
+        REPOS_DIR,
+        SETTINGS_JSON,
+        _ensure_external_docs_link,
+        _ensure_repos_link,
+        _deploy_targets,
+        _load_config,
+        _editing_config,
+        _refresh_completion_index,
+        init_experts,
+    )
+
+    targets = _deploy_targets()
+    provider = targets[0][0]
     console.print(
         f"[heading]Initializing hivemind (provider: {provider.name})...[/heading]\n"
     )
 
-    # Use provider to initialize directory structure
-    results = provider.init_dirs(
-        agents_dir=AGENTS_DIR,
-        commands_dir=COMMANDS_DIR,
-        rules_source=HIVEMIND_ROOT / "HIVEMIND.md",
-        settings_source=SETTINGS_JSON if provider.name == "claude" else None,
-    )
-    for label, status_msg in results:
-        console.print(f"  [success]✓[/success] {label}: {status_msg}")
+    # Use each deployed provider to initialize its directory structure
+    for target_provider, agents_dir in targets:
+        results = target_provider.init_dirs(
+            agents_dir=agents_dir,
+            commands_dir=COMMANDS_DIR,
+            rules_source=HIVEMIND_ROOT / "HIVEMIND.md",
+            settings_source=SETTINGS_JSON if target_provider.name == "claude" else None,
+        )
+        for label, status_msg in results:
+            console.print(f"  [success]✓[/success] {label}: {status_msg}")
 
     _ensure_repos_link()
     console.print(f"  [success]✓[/success] repos/ → {REPOS_DIR}")
@@ -236,30 +254,15 @@ def init() -> None:
     console.print(f"  [success]✓[/success] external_docs/ → {EXTERNAL_DOCS_DIR}")
 
     config = _load_config()
-    repos = _load_repos()
 
     console.print()
-    for name in config["enabled"]:
-        _clone_repo_cli(name, repos)
-        _deploy_agent_cli(name)
-        _deploy_expert_cli(name)
-
-    _update_librarian_cli()
+    # Agents and librarian are swapped in as one complete tree
+    events = init_experts(config["enabled"], jobs=jobs, partial=not full)
+    _print_redeploy(_init_experts_cli(events))
 
     # Mark provider as enabled in config
-    provider_name = provider.name
-    if not config.get("providers", {}).get(provider_name, {}).get("enabled"):
-        config.setdefault("providers", {}).setdefault(provider_name, {})["enabled"] = (
-            True
-        )
-        _save_config(config)
-
-    # Remove stale agent files
-    for f in AGENTS_DIR.glob("expert-*.md"):
-        expert_name = f.name.removeprefix("expert-").removesuffix(".md")
-        if expert_name not in config["enabled"]:
-            f.unlink()
-            console.print(f"  [error]✗[/error] Removed stale: {f.name}")
+    with _editing_config() as config:
+        config.setdefault("providers", {}).setdefault(provider.name, {})["enabled"] = True
 
     # Clean up stale expert symlinks in provider dir
     provider_experts = provider.home_dir / "experts"
@@ -270,17 +273,30 @@ def init() -> None:
                 if link.is_symlink():
                     link.unlink()
                 elif link.is_dir():
-                    import shutil
-
                     shutil.rmtree(link)
                 console.print(f"  [error]✗[/error] Removed stale expert: {expert_name}")
 
+    _refresh_completion_index(config)
+
     console.print("\n[bold success]Hivemind initialized![/bold success]")
 
 
 @app.command(name="list")
 def list_experts() -> None:
     """Show all experts with their status."""
+    from rich import box
+    from rich.table import Table
+
+    from hivemind_cli.core import (
+        _count_versions,
+        _expert_names,
+        _get_expert_dir,
+        _get_head_commit,
+        _load_config,
+        _load_private_repos,
+        _load_repos,
+    )
+
     config = _load_config()
     repos = _load_repos()
     private_repos = _load_private_repos()
@@ -373,7 +389,10 @@ def add(
     ),
 ) -> None:
     """Register a new repo expert, clone, analyze, and create agent."""
-    # Derive name from URL
+    from rich.panel import Panel
+
+    from hivemind_cli.core import UpdatePhase, add_expert
+
     name = url.rstrip("/").split("/")[-1].removesuffix(".git")
 
     console.print(f"[heading]Adding expert: {name}[/heading]")
@@ -383,228 +402,124 @@ def add(
             f"  [warning]Mode: PRIVATE (will not be committed to git)[/warning]"
         )
 
-    # Error out early if expert already exists (check both public and private)
-    public_expert_dir = EXPERTS_DIR / name
-    private_expert_dir = PRIVATE_EXPERTS_DIR / name
-    if public_expert_dir.is_dir() or private_expert_dir.is_dir():
-        console.print(
-            f"[error]Error: expert '{name}' already exists. "
-            f"Use [bold]hivemind update {name}[/bold] instead.[/error]"
-        )
-        raise typer.Exit(1)
-
-    # Resolve commit from ref (if provided)
-    commit = ""
-    ref_name = ref or ""
-    if ref:
-        console.print(f"  Resolving ref '{ref}'...")
-        try:
-            result = subprocess.run(
-                ["git", "ls-remote", url, ref],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-            if result.stdout.strip():
-                commit = result.stdout.strip().split()[0]
-            else:
-                commit = ref
-                ref_name = ref
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            commit = ref
-        console.print(f"  Commit: {commit}")
-
-    # All work happens in a temp directory — nothing visible until success
-    tmpdir = tempfile.mkdtemp(prefix=f"hivemind-{name}-")
-    tmp_repo = Path(tmpdir) / "repo"
-    tmp_expert = Path(tmpdir) / "expert"
-    tmp_expert.mkdir()
-
-    try:
-        # Clone repo into temp directory
-        console.print(f"  Cloning {name}...")
-        if commit and ref_name:
-            subprocess.run(
-                ["git", "clone", "--progress", url, str(tmp_repo)],
-                check=True,
-            )
-            subprocess.run(
-                ["git", "checkout", "--quiet", commit],
-                cwd=str(tmp_repo),
-                check=True,
-            )
-        elif ref_name:
-            subprocess.run(
-                [
-                    "git",
-                    "clone",
-                    "--progress",
-                    "--branch",
-                    ref_name,
-                    url,
-                    str(tmp_repo),
-                ],
-                check=True,
-            )
+    def on_progress(info) -> None:
+        if info.phase in (UpdatePhase.CHECKING, UpdatePhase.CLONING):
+            console.print(f"  {info.message}")
         else:
-            subprocess.run(
-                ["git", "clone", "--progress", url, str(tmp_repo)],
-                check=True,
-            )
-        console.print(f"  [success]✓[/success] Cloned to staging area")
-
-        # Resolve commit hash from clone if not pinned
-        if not commit:
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                cwd=str(tmp_repo),
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            commit = result.stdout.strip()
-            console.print(f"  [success]✓[/success] Resolved commit: {commit[:12]}")
+            _print_update_progress(info)
 
-        # Create versioned directory in temp expert dir
-        tmp_commit_dir = tmp_expert / commit
-        tmp_commit_dir.mkdir(parents=True, exist_ok=True)
-        console.print(
-            f"  [success]✓[/success] Created staging experts/{name}/{commit[:12]}/"
-        )
-
-        # Run AI analysis — writes into temp dirs
-        with console.status(
-            f"[heading]Running AI analysis of {name}...[/heading]", spinner="dots"
-        ):
-            success = _analyze_repo(name, commit, tmp_repo, tmp_expert)
-        if not success:
-            console.print(f"[error]Error: AI analysis failed for {name}[/error]")
-            raise typer.Exit(1)
-        console.print(f"  [success]✓[/success] AI analysis complete")
-
-        # --- Success: move everything to final locations ---
-
-        # Move repo to final location
-        _ensure_repos_link()
-        final_repo = REPOS_DIR / name
-        if final_repo.exists():
-            shutil.rmtree(final_repo)
-        shutil.move(str(tmp_repo), str(final_repo))
-        console.print(f"  [success]✓[/success] Repo installed to repos/{name}/")
-
-        # Move expert dir to final location (public or private)
-        if private:
-            expert_dir = PRIVATE_EXPERTS_DIR / name
-            PRIVATE_EXPERTS_DIR.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(tmp_expert), str(expert_dir))
+    result = add_expert(
+        url, ref, private=private, on_progress=on_progress, silent=False
+    )
+    if not result["success"]:
+        if result.get("already_exists"):
             console.print(
-                f"  [success]✓[/success] Expert installed to private-experts/{name}/"
+                f"[error]Error: expert '{name}' already exists. "
+                f"Use [bold]hivemind update {name}[/bold] instead.[/error]"
             )
         else:
-            expert_dir = EXPERTS_DIR / name
-            EXPERTS_DIR.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(tmp_expert), str(expert_dir))
-            console.print(f"  [success]✓[/success] Expert installed to experts/{name}/")
-
-        # Create HEAD symlink
-        head_link = expert_dir / "HEAD"
-        head_link.symlink_to(commit)
-        console.print(f"  [success]✓[/success] HEAD → {commit[:12]}")
-
-        # Update repos.json or private-repos.json
-        if private:
-            repos = _load_private_repos()
-            repos[name] = {"remote": url, "commit": commit, "ref_name": ref_name}
-            _save_private_repos(repos)
-            console.print("  [success]✓[/success] Added to private-repos.json")
-        else:
-            repos = _load_repos()
-            repos[name] = {"remote": url, "commit": commit, "ref_name": ref_name}
-            _save_repos(repos)
-            console.print("  [success]✓[/success] Added to repos.json")
-
-        # Enable in config and mark as private if needed
-        config = _load_config()
-        if name not in config["enabled"]:
-            config["enabled"].append(name)
-        if name in config["disabled"]:
-            config["disabled"].remove(name)
-        if private:
-            config.setdefault("private", [])
-            if name not in config["private"]:
-                config["private"].append(name)
-        _save_config(config)
-        console.print("  [success]✓[/success] Enabled in config.json")
-
-        # Deploy agent and expert
-        _deploy_agent_cli(name)
-        _deploy_expert_cli(name)
-        _update_librarian_cli()
-
-        summary_lines = [
-            f"[success]✓[/success] Expert [heading]{name}[/heading] is ready",
-            f"[success]✓[/success] HEAD → [commit]{commit[:12]}[/commit]",
-            f"[success]✓[/success] Agent: [heading]expert-{name}[/heading]",
-        ]
-        console.print()
-        console.print(
-            Panel(
-                "\n".join(summary_lines),
-                title="[bold success]Expert created successfully[/bold success]",
-                border_style="green",
-            )
+            console.print(f"[error]Error: {result['error']}[/error]")
+        raise typer.Exit(1)
+
+    commit = result["commit"]
+    summary_lines = [
+        f"[success]✓[/success] Expert [heading]{name}[/heading] is ready",
+        f"[success]✓[/success] HEAD → [commit]{commit[:12]}[/commit]",
+        f"[success]✓[/success] Agent: [heading]expert-{name}[/heading]",
+    ]
+    console.print()
+    console.print(
+        Panel(
+            "\n".join(summary_lines),
+            title="[bold success]Expert created successfully[/bold success]",
+            border_style="green",
         )
+    )
 
-    finally:
-        shutil.rmtree(tmpdir, ignore_errors=True)
+
+def _resolve_names(names: list[str] | None, category: str | None) -> list[str]:
+    """Combine explicit expert names with the members of a category."""
+    names = list(names or [])
+    if category:
+        from hivemind_cli.core import _category_members
+
+        members = _category_members(category)
+        if not members:
+            console.print(f"[error]Error: no experts in category '{category}'[/error]")
+            raise typer.Exit(1)
+        names.extend(n for n in members if n not in names)
+    if not names:
+        console.print("[error]Error: give expert names or --category[/error]")
+        raise typer.Exit(1)
+    return names
 
 
 @app.command()
 def enable(
-    name: str = typer.Argument(
-        help="Expert name to enable", autocompletion=_complete_expert
+    names: typing.Optional[list[str]] = typer.Argument(
+        None, help="Expert name(s) to enable", autocompletion=_complete_expert
+    ),
+    category: typing.Optional[str] = typer.Option(
+        None, "--category", "-c", help="Enable every expert in a category"
     ),
 ) -> None:
-    """Enable an expert (clones repo if needed, creates agent symlink)."""
-    result = core_enable_expert(name)
-
-    if not result["success"]:
-        console.print(f"[error]Error: {result['error']}[/error]")
-        raise typer.Exit(1)
+    """Enable experts (clones repos if needed, creates agent symlinks)."""
+    names = _resolve_names(names, category)
+    client = _daemon_client()
+    if client:
+        results = _daemon_call(client, "enable", {"names": names})["results"]
+    else:
+        from hivemind_cli.core import enable_experts
 
-    repos = _load_repos()
-    _clone_repo_cli(name, repos)
-    _deploy_agent_cli(name)
+        results = enable_experts(names)
 
-    if result["already_enabled"]:
-        console.print(
-            f"[success]✓[/success] {name}: already enabled, ensured repo and agent link"
-        )
-    else:
-        console.print(f"[success]✓[/success] Enabled: {name}")
+    failed = False
+    for name, result in results.items():
+        if not result["success"]:
+            console.print(f"[error]Error: {name}: {result['error']}[/error]")
+            failed = True
+        elif result["already_enabled"]:
+            console.print(
+                f"[success]✓[/success] {name}: already enabled, ensured repo and agent link"
+            )
+        else:
+            console.print(f"[success]✓[/success] Enabled: {name}")
+    if failed:
+        raise typer.Exit(1)
 
 
 @app.command()
 def disable(
-    name: str = typer.Argument(
-        help="Expert name to disable", autocompletion=_complete_expert
+    names: typing.Optional[list[str]] = typer.Argument(
+        None, help="Expert name(s) to disable", autocompletion=_complete_expert
+    ),
+    category: typing.Optional[str] = typer.Option(
+        None, "--category", "-c", help="Disable every expert in a category"
     ),
 ) -> None:
-    """Disable an expert (removes agent symlink)."""
-    result = core_disable_expert(name)
-
-    if not result["success"]:
-        console.print(f"[error]Error: {result['error']}[/error]")
-        raise typer.Exit(1)
+    """Disable experts (removes agent symlinks)."""
+    names = _resolve_names(names, category)
+    client = _daemon_client()
+    if client:
+        results = _daemon_call(client, "disable", {"names": names})["results"]
+    else:
+        from hivemind_cli.core import disable_experts
 
-    _undeploy_agent_cli(name)
+        results = disable_experts(names)
 
-    if result["already_disabled"]:
-        console.print(
-            f"[warning]✓[/warning] {name}: already disabled, ensured agent link removed"
-        )
-    else:
-        console.print(f"[warning]✓[/warning] Disabled: {name}")
+    failed = False
+    for name, result in results.items():
+        if not result["success"]:
+            console.print(f"[error]Error: {name}: {result['error']}[/error]")
+            failed = True
+        elif result["already_disabled"]:
+            console.print(
+                f"[warning]✓[/warning] {name}: already disabled, ensured agent link removed"
+            )
+        else:
+            console.print(f"[warning]✓[/warning] Disabled: {name}")
+    if failed:
+        raise typer.Exit(1)
 
 
 @app.command()
@@ -621,6 +536,15 @@ def update(
     ),
 ) -> None:
     """Fetch latest commits and re-analyze with AI."""
+    from hivemind_cli.core import (
+        ProgressInfo,
+        UpdatePhase,
+        _load_config,
+        _load_repos,
+        update_expert,
+    )
+    from hivemind_cli.scheduler import record_update
+
     config = _load_config()
     repos = _load_repos()
 
@@ -639,36 +563,43 @@ def update(
     # Track which experts need updating (not already up to date)
     experts_to_update: list[str] = []
 
-    for expert_name in names:
-        console.print(f"\n[heading]Updating {expert_name}...[/heading]")
-
-        # Define progress callback for CLI
-        def on_progress(info: ProgressInfo):
-            if info.phase == UpdatePhase.ANALYZING:
-                console.print(f"  [info]→[/info] {info.message}")
-            elif info.phase not in [UpdatePhase.CLONING, UpdatePhase.FETCHING]:
-                console.print(f"  [success]✓[/success] {info.message}")
-
-        result = update_expert(
-            expert_name, on_progress=on_progress, skip_analysis=skip_analysis
+    client = _daemon_client()
+    if client:
+        # The daemon runs updates from its shared job queue (concurrently) and
+        # regenerates the librarian itself
+        console.print(f"[heading]Updating {len(names)} expert(s) via daemon...[/heading]")
+
+        def on_event(event: dict) -> None:
+            info = ProgressInfo(**{**event, "phase": UpdatePhase(event["phase"])})
+            _print_update_progress(info, prefix=f"  {info.expert_name}: ")
+
+        response = _daemon_call(
+            client,
+            "update",
+            {"names": names, "skip_analysis": skip_analysis},
+            on_event=on_event,
         )
+        for expert_name, result in response["results"].items():
+            if _print_update_result(result, prefix=f"  {expert_name}: "):
+                experts_to_update.append(expert_name)
+    else:
+        for expert_name in names:
+            console.print(f"\n[heading]Updating {expert_name}...[/heading]")
 
-        if not result["success"]:
-            console.print(f"  [error]✗[/error] {result['error']}")
-        elif result.get("already_up_to_date"):
-            console.print(
-                f"  [success]✓[/success] Already up to date ({result['new_commit'][:12]})"
+            result = update_expert(
+                expert_name,
+                on_progress=_print_update_progress,
+                skip_analysis=skip_analysis,
             )
-        else:
-            old_display = result["old_commit"][:12] if result["old_commit"] else "none"
-            console.print(
-                f"  [success]✓[/success] Updated from {old_display} to {result['new_commit'][:12]}"
-            )
-            experts_to_update.append(expert_name)
+            record_update(expert_name, result, analyzed=not skip_analysis)
+            if _print_update_result(result):
+                experts_to_update.append(expert_name)
+
+        # Regenerate librarian if any experts were updated
+        if experts_to_update:
+            _update_librarian_cli()
 
-    # Regenerate librarian if any experts were updated
     if experts_to_update:
-        _update_librarian_cli()
         console.print(f"\n[bold success]Update complete.[/bold success]")
     else:
         console.print("\n[success]All experts are up to date.[/success]")
@@ -676,29 +607,370 @@ def update(
 
 @app.command()
 def query(
-    question: str = typer.Argument(help="Question to ask the librarian"),
+    question: typing.Optional[str] = typer.Argument(
+        None, help="Question to ask the librarian"
+    ),
+    local: bool = typer.Option(
+        False,
+        "--local",
+        help="Rank experts with the offline index instead of calling the engine",
+    ),
+    top_k: typing.Optional[int] = typer.Option(
+        None,
+        "--top-k",
+        "-k",
+        help="Number of experts to show (--local) or to send to the librarian",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Always ask the engine, bypassing cached answers"
+    ),
+    semantic: bool = typer.Option(
+        False,
+        "--semantic",
+        help="With --local, rank by n-gram similarity to also match paraphrases",
+    ),
+    timeout: float = typer.Option(
+        300, "--timeout", help="Seconds to wait for the engine before giving up"
+    ),
+    batch: typing.Optional[Path] = typer.Option(
+        None,
+        "--batch",
+        help="File with one question per line ('-' for stdin); writes JSONL results",
+    ),
+    jobs: int = typer.Option(4, "--jobs", "-j", help="Concurrent engine calls for --batch"),
+    output: typing.Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Write --batch results here instead of stdout"
+    ),
 ) -> None:
     """Ask the librarian which expert(s) can help with a question."""
-    librarian = AGENTS_DIR / "librarian.md"
-    if not librarian.exists():
+    if semantic and not local:
+        console.print("[error]Error: --semantic requires --local[/error]")
+        raise typer.Exit(1)
+    if (batch is None) == (question is None) or (batch and local):
+        console.print(
+            "[error]Error: give either a question or --batch (without --local)[/error]"
+        )
+        raise typer.Exit(1)
+    if batch:
+        _query_batch(batch, output, jobs=jobs, top_k=top_k, no_cache=no_cache, timeout=timeout)
+        return
+    if local:
+        _print_local_matches(question, top_k or 5, semantic=semantic)
+        return
+
+    from hivemind_cli.core import AGENTS_DIR, query_librarian
+
+    if not (AGENTS_DIR / "librarian.md").exists():
         console.print(
             "[error]Error: librarian.md not found. Run [bold]hivemind init[/bold] first.[/error]"
         )
         raise typer.Exit(1)
 
-    provider = _get_provider()
-    system_prompt = librarian.read_text()
-    cmd = provider.build_query_command()
-
-    with console.status("Asking the librarian...", spinner="dots"):
-        result = subprocess.run(
-            cmd,
-            input=f"{system_prompt}\n\n{question}",
-            text=True,
-            capture_output=True,
+    try:
+        result = _stream_answer(
+            lambda on_output: query_librarian(
+                question,
+                top_k=top_k,
+                use_cache=not no_cache,
+                on_output=on_output,
+                timeout=timeout,
+            )
         )
-    if result.stdout:
-        console.print(result.stdout.rstrip())
+    except KeyboardInterrupt:
+        console.print("\n[warning]Query cancelled.[/warning]")
+        raise typer.Exit(130)
+    if result.get("cached"):
+        note = "[dim](cached answer, use --no-cache to ask again)[/dim]"
+        if console.is_terminal:
+            console.print(note)
+        else:
+            # Keep piped stdout to the answer alone
+            from rich.console import Console
+            from rich.theme import Theme
+
+            Console(stderr=True, theme=Theme(THEME)).print(note)
+    if not result["success"]:
+        console.print(f"[error]Error: {result['error']}[/error]")
+        raise typer.Exit(1)
+
+
+def _query_batch(
+    batch: Path,
+    output: Path | None,
+    *,
+    jobs: int,
+    top_k: int | None,
+    no_cache: bool,
+    timeout: float,
+) -> None:
+    """Run every question in a file and write one JSON result per line."""
+    import json
+    import sys
+
+    from hivemind_cli.core import AGENTS_DIR, query_librarian_batch
+
+    if not (AGENTS_DIR / "librarian.md").exists():
+        console.print(
+            "[error]Error: librarian.md not found. Run [bold]hivemind init[/bold] first.[/error]"
+        )
+        raise typer.Exit(1)
+
+    text = sys.stdin.read() if str(batch) == "-" else batch.read_text()
+    questions = [
+        line.strip()
+        for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    if not questions:
+        console.print("[warning]No questions in batch file.[/warning]")
+        raise typer.Exit(1)
+
+    # With results on stdout, keep progress and the summary on stderr
+    from rich.console import Console
+    from rich.theme import Theme
+
+    status_console = console if output else Console(stderr=True, theme=Theme(THEME))
+    out = output.open("w") if output else sys.stdout
+    failed = cached = 0
+    try:
+        with status_console.status("Querying...", spinner="dots") as status:
+            results = query_librarian_batch(
+                questions, jobs=jobs, top_k=top_k, use_cache=not no_cache, timeout=timeout
+            )
+            for done, result in enumerate(results, 1):
+                failed += not result["success"]
+                cached += bool(result.get("cached"))
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                status.update(f"Querying... {done}/{len(questions)}")
+    except KeyboardInterrupt:
+        status_console.print("[warning]Batch cancelled.[/warning]")
+        raise typer.Exit(130)
+    finally:
+        if output:
+            out.close()
+
+    status_console.print(
+        f"[success]✓[/success] {len(questions)} question(s), "
+        f"{cached} cached, {failed} failed"
+        + (f" → {output}" if output else "")
+    )
+    if failed:
+        raise typer.Exit(1)
+
+
+def _stream_answer(run: typing.Callable[[typing.Callable[[str], None]], dict]) -> dict:
+    """Call run(on_output) and show the answer as it streams in.
+
+    On a terminal a spinner shows until the first text arrives, then the
+    answer is re-rendered as markdown as it grows; otherwise the raw text is
+    written straight to stdout.
+    """
+    if not console.is_terminal:
+        import sys
+
+        written: list[str] = []
+
+        def write(text: str) -> None:
+            written.append(text)
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        result = run(write)
+        if written and not written[-1].endswith("\n"):
+            sys.stdout.write("\n")
+        return result
+
+    from rich.live import Live
+    from rich.markdown import Markdown
+
+    chunks: list[str] = []
+    status = console.status("Asking the librarian...", spinner="dots")
+    live = Live(console=console, refresh_per_second=8, vertical_overflow="visible")
+
+    def on_output(text: str) -> None:
+        if not chunks:
+            status.stop()
+            live.start()
+        chunks.append(text)
+        live.update(Markdown("".join(chunks)))
+
+    status.start()
+    try:
+        return run(on_output)
+    finally:
+        status.stop()
+        live.stop()
+
+
+def _print_local_matches(question: str, limit: int, *, semantic: bool = False) -> None:
+    """Print experts ranked by the offline routing index."""
+    from rich.table import Table
+
+    from hivemind_cli.core import rank_experts
+
+    try:
+        matches = rank_experts(question, limit, semantic=semantic)
+    except ImportError:
+        console.print(
+            "[error]Error: --semantic needs numpy. "
+            "Install it with [bold]uv tool install -e '.[semantic]'[/bold][/error]"
+        )
+        raise typer.Exit(1)
+    if not matches:
+        console.print("[warning]No matching experts.[/warning]")
+        raise typer.Exit(1)
+
+    table = Table(show_header=True, header_style="bold", box=None)
+    width = max(len(match["name"]) for match in matches) + len("expert-")
+    table.add_column("Expert", style="heading", no_wrap=True)
+    table.add_column("Score", justify="right", no_wrap=True)
+    table.add_column(
+        "Description",
+        overflow="ellipsis",
+        no_wrap=True,
+        max_width=max(20, console.width - width - 12),
+    )
+    for match in matches:
+        table.add_row(
+            f"expert-{match['name']}",
+            f"{match['score']:.{2 if semantic else 1}f}",
+            match["description"],
+        )
+    console.print(table)
+
+
+@app.command()
+def ask(
+    question: str = typer.Argument(help="Question for the expert(s)"),
+    experts: int = typer.Option(
+        3, "--experts", "-n", help="Most experts to ask when their relevance is tied"
+    ),
+    timeout: float = typer.Option(
+        600, "--timeout", help="Seconds to wait for each expert before giving up"
+    ),
+) -> None:
+    """Route a question locally and ask the best matching expert(s) directly."""
+    from hivemind_cli.core import ask_experts
+
+    import threading
+
+    answers: dict[str, list[str]] = {}
+    lock = threading.Lock()
+
+    if console.is_terminal:
+        from rich.console import Group
+        from rich.live import Live
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
+        status = console.status("Asking the experts...", spinner="dots")
+        live = Live(console=console, refresh_per_second=8, vertical_overflow="visible")
+
+        def on_output(name: str, text: str) -> None:
+            with lock:
+                if not answers:
+                    status.stop()
+                    live.start()
+                answers.setdefault(name, []).append(text)
+                live.update(
+                    Group(
+                        *(
+                            Panel(
+                                Markdown("".join(chunks)),
+                                title=f"expert-{expert}",
+                                title_align="left",
+                                border_style="blue",
+                            )
+                            for expert, chunks in answers.items()
+                        )
+                    )
+                )
+
+        def finish() -> None:
+            status.stop()
+            live.stop()
+
+        status.start()
+    else:
+        import sys
+
+        # Label each complete line, since several experts may answer at once
+        def on_output(name: str, text: str) -> None:
+            with lock:
+                pending = "".join(answers.pop(name, [])) + text
+                *lines, rest = pending.split("\n")
+                for line in lines:
+                    sys.stdout.write(f"expert-{name}: {line}\n")
+                sys.stdout.flush()
+                answers[name] = [rest]
+
+        def finish() -> None:
+            for name, chunks in answers.items():
+                if "".join(chunks):
+                    sys.stdout.write(f"expert-{name}: {''.join(chunks)}\n")
+
+    try:
+        # Stop the live display (or flush partial lines) however it ends
+        try:
+            results = ask_experts(
+                question, max_experts=experts, on_output=on_output, timeout=timeout
+            )
+        finally:
+            finish()
+    except KeyboardInterrupt:
+        console.print("\n[warning]Cancelled.[/warning]")
+        raise typer.Exit(130)
+
+    if not results:
+        console.print(
+            "[warning]No expert matches this question. "
+            "Try [bold]hivemind query[/bold] to ask the librarian.[/warning]"
+        )
+        raise typer.Exit(1)
+    for result in results:
+        if not result["success"]:
+            console.print(f"[error]expert-{result['name']}: {result['error']}[/error]")
+    if not any(result["success"] for result in results):
+        raise typer.Exit(1)
+
+
+@app.command()
+def search(
+    terms: list[str] = typer.Argument(help="Words to search for (end with * for prefix)"),
+    expert: typing.Optional[str] = typer.Option(
+        None,
+        "--expert",
+        "-e",
+        help="Only search this expert's docs",
+        autocompletion=_complete_expert,
+    ),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum number of results"),
+) -> None:
+    """Search knowledge docs and crawled docs of all experts."""
+    from rich.markup import escape
+
+    from hivemind_cli.core import CACHE_DIR, HIVEMIND_ROOT, search_docs
+    from hivemind_cli.search import MATCH_END, MATCH_START
+
+    hits = search_docs(" ".join(terms), expert=expert, limit=limit)
+    if not hits:
+        console.print("[warning]No matches.[/warning]")
+        raise typer.Exit(1)
+
+    for hit in hits:
+        if hit.path.is_relative_to(HIVEMIND_ROOT):
+            location = hit.path.relative_to(HIVEMIND_ROOT)
+        elif hit.path.is_relative_to(CACHE_DIR):
+            location = hit.path.relative_to(CACHE_DIR)
+        else:
+            location = hit.path
+        snippet = (
+            escape(hit.snippet.strip())
+            .replace(MATCH_START, "[bold warning]")
+            .replace(MATCH_END, "[/bold warning]")
+        )
+        console.print(f"[heading]{location}:{hit.line}[/heading]  {snippet}")
 
 
 # --- Provider subcommands ---
@@ -714,7 +986,11 @@ app.add_typer(provider_app, name="provider")
 @provider_app.command(name="list")
 def provider_list() -> None:
     """List available providers and their status."""
-    from hivemind_cli.providers import PROVIDER_CLASSES
+    from rich import box
+    from rich.table import Table
+
+    from hivemind_cli.core import _load_config
+    from hivemind_cli.providers import provider_names
 
     config = _load_config()
     active = config.get("active_provider", "claude")
@@ -729,7 +1005,7 @@ def provider_list() -> None:
     table.add_column("Home Directory")
     table.add_column("Model")
 
-    for name in sorted(PROVIDER_CLASSES):
+    for name in provider_names():
         prov_config = providers.get(name, {})
         is_active = name == active
         enabled = prov_config.get("enabled", False)
@@ -757,6 +1033,8 @@ def provider_switch(
     ),
 ) -> None:
     """Switch active provider (regenerates all agent files)."""
+    from hivemind_cli.core import switch_provider
+
     result = switch_provider(name)
 
     if not result["success"]:
@@ -779,6 +1057,10 @@ def provider_show(
     ),
 ) -> None:
     """Show detailed configuration for a provider."""
+    from rich.panel import Panel
+
+    from hivemind_cli.core import _load_config
+
     config = _load_config()
     active = config.get("active_provider", "claude")
     target = name or active
@@ -819,43 +1101,280 @@ def provider_show(
     console.print(Panel("\n".join(lines), border_style="blue"))
 
 
+# --- Daemon subcommands ---
+
+daemon_app = typer.Typer(
+    name="daemon",
+    help="Run hivemind as a background daemon serving the CLI and TUI.",
+    no_args_is_help=True,
+)
+app.add_typer(daemon_app, name="daemon")
+
+
+@daemon_app.command(name="start")
+def daemon_start(
+    foreground: bool = typer.Option(
+        False, "--foreground", help="Run in the foreground instead of detaching"
+    ),
+) -> None:
+    """Start the daemon (CLI and TUI commands are then routed through it)."""
+    import subprocess
+    import sys
+    import time
+
+    from hivemind_cli.daemon import LOG_PATH, SOCKET_PATH, DaemonClient
+
+    if DaemonClient.connect():
+        console.print(f"[warning]Daemon already running on {SOCKET_PATH}[/warning]")
+        return
+
+    if foreground:
+        from hivemind_cli.daemon.server import main
+
+        console.print(f"[info]Daemon listening on {SOCKET_PATH} (Ctrl-C to stop)[/info]")
+        main()
+        return
+
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with LOG_PATH.open("a") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "hivemind_cli.daemon"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and proc.poll() is None:
+        client = DaemonClient.connect()
+        if client:
+            pid = client.call("ping")["pid"]
+            console.print(f"[success]✓[/success] Daemon started (pid {pid})")
+            return
+        time.sleep(0.1)
+
+    console.print(f"[error]Error: daemon failed to start, see {LOG_PATH}[/error]")
+    raise typer.Exit(1)
+
+
+@daemon_app.command(name="stop")
+def daemon_stop() -> None:
+    """Stop the daemon, cancelling any running jobs."""
+    import time
+
+    from hivemind_cli.daemon import SOCKET_PATH
+
+    client = _daemon_client()
+    if not client:
+        console.print("[warning]Daemon is not running[/warning]")
+        return
+
+    client.call("shutdown")
+    deadline = time.monotonic() + 15
+    while SOCKET_PATH.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+    console.print("[success]✓[/success] Daemon stopped")
+
+
+@daemon_app.command(name="status")
+def daemon_status() -> None:
+    """Show daemon state and its job queue."""
+    from rich import box
+    from rich.table import Table
+
+    client = _daemon_client()
+    if not client:
+        console.print("[warning]Daemon is not running[/warning]")
+        raise typer.Exit(1)
+
+    state = client.call("status")
+    console.print(
+        f"[success]✓[/success] Daemon running (pid {state['pid']}, "
+        f"up {int(state['uptime'])}s)"
+    )
+
+    if not state["jobs"]:
+        console.print("[dim]No jobs.[/dim]")
+        return
+
+    table = Table(title="Jobs", show_header=True, header_style="bold", box=box.ROUNDED)
+    table.add_column("ID", justify="right")
+    table.add_column("Expert", style="bold")
+    table.add_column("Status")
+    table.add_column("Message")
+    for job in state["jobs"]:
+        expert = job["expert"] + (" [dim](scheduled)[/dim]" if job["scheduled"] else "")
+        table.add_row(str(job["id"]), expert, job["status"], job["message"])
+    console.print(table)
+
+
 # --- Redeploy command ---
 
 
 @app.command()
-def redeploy() -> None:
+def redeploy(
+    rollback: bool = typer.Option(
+        False, "--rollback", help="Switch back to the previously deployed agents"
+    ),
+) -> None:
     """Regenerate all agent files for the active provider.
 
     Use after changing provider settings in config.json
-    (model, tools, temperature) or after switching providers.
+    (model, tools, temperature) or after switching providers. With
+    "deploy_all_providers": true, every enabled provider is redeployed.
     """
+    from hivemind_cli.core import _get_provider, redeploy_all_agents, rollback_agents
+
+    client = _daemon_client()
+    if rollback:
+        result = _daemon_call(client, "rollback") if client else rollback_agents()
+        if not result["success"]:
+            console.print(f"[error]Error: {result['error']}[/error]")
+            raise typer.Exit(1)
+        console.print(
+            f"[success]✓[/success] Rolled back agents/ to generation {result['generation']}"
+        )
+        return
+
     provider = _get_provider()
     console.print(
         f"[heading]Redeploying all agents (provider: {provider.name})...[/heading]\n"
     )
 
-    result = redeploy_all_agents()
+    result = _daemon_call(client, "redeploy") if client else redeploy_all_agents()
 
     if not result["success"]:
         console.print(f"[error]Error: {result['error']}[/error]")
         raise typer.Exit(1)
 
+    _print_redeploy(result)
+
+
+def _print_redeploy(result: dict) -> None:
+    """Print the outcome of redeploy_all_agents."""
     deployed = result.get("deployed", [])
+    written = result.get("written", deployed)
+    unchanged = result.get("unchanged", [])
+    removed = result.get("removed", [])
     failed = result.get("failed", [])
+    skipped = result.get("skipped", [])
 
-    for name in deployed:
+    for name in written:
         console.print(f"  [success]✓[/success] {name}: redeployed")
+    for name in removed:
+        console.print(f"  [success]✓[/success] {name}: removed (not enabled)")
+    for name in skipped:
+        console.print(f"  [dim]-[/dim] {name}: not deployed (over context budget)")
     for name in failed:
         console.print(f"  [warning]![/warning] {name}: failed to redeploy")
 
     if result.get("librarian_updated"):
         console.print(f"  [success]✓[/success] Librarian updated")
+    console.print(
+        f"  [dim]{len(written)} written, {len(unchanged)} unchanged, "
+        f"{len(removed)} removed"
+        + (
+            f" ({result['rendered']} regenerated from changed inputs)"
+            if "rendered" in result
+            else ""
+        )
+        + "[/dim]"
+    )
+    context = result.get("context")
+    if context:
+        console.print(f"  [dim]{_context_summary(context)}[/dim]")
+    providers = result.get("providers", {})
+    if len(providers) > 1:
+        for name, counts in providers.items():
+            console.print(
+                f"  [dim]{name}: {counts['written']} written, "
+                f"{counts['unchanged']} unchanged[/dim]"
+            )
 
+    timings = result.get("timings")
+    elapsed = (
+        f" in {timings['total']:.2f}s (render {timings['render']:.2f}s, "
+        f"write {timings['write']:.2f}s, librarian {timings['librarian']:.2f}s)"
+        if timings
+        else ""
+    )
     console.print(
-        f"\n[bold success]Redeployed {len(deployed)} agent(s).[/bold success]"
+        f"\n[bold success]Redeployed {len(deployed)} agent(s)[/bold success]{elapsed}."
     )
 
 
+@app.command()
+def watch(
+    polling: bool = typer.Option(
+        False, "--polling", help="Poll for changes instead of using inotify"
+    ),
+) -> None:
+    """Redeploy agents as soon as their agent.md or config.json is saved.
+
+    Only the saved expert's agent file and librarian entry are regenerated.
+    With a daemon running, the redeploys are sent to it. Stop with Ctrl-C.
+    """
+    import time
+
+    from hivemind_cli.core import watch_agents
+
+    kwargs = {}
+    client = _daemon_client()
+    if client:
+
+        def redeploy_all() -> dict:
+            return _daemon_call(client, "redeploy")
+
+        def redeploy(names: list[str]) -> dict:
+            return _daemon_call(client, "redeploy", {"names": names})
+
+        kwargs = {"redeploy_all": redeploy_all, "redeploy": redeploy}
+
+    try:
+        for event in watch_agents(polling=polling, **kwargs):
+            if event["event"] == "start":
+                via = ", via daemon" if client else ""
+                console.print(
+                    f"[heading]Watching {event['experts']} expert(s) and config.json "
+                    f"({event['backend']}{via})...[/heading] [dim]Ctrl-C to stop[/dim]"
+                )
+                continue
+
+            stamp = f"[dim]{time.strftime('%H:%M:%S')}[/dim]"
+            trigger = event["trigger"]
+            result = event["result"]
+            elapsed = f"[dim]({result['timings']['total'] * 1000:.0f} ms)[/dim]"
+            if trigger == "config.json":
+                console.print(
+                    f"{stamp} [success]✓[/success] config.json: "
+                    f"{len(result['written'])} written, "
+                    f"{len(result['unchanged'])} unchanged, "
+                    f"{len(result['removed'])} removed {elapsed}"
+                )
+            elif result["failed"]:
+                console.print(
+                    f"{stamp} [warning]![/warning] {trigger}: HEAD/agent.md not found"
+                )
+            elif result["written"] or result["librarian"]["written"]:
+                updated = [
+                    label
+                    for label, changed in (
+                        ("agent", result["written"]),
+                        ("librarian entry", result["librarian"]["written"]),
+                    )
+                    if changed
+                ]
+                console.print(
+                    f"{stamp} [success]✓[/success] {trigger}: "
+                    f"{' and '.join(updated)} redeployed {elapsed}"
+                )
+            else:
+                console.print(f"{stamp} [dim]{trigger}: unchanged[/dim]")
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped watching.[/dim]")
+
+
 @app.command()
 def tui() -> None:
     """Launch interactive TUI for managing experts."""
@@ -888,6 +1407,12 @@ def crawl(
     Always runs in preview mode - you'll see all discovered URLs
     before the crawl begins.
     """
+    import asyncio
+
+    from rich.table import Table
+
+    from hivemind_cli.core import EXTERNAL_DOCS_DIR, _expert_names, _get_expert_dir
+
     # Validate that the agent exists
     expert_dir = _get_expert_dir(agent)
     if not expert_dir.is_dir():
@@ -1057,9 +1582,242 @@ def crawl(
         raise typer.Exit(1)
 
 
+def _format_when(timestamp: float) -> str:
+    """Format a timestamp relative to now, e.g. "in 3h 20m" or "5m ago"."""
+    import time
+
+    delta = int(timestamp - time.time())
+    if abs(delta) < 60:
+        return "now"
+    minutes = abs(delta) // 60
+    if minutes < 60:
+        text = f"{minutes}m"
+    elif minutes < 24 * 60:
+        text = f"{minutes // 60}h {minutes % 60}m"
+    else:
+        text = f"{minutes // (24 * 60)}d {minutes % (24 * 60) // 60}h"
+    return f"in {text}" if delta > 0 else f"{text} ago"
+
+
+def _print_schedule(config: dict, daemon_running: bool) -> None:
+    """Print the upcoming scheduled refreshes of enabled experts."""
+    from rich.panel import Panel
+
+    from hivemind_cli import scheduler
+    from hivemind_cli.core import _get_expert_dir, expert_usage
+
+    schedule = config["schedule"]
+    names = config["enabled"]
+    state = scheduler.load_state()
+    usage = expert_usage()
+    try:
+        entries = scheduler.upcoming(
+            names, schedule, state, {name: _get_expert_dir(name) for name in names}, usage
+        )
+        idle = scheduler.idle(names, schedule, usage)
+        invalid = scheduler.invalid_policies(names, schedule)
+    except ValueError as e:
+        console.print(Panel(f"[error]Invalid schedule: {e}[/error]", title="Schedule"))
+        return
+
+    lines: list[str] = []
+    for entry in entries:
+        last = _format_when(entry.last_run) if entry.last_run else "never"
+        outcome = state["experts"].get(entry.name, {}).get("outcome")
+        if outcome == "failed":
+            last += " [error](failed)[/error]"
+        lines.append(
+            f"[heading]{entry.name}[/heading]: next {_format_when(entry.next_run)} "
+            f"[dim]({entry.policy.describe()}, last run {last})[/dim]"
+        )
+    for name, error in invalid.items():
+        lines.append(f"[heading]{name}[/heading]: [error]invalid policy: {error}[/error]")
+    if not lines:
+        lines.append("No enabled experts have a refresh policy.")
+    if idle:
+        lines.append(
+            f"[dim]Idle (unused in {schedule['idle_after']}, not refreshed): "
+            f"{', '.join(idle)}[/dim]"
+        )
+
+    lines.append("")
+    limit = schedule.get("max_concurrent", 1)
+    budget = scheduler.analyses_left(schedule, state)
+    budget_text = (
+        f"{budget}/{schedule['max_analyses_per_day']} analyses left today"
+        if budget is not None
+        else "no analysis budget"
+    )
+    lines.append(f"Up to {limit} concurrent, {budget_text}")
+    if not daemon_running:
+        lines.append(
+            "[warning]Daemon not running — scheduled refreshes are paused "
+            "(run: hivemind daemon start)[/warning]"
+        )
+
+    console.print(Panel("\n".join(lines), title="Schedule", border_style="blue"))
+
+
+def _context_summary(context: dict) -> str:
+    """One line on agent description tokens against the context budget."""
+    line = f"Agent descriptions: ~{context['fitted_tokens']:,} tokens per session"
+    if context["max_tokens"] is not None:
+        line += f", budget {context['max_tokens']:,}"
+    saved = context["tokens"] - context["fitted_tokens"]
+    if saved:
+        line += (
+            f" (saved ~{saved:,}: {len(context['trimmed'])} trimmed, "
+            f"{len(context['skipped'])} not deployed)"
+        )
+    return line
+
+
+def _librarian_info() -> str:
+    """One-line summary of the deployed librarian's size for `status`."""
+    from hivemind_cli.core import librarian_size
+
+    size = librarian_size()
+    if not size["files"]:
+        return "Librarian: [error]not deployed[/error] (run: [heading]hivemind init[/heading])"
+    largest = max(size["files"].values())
+    style = "warning" if largest > size["max_tokens"] else "success"
+    total = sum(size["files"].values())
+    files = len(size["files"])
+    return (
+        f"Librarian: [{style}]~{total:,} tokens[/{style}]"
+        + (f" in {files} files (largest ~{largest:,})" if files > 1 else "")
+        + f", budget {size['max_tokens']:,}"
+    )
+
+
+@app.command()
+def usage(
+    idle: typing.Optional[str] = typer.Option(
+        None,
+        "--idle",
+        help='Suggest disabling experts unused this long (default: schedule "idle_after" or 30d)',
+    ),
+) -> None:
+    """Count how often each expert is used, from assistant transcripts.
+
+    Scans each deployed provider's local session transcripts for delegations
+    to expert agents. The counts also order scheduled refreshes and decide
+    which experts the context budget keeps.
+    """
+    import time
+
+    from rich import box
+    from rich.table import Table
+
+    from hivemind_cli.core import _load_config, refresh_usage
+    from hivemind_cli.scheduler import parse_interval
+
+    config = _load_config()
+    idle = idle or config.get("schedule", {}).get("idle_after", "30d")
+    try:
+        cutoff = time.time() - parse_interval(idle)
+    except ValueError as e:
+        console.print(f"[error]Error: {e}[/error]")
+        raise typer.Exit(1)
+
+    result = refresh_usage()
+    stats = result["experts"]
+    if not stats:
+        console.print(
+            f"No expert delegations found ({result['transcripts']} new transcript(s) read)."
+        )
+        return
+
+    enabled = config.get("enabled", [])
+    table = Table(show_header=True, header_style="bold", box=box.ROUNDED)
+    table.add_column("Expert", style="bold")
+    table.add_column("Uses", justify="right")
+    table.add_column("Last used")
+    names = sorted(set(enabled) | set(stats), key=lambda n: -stats.get(n, {}).get("count", 0))
+    for name in names:
+        entry = stats.get(name)
+        label = name if name in enabled else f"{name} [dim](disabled)[/dim]"
+        if entry:
+            table.add_row(label, str(entry["count"]), _format_when(entry["last_used"]))
+        else:
+            table.add_row(label, "[dim]0[/dim]", "[dim]never[/dim]")
+    console.print(table)
+
+    unused = [n for n in enabled if stats.get(n, {}).get("last_used", 0) < cutoff]
+    if unused:
+        console.print(
+            f"\n[warning]{len(unused)} enabled expert(s) unused in {idle}:[/warning] "
+            f"{', '.join(unused)}"
+        )
+        console.print(
+            f"[info]Disable them with: [bold]hivemind disable {' '.join(unused)}[/bold][/info]"
+        )
+
+
+@app.command()
+def context() -> None:
+    """Show what deployed agents add to every assistant session, in tokens.
+
+    Set a budget with "context": {"max_tokens": N, "max_experts": N} in
+    config.json; redeploy then trims descriptions or skips low-priority
+    experts to fit.
+    """
+    from rich import box
+    from rich.table import Table
+
+    from hivemind_cli.core import context_usage
+
+    usage = context_usage()
+    table = Table(show_header=True, header_style="bold", box=box.ROUNDED)
+    table.add_column("Agent", style="bold")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Status")
+    for agent, tokens in sorted(usage["agents"].items(), key=lambda item: -item[1]):
+        name = agent.removeprefix("expert-")
+        status_str = "[warning]trimmed[/warning]" if name in usage["trimmed"] else ""
+        table.add_row(agent, f"{tokens:,}", status_str)
+    for name in usage["skipped"]:
+        table.add_row(f"expert-{name}", "[dim]0[/dim]", "[dim]not deployed[/dim]")
+    console.print(table)
+
+    total = usage["fitted_tokens"]
+    over = usage["max_tokens"] is not None and total > usage["max_tokens"]
+    style = "warning" if over else "success"
+    console.print(f"Deployed: [{style}]~{total:,} tokens[/{style}] per session")
+    console.print(_context_summary(usage))
+    if not usage["limited"]:
+        console.print(
+            '[dim]No budget set; add "context": {"max_tokens": N} to config.json '
+            "to trim descriptions.[/dim]"
+        )
+
+
 @app.command()
 def status() -> None:
     """Show a dashboard of hivemind status."""
+    from rich.panel import Panel
+
+    from hivemind_cli.core import (
+        AGENTS_DIR,
+        COMMANDS_DIR,
+        EXTERNAL_DOCS_DIR,
+        EXTERNAL_DOCS_LINK,
+        HIVEMIND_ROOT,
+        REPOS_DIR,
+        REPOS_LINK,
+        SETTINGS_JSON,
+        _count_versions,
+        _deploy_targets,
+        _get_expert_dir,
+        _get_head_commit,
+        _get_provider,
+        _load_config,
+        _load_private_repos,
+        _load_repos,
+        context_usage,
+        outdated_agents,
+    )
+
     provider = _get_provider()
     home_dir = provider.home_dir
 
@@ -1116,8 +1874,36 @@ def status() -> None:
     # Show active provider info
     config = _load_config()
     provider_info = f"Active provider: [heading]{provider.name}[/heading]"
+    also_deployed = [
+        p.name for p, _ in _deploy_targets() if p.name != provider.name
+    ]
+    if also_deployed:
+        provider_info += f" [dim](also deploying: {', '.join(also_deployed)})[/dim]"
+    client = _daemon_client()
+    if client:
+        state = client.call("status")
+        active_jobs = sum(
+            1 for job in state["jobs"] if job["status"] in ("queued", "running")
+        )
+        daemon_info = (
+            f"Daemon: [success]running[/success] (pid {state['pid']}, "
+            f"{active_jobs} active job{'s' if active_jobs != 1 else ''})"
+        )
+    else:
+        daemon_info = "Daemon: [dim]not running[/dim]"
     symlink_lines.insert(0, provider_info)
-    symlink_lines.insert(1, "")
+    symlink_lines.insert(1, daemon_info)
+    symlink_lines.insert(2, _librarian_info())
+    symlink_lines.insert(3, _context_summary(context_usage()))
+    outdated = outdated_agents()
+    symlink_lines.insert(
+        4,
+        f"Agents: [warning]{len(outdated)} out of date[/warning] ({', '.join(outdated)}; "
+        "run: [heading]hivemind redeploy[/heading])"
+        if outdated
+        else "Agents: [success]up to date[/success]",
+    )
+    symlink_lines.insert(5, "")
 
     console.print(Panel("\n".join(symlink_lines), title="Status", border_style="blue"))
 
@@ -1164,6 +1950,9 @@ def status() -> None:
     else:
         console.print(Panel("No repos configured.", title="Repos", border_style="dim"))
 
+    if config.get("schedule"):
+        _print_schedule(config, daemon_running=client is not None)
+
     # Experts section
     console.print()
     list_experts()
@@ -0,0 +1,405 @@
+"""Embeddable async Python API for hivemind.
+
+HivemindClient runs core operations in-process so tooling can drive
+hivemind from one event loop instead of shelling out to the CLI:
+
+    import asyncio
+    from pathlib import Path
+
+    from hivemind_cli.client import HivemindClient
+
+    async def main():
+        client = HivemindClient(Path("~/hivemind").expanduser())
+        async for item in client.stream_update(["bazel", "rich"]):
+            print(item)
+        print(await client.query("How do I write a custom Bazel rule?"))
+
+    asyncio.run(main())
+
+Results are typed dataclasses rather than the dicts core returns, and
+progress is reported as core.ProgressInfo events (or CrawlPage events for
+crawls). Failures are reported through `success`/`error` on the result, not
+raised.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from hivemind_cli import core
+from hivemind_cli.core import CancellationToken, ProgressCallback, ProgressInfo
+
+
+@dataclass(frozen=True)
+class ExpertResult:
+    """Outcome of an operation on one expert."""
+
+    expert: str
+    success: bool
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class AddResult(ExpertResult):
+    """Outcome of adding a new expert."""
+
+    commit: str | None = None
+    private: bool = False
+
+
+@dataclass(frozen=True)
+class UpdateResult(ExpertResult):
+    """Outcome of an update or version switch."""
+
+    old_commit: str | None = None
+    new_commit: str | None = None
+    changed: bool = False  # HEAD moved
+    cancelled: bool = False
+
+
+@dataclass(frozen=True)
+class ToggleResult(ExpertResult):
+    """Outcome of enabling or disabling an expert."""
+
+    changed: bool = False  # False if it was already in the requested state
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    """The librarian's answer to a question."""
+
+    question: str
+    success: bool
+    answer: str = ""
+    error: str | None = None
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class CrawlPage:
+    """Progress event for one crawled page."""
+
+    expert: str
+    url: str
+    success: bool
+
+
+@dataclass(frozen=True)
+class CrawlResult(ExpertResult):
+    """Outcome of crawling external docs for an expert."""
+
+    output_dir: Path | None = None
+    total_pages: int = 0
+    successful_pages: int = 0
+    failed_pages: int = 0
+
+
+def _update_result(name: str, result: dict) -> UpdateResult:
+    return UpdateResult(
+        expert=name,
+        success=result["success"],
+        error=result.get("error"),
+        old_commit=result.get("old_commit"),
+        new_commit=result.get("new_commit"),
+        changed=result["success"]
+        and not result.get("already_up_to_date")
+        and not result.get("already_active"),
+        cancelled=bool(result.get("cancelled")),
+    )
+
+
+# Roots claimed by the first client; core paths are process-wide
+_configured_roots: tuple[Path, Path | None] | None = None
+
+
+class HivemindClient:
+    """Async, in-process access to hivemind operations.
+
+    Core keeps its paths in module globals, so every client in a process must
+    use the same roots.
+    """
+
+    def __init__(self, root: Path, cache_dir: Path | None = None):
+        """Bind core operations to a hivemind root.
+
+        Args:
+            root: Directory holding config.json, repos.json, experts/ and agents/
+            cache_dir: Directory for cloned repos and external docs
+                (default: ~/.cache/hivemind)
+
+        Raises:
+            ValueError: If another client in this process uses different roots
+        """
+        global _configured_roots
+
+        roots = (Path(root).resolve(), Path(cache_dir).resolve() if cache_dir else None)
+        if _configured_roots is not None and _configured_roots != roots:
+            raise ValueError(
+                f"hivemind is already configured for {_configured_roots[0]} "
+                "in this process"
+            )
+        core.configure_paths(*roots)
+        _configured_roots = roots
+        self.root = roots[0]
+        # Serializes this client's writes to agents/ and librarian.md (core
+        # file-locks config.json and repos.json edits itself); long clones
+        # and analyses run outside it
+        self._state_lock = asyncio.Lock()
+
+    # --- Experts ---
+
+    async def add(
+        self,
+        url: str,
+        ref: str | None = None,
+        *,
+        private: bool = False,
+        on_progress: ProgressCallback | None = None,
+    ) -> AddResult:
+        """Register, clone, analyze and deploy a new expert."""
+        result = await asyncio.to_thread(
+            core.add_expert,
+            url,
+            ref,
+            private=private,
+            on_progress=self._threadsafe(on_progress),
+            deploy=False,
+        )
+        if result["success"]:
+            name = result["name"]
+
+            def deploy() -> None:
+                core._deploy_expert(name)
+                core.redeploy_experts([name])
+
+            async with self._state_lock:
+                await asyncio.to_thread(deploy)
+        return AddResult(
+            expert=result["name"],
+            success=result["success"],
+            error=result.get("error"),
+            commit=result.get("commit"),
+            private=private,
+        )
+
+    async def update(
+        self,
+        name: str,
+        *,
+        skip_analysis: bool = False,
+        on_progress: ProgressCallback | None = None,
+        cancellation_token: CancellationToken | None = None,
+    ) -> UpdateResult:
+        """Fetch and re-analyze the latest commit, then redeploy agent and librarian."""
+        from hivemind_cli.scheduler import record_update
+
+        if skip_analysis:
+            result = await asyncio.to_thread(
+                core.update_expert,
+                name,
+                self._threadsafe(on_progress),
+                skip_analysis=True,
+            )
+        else:
+            result = await core.update_expert_async_internal(
+                name,
+                on_progress=on_progress,
+                cancellation_token=cancellation_token,
+            )
+        record_update(
+            name,
+            result,
+            analyzed=not skip_analysis,
+            path=core.CACHE_DIR / "schedule.json",
+        )
+
+        update = _update_result(name, result)
+        if update.changed:
+            async with self._state_lock:
+                await asyncio.to_thread(core.redeploy_experts, [name])
+        return update
+
+    async def stream_update(
+        self,
+        names: list[str] | None = None,
+        *,
+        skip_analysis: bool = False,
+        max_concurrent: int = 2,
+    ) -> AsyncIterator[ProgressInfo | UpdateResult]:
+        """Update several experts concurrently, yielding events as they happen.
+
+        Yields ProgressInfo events interleaved with one UpdateResult per
+        expert as each finishes.
+
+        Args:
+            names: Experts to update (default: all enabled)
+            skip_analysis: Pull changes without re-running AI analysis
+            max_concurrent: Maximum number of updates running at once
+        """
+        if names is None:
+            names = core._load_config()["enabled"]
+
+        queue: asyncio.Queue[ProgressInfo | UpdateResult] = asyncio.Queue()
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def run(name: str) -> None:
+            async with semaphore:
+                try:
+                    result = await self.update(
+                        name, skip_analysis=skip_analysis, on_progress=queue.put_nowait
+                    )
+                except Exception as e:
+                    result = UpdateResult(name, False, f"{type(e).__name__}: {e}")
+            queue.put_nowait(result)
+
+        tasks = [asyncio.create_task(run(name)) for name in names]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if isinstance(item, UpdateResult):
+                    remaining -= 1
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def switch(
+        self,
+        name: str,
+        commit: str,
+        *,
+        on_progress: ProgressCallback | None = None,
+        cancellation_token: CancellationToken | None = None,
+    ) -> UpdateResult:
+        """Switch an expert to another analyzed (or newly analyzed) commit."""
+        result = await core.switch_version_async(
+            name,
+            commit,
+            on_progress=on_progress,
+            cancellation_token=cancellation_token,
+            deploy=False,
+        )
+        switch = _update_result(name, result)
+        if switch.changed:
+            async with self._state_lock:
+                await asyncio.to_thread(core.redeploy_experts, [name])
+        return switch
+
+    async def enable(self, name: str) -> ToggleResult:
+        """Enable an expert and deploy its agent."""
+        async with self._state_lock:
+            result = await asyncio.to_thread(core.enable_expert, name)
+        return ToggleResult(
+            expert=name,
+            success=result["success"],
+            error=result.get("error"),
+            changed=result["success"] and not result.get("already_enabled"),
+        )
+
+    async def disable(self, name: str) -> ToggleResult:
+        """Disable an expert and remove its deployed agent."""
+        async with self._state_lock:
+            result = await asyncio.to_thread(core.disable_expert, name)
+        return ToggleResult(
+            expert=name,
+            success=result["success"],
+            error=result.get("error"),
+            changed=result["success"] and not result.get("already_disabled"),
+        )
+
+    # --- Librarian and docs ---
+
+    async def query(
+        self, question: str, *, top_k: int | None = None, use_cache: bool = True
+    ) -> QueryResult:
+        """Ask the librarian which expert(s) can help with a question.
+
+        Args:
+            question: Question to route
+            top_k: Only send the top_k local matches to the librarian
+            use_cache: Reuse a cached answer for the same question and catalog
+        """
+        result = await asyncio.to_thread(
+            core.query_librarian, question, top_k, use_cache=use_cache
+        )
+        return QueryResult(
+            question=question,
+            success=result["success"],
+            answer=result["answer"],
+            error=result.get("error"),
+            cached=result.get("cached", False),
+        )
+
+    async def crawl(
+        self,
+        url: str,
+        expert: str,
+        *,
+        max_pages: int | None = None,
+        raw_markdown: bool = False,
+        on_page: Callable[[CrawlPage], None] | None = None,
+    ) -> CrawlResult:
+        """Crawl documentation into external_docs/<expert>/ (no preview prompt).
+
+        Args:
+            url: Starting URL or sitemap URL
+            expert: Expert whose docs directory receives the pages
+            max_pages: Maximum pages to crawl (default: no limit)
+            raw_markdown: Fetch .md endpoints only, without browser fallback
+            on_page: Called with a CrawlPage after each page
+        """
+        from hivemind_cli import crawler
+
+        if not core._get_expert_dir(expert).is_dir():
+            return CrawlResult(expert, False, f"Expert '{expert}' not found")
+
+        output_dir = core.EXTERNAL_DOCS_DIR / expert
+
+        def on_page_callback(page_url: str, success: bool) -> None:
+            if on_page:
+                on_page(CrawlPage(expert, page_url, success))
+
+        is_sitemap = crawler.is_sitemap_url(url)
+        try:
+            if raw_markdown:
+                if is_sitemap:
+                    urls = await crawler.preview_sitemap(url, max_pages)
+                else:
+                    urls = await crawler.preview_crawl(url, max_pages)
+                stats = await crawler.crawl_urls_raw_markdown(
+                    urls, str(output_dir), on_page_callback
+                )
+            elif is_sitemap:
+                stats = await crawler.crawl_from_sitemap(
+                    url, max_pages, str(output_dir), on_page_callback
+                )
+            else:
+                stats = await crawler.crawl_website(
+                    url, max_pages, str(output_dir), on_page_callback
+                )
+        except Exception as e:
+            return CrawlResult(expert, False, f"Crawl failed: {e}", output_dir)
+
+        return CrawlResult(
+            expert=expert,
+            success=stats.successful_pages > 0,
+            error=None if stats.successful_pages else "No pages were crawled",
+            output_dir=output_dir,
+            total_pages=stats.total_pages,
+            successful_pages=stats.successful_pages,
+            failed_pages=stats.failed_pages,
+        )
+
+    # --- Helpers ---
+
+    @staticmethod
+    def _threadsafe(callback: ProgressCallback | None) -> ProgressCallback | None:
+        """Wrap a callback so worker threads deliver events on the event loop."""
+        if callback is None:
+            return None
+        loop = asyncio.get_running_loop()
+        return lambda info: loop.call_soon_threadsafe(callback, info)
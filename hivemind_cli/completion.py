@@ -0,0 +1,62 @@
+"""Precomputed shell completion index for expert and provider names.
+
+Shell completion runs on every TAB press, so this module only uses the
+standard library and never imports core. The index is a small JSON file that
+mutating commands refresh via core._refresh_completion_index().
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+# Kept in step with core.CACHE_DIR by core.configure_paths()
+INDEX_PATH = Path.home() / ".cache" / "hivemind" / "completion.json"
+
+
+def load_index(path: Path | None = None) -> dict | None:
+    """Load the completion index, or None if it is missing or unreadable."""
+    try:
+        return json.loads((path or INDEX_PATH).read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def write_index(
+    experts: dict[str, str], providers: list[str], path: Path | None = None
+) -> None:
+    """Atomically write the completion index.
+
+    Args:
+        experts: Expert name -> status hint (e.g. "enabled", "disabled, private")
+        providers: Available provider names
+        path: Index file location (default: INDEX_PATH)
+    """
+    path = path or INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"experts": experts, "providers": providers}))
+    os.replace(tmp, path)
+
+
+def _index() -> dict:
+    """Return the index, building it once through core if it doesn't exist yet."""
+    index = load_index()
+    if index is None:
+        from hivemind_cli.core import _refresh_completion_index
+
+        _refresh_completion_index()
+        index = load_index() or {}
+    return index
+
+
+def expert_candidates(incomplete: str) -> list[tuple[str, str]]:
+    """Return (name, status hint) pairs for experts starting with incomplete."""
+    experts = _index().get("experts", {})
+    return [(n, hint) for n, hint in experts.items() if n.startswith(incomplete)]
+
+
+def provider_candidates(incomplete: str) -> list[str]:
+    """Return provider names starting with incomplete."""
+    return [n for n in _index().get("providers", []) if n.startswith(incomplete)]
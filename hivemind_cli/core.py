@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-import asyncio
+import copy
+import fnmatch
+import hashlib
 import json
 import os
 import shutil
@@ -11,21 +13,28 @@ import subprocess
 import sys
 import tempfile
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Iterator
 
 from hivemind_cli.providers import (
     Provider,
     get_active_provider,
     extract_description,
     strip_frontmatter,
-    DEFAULT_CLAUDE_CONFIG,
-    DEFAULT_OPENCODE_CONFIG,
+    LIBRARIAN_DESCRIPTION,
+    load_provider_class,
+    provider_names,
 )
 from hivemind_cli.templates import update_expert_prompt
 
+if TYPE_CHECKING:
+    from hivemind_cli.answer_cache import AnswerCache
+    from hivemind_cli.routing import RoutingIndex
+    from hivemind_cli.search import SearchHit
+
 
 # --- Progress Callback Types ---
 
@@ -59,6 +68,21 @@ class ProgressInfo:
 ProgressCallback = Callable[[ProgressInfo], None]
 
 
+class CancellationToken:
+    """Token to signal and check for cancellation."""
+
+    def __init__(self):
+        self._cancelled = False
+
+    def cancel(self):
+        """Signal cancellation."""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        """Check if cancelled."""
+        return self._cancelled
+
+
 # --- Paths (shared configuration) ---
 
 # Allow override for testing, otherwise use the same paths as cli.py
@@ -78,6 +102,41 @@ PRIVATE_EXPERTS_DIR = HIVEMIND_ROOT / "private-experts"
 PRIVATE_REPOS_JSON = HIVEMIND_ROOT / "private-repos.json"
 
 
+def configure_paths(root: Path, cache_dir: Path | None = None) -> None:
+    """Point all core operations at another hivemind root and cache directory.
+
+    The paths are module-level, so this affects every caller in the process.
+
+    Args:
+        root: Directory holding config.json, repos.json, experts/ and agents/
+        cache_dir: Directory for cloned repos and external docs
+            (default: ~/.cache/hivemind)
+    """
+    global HIVEMIND_ROOT, CACHE_DIR, REPOS_DIR, REPOS_LINK, EXTERNAL_DOCS_DIR
+    global EXTERNAL_DOCS_LINK, REPOS_JSON, CONFIG_JSON, AGENTS_DIR, EXPERTS_DIR
+    global COMMANDS_DIR, SETTINGS_JSON, PRIVATE_EXPERTS_DIR, PRIVATE_REPOS_JSON
+
+    HIVEMIND_ROOT = Path(root).resolve()
+    CACHE_DIR = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "hivemind"
+    REPOS_DIR = CACHE_DIR / "repos"
+    REPOS_LINK = HIVEMIND_ROOT / "repos"
+    EXTERNAL_DOCS_DIR = CACHE_DIR / "external_docs"
+    EXTERNAL_DOCS_LINK = HIVEMIND_ROOT / "external_docs"
+    REPOS_JSON = HIVEMIND_ROOT / "repos.json"
+    CONFIG_JSON = HIVEMIND_ROOT / "config.json"
+    AGENTS_DIR = HIVEMIND_ROOT / "agents"
+    EXPERTS_DIR = HIVEMIND_ROOT / "experts"
+    COMMANDS_DIR = HIVEMIND_ROOT / "commands"
+    SETTINGS_JSON = HIVEMIND_ROOT / "settings.json"
+    PRIVATE_EXPERTS_DIR = HIVEMIND_ROOT / "private-experts"
+    PRIVATE_REPOS_JSON = HIVEMIND_ROOT / "private-repos.json"
+
+    # Completion only uses the standard library and reads its own path
+    from hivemind_cli import completion
+
+    completion.INDEX_PATH = CACHE_DIR / "completion.json"
+
+
 # --- Helper Functions ---
 
 
@@ -88,28 +147,93 @@ def _load_json(path: Path) -> dict:
 
 
 def _save_json(path: Path, data: dict) -> None:
-    path.write_text(json.dumps(data, indent=2) + "\n")
+    # Replace rather than overwrite, so readers never see a partial file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock for path across processes and threads.
+
+    The lock is an flock on a sidecar .<name>.lock file; each call opens it
+    afresh, so it also excludes other threads of this process. Not
+    reentrant.
+    """
+    import fcntl
+
+    lock_path = path.with_name(f".{path.name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# Parsed config.json keyed by (path, mtime_ns, size), so long-lived processes
+# (daemon, TUI) and bulk operations don't re-parse an unchanged file
+_config_cache: tuple[tuple, dict] | None = None
 
 
 def _load_config() -> dict:
+    global _config_cache
+
     default = {"enabled": [], "disabled": []}
-    if not CONFIG_JSON.exists():
+    try:
+        st = CONFIG_JSON.stat()
+    except FileNotFoundError:
         return default
-    data = _load_json(CONFIG_JSON)
-    data.setdefault("enabled", [])
-    data.setdefault("disabled", [])
-    data.setdefault("active_provider", "claude")
-    data.setdefault("providers", {})
-    # Seed default provider configs if missing
-    if "claude" not in data["providers"]:
-        data["providers"]["claude"] = DEFAULT_CLAUDE_CONFIG
-    if "opencode" not in data["providers"]:
-        data["providers"]["opencode"] = DEFAULT_OPENCODE_CONFIG
-    return data
 
+    key = (CONFIG_JSON, st.st_mtime_ns, st.st_size)
+    if _config_cache is None or _config_cache[0] != key:
+        data = _load_json(CONFIG_JSON)
+        data.setdefault("enabled", [])
+        data.setdefault("disabled", [])
+        data.setdefault("active_provider", "claude")
+        data.setdefault("providers", {})
+        # Seed default provider configs if missing, plugins included
+        for name in provider_names():
+            if name not in data["providers"]:
+                try:
+                    default_config = load_provider_class(name).default_config
+                except ValueError:
+                    continue  # Broken plugin; selecting it reports the error
+                data["providers"][name] = copy.deepcopy(default_config)
+        _config_cache = (key, data)
 
-def _save_config(config: dict) -> None:
+    # Callers mutate the result before saving, so hand out a private copy
+    return copy.deepcopy(_config_cache[1])
+
+
+def _write_config(config: dict) -> None:
+    """Write config.json; the caller holds its lock."""
     _save_json(CONFIG_JSON, config)
+    # Every enable/disable/add/provider change goes through here, so this is
+    # where the shell completion index is kept in sync
+    _refresh_completion_index(config)
+
+
+def _save_config(config: dict) -> None:
+    with _file_lock(CONFIG_JSON):
+        _write_config(config)
+
+
+@contextmanager
+def _editing_config() -> Iterator[dict]:
+    """Load config.json for changes that are saved on exit, if there are any.
+
+    The file is locked from load to save, so concurrent edits (CLI, daemon,
+    TUI) don't overwrite each other.
+    """
+    with _file_lock(CONFIG_JSON):
+        config = _load_config()
+        before = copy.deepcopy(config)
+        yield config
+        if config != before:
+            _write_config(config)
 
 
 def _get_provider() -> Provider:
@@ -118,6 +242,32 @@ def _get_provider() -> Provider:
     return get_active_provider(config)
 
 
+def _deploy_targets(config: dict | None = None) -> list[tuple[Provider, Path]]:
+    """(provider, agents dir) pairs that deploys write to.
+
+    The active provider uses agents/. Providers deployed alongside it (see
+    providers.get_deploy_providers) each get their own agents-<provider>/.
+    """
+    from hivemind_cli.providers import get_deploy_providers
+
+    providers = get_deploy_providers(config or _load_config())
+    return [
+        (provider, AGENTS_DIR if i == 0 else HIVEMIND_ROOT / f"agents-{provider.name}")
+        for i, provider in enumerate(providers)
+    ]
+
+
+def _agents_lock():
+    """Lock held while writing the agents trees of any deploy target.
+
+    Staged redeploys hold it from staging to activation (see
+    _activate_agents), so in-place writes can't land in a tree that is
+    about to be replaced. Not reentrant: functions taking explicit targets
+    expect the caller to hold it, or to own the (staged) targets.
+    """
+    return _file_lock(AGENTS_DIR)
+
+
 def _load_repos() -> dict:
     return _load_json(REPOS_JSON)
 
@@ -138,7 +288,28 @@ def _load_private_repos() -> dict:
 
 def _save_private_repos(repos: dict) -> None:
     """Save private-repos.json."""
-    PRIVATE_REPOS_JSON.write_text(json.dumps(repos, indent=2) + "\n")
+    _save_json(PRIVATE_REPOS_JSON, repos)
+
+
+def _set_repo(name: str, entry: dict, *, private: bool) -> None:
+    """Update one expert's entry in repos.json or private-repos.json.
+
+    The file is reloaded and rewritten under its lock, so concurrent updates
+    of different experts don't overwrite each other's entries.
+    """
+    path = PRIVATE_REPOS_JSON if private else REPOS_JSON
+    with _file_lock(path):
+        repos = _load_private_repos() if private else _load_repos()
+        repos[name] = {**repos.get(name, {}), **entry}
+        _save_json(path, repos)
+
+
+def _record_commit(name: str, commit: str) -> None:
+    """Store the analyzed commit for an expert in repos.json or private-repos.json."""
+    private = _is_private_expert(name)
+    repos = _load_private_repos() if private else _load_repos()
+    if name in repos:
+        _set_repo(name, {"commit": commit}, private=private)
 
 
 def _is_private_expert(name: str) -> bool:
@@ -171,6 +342,31 @@ def _expert_names() -> list[str]:
     return sorted(experts)
 
 
+def _refresh_completion_index(config: dict | None = None) -> None:
+    """Rebuild the shell completion index with names and status hints."""
+    from hivemind_cli.completion import write_index
+
+    if config is None:
+        config = _load_config()
+    enabled = set(config.get("enabled", []))
+    disabled = set(config.get("disabled", []))
+    private = set(config.get("private", []))
+
+    experts: dict[str, str] = {}
+    for name in _expert_names():
+        if name in enabled:
+            hint = "enabled"
+        elif name in disabled:
+            hint = "disabled"
+        else:
+            hint = "unlisted"
+        if name in private:
+            hint += ", private"
+        experts[name] = hint
+
+    write_index(experts, provider_names(), CACHE_DIR / "completion.json")
+
+
 def _get_head_commit(expert_dir: Path) -> str | None:
     """Read the HEAD symlink to get the current commit hash."""
     head = expert_dir / "HEAD"
@@ -228,45 +424,277 @@ def _ensure_external_docs_link() -> None:
     EXTERNAL_DOCS_LINK.symlink_to(EXTERNAL_DOCS_DIR)
 
 
+def _read_agent(expert_dir: Path) -> str | None:
+    """Read an expert's canonical HEAD/agent.md, or None if it doesn't exist."""
+    try:
+        return (expert_dir / "HEAD" / "agent.md").read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _agent_fingerprint(provider: Provider, source: str, description: str | None) -> str:
+    """Hash of everything a deployed agent file is generated from.
+
+    Covers the agent.md source, the provider's settings and template version
+    (Provider.agent_fingerprint) and any description the context budget
+    substitutes.
+    """
+    text = f"{provider.agent_fingerprint()}\0{description or ''}\0{source}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
 def _deploy_agent(name: str) -> bool:
     """Generate and deploy agent file with provider-specific frontmatter.
 
-    Reads the canonical body from experts/{name}/HEAD/agent.md, strips any
-    existing frontmatter, extracts the description, and generates a new file
-    with the active provider's frontmatter and path transformations.
-
     Returns False if HEAD/agent.md doesn't exist.
     """
-    AGENTS_DIR.mkdir(parents=True, exist_ok=True)
-    expert_dir = _get_expert_dir(name)
-    head_agent = expert_dir / "HEAD" / "agent.md"
+    return name in deploy_agents([name])["deployed"]
+
+
+def _load_deploy_manifest() -> dict:
+    """"<provider>/<file name>" -> {"sha256", "mtime_ns", "size"} as last written."""
+    try:
+        return json.loads((CACHE_DIR / "deploy_manifest.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
 
-    if not head_agent.exists():
+def _save_deploy_manifest(manifest: dict) -> None:
+    path = CACHE_DIR / "deploy_manifest.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest))
+    os.replace(tmp, path)
+
+
+def _deployed_unchanged(manifest: dict, key: str, path: Path, **expected: str) -> bool:
+    """True if path still holds exactly what was deployed.
+
+    expected gives manifest fields that must match: sha256 (of the content)
+    or fingerprint (of the inputs, see _agent_fingerprint). Compares against
+    the manifest's recorded stat, so unchanged files are never read; a file
+    edited or removed since deploy counts as changed. Keys use the file name
+    rather than its path, so entries also hold for hard links of the file in
+    a staged agents tree.
+    """
+    entry = manifest.get(key)
+    if not entry or any(entry.get(field) != value for field, value in expected.items()):
         return False
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    return [st.st_mtime_ns, st.st_size] == [entry["mtime_ns"], entry["size"]]
 
-    provider = _get_provider()
 
-    # Read canonical body and strip any frontmatter
-    raw_content = head_agent.read_text()
-    body = strip_frontmatter(raw_content)
-    description = extract_description(body)
+def _record_deploy(
+    manifest: dict, key: str, path: Path, digest: str, fingerprint: str | None = None
+) -> None:
+    st = path.stat()
+    manifest[key] = {"sha256": digest, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    if fingerprint:
+        manifest[key]["fingerprint"] = fingerprint
 
-    # Generate provider-specific content
-    content = provider.format_agent_md(name, description, body)
 
-    # Deploy to agents/ directory
-    provider.deploy_agent(name, content, agents_dir=AGENTS_DIR)
-    return True
+def deploy_agents(
+    names: list[str],
+    *,
+    targets: list[tuple[Provider, Path]] | None = None,
+    max_workers: int = 8,
+    plan: dict | None = None,
+) -> dict:
+    """Generate and deploy agent files for many experts in one pass.
+
+    Config and providers are resolved once. Each agent.md is read once, and
+    agent files whose recorded fingerprint (see _agent_fingerprint) still
+    matches are skipped without rendering. The rest are formatted for their
+    deploy target on a thread pool, then each target's files are written
+    together. Files whose content hash matches the deploy manifest are left
+    untouched, so their mtimes don't change and assistants don't reload them.
+
+    With a "context" budget in config.json (see _context_plan), descriptions
+    are trimmed and experts over the budget are left undeployed. Every
+    enabled expert is then deployed, since one expert's description changes
+    how much the others are trimmed.
+
+    Args:
+        names: Experts to deploy
+        targets: (provider, agents dir) pairs to write to, e.g. staged
+            trees (default: _deploy_targets(), under _agents_lock())
+        max_workers: Threads for reading and formatting
+        plan: A _context_plan computed by the caller. Only names are then
+            deployed under it, and the caller redeploys the rest later
+            (see init_experts)
+
+    Returns:
+        dict with keys: deployed (list[str], written or unchanged),
+        written (list[str], written for any provider), unchanged (list[str],
+        unchanged for every provider), failed (list[str]), skipped
+        (list[str], left undeployed by the context budget), rendered (int,
+        agent files regenerated because their fingerprint changed),
+        providers (dict[str, dict], provider -> {"written": int, "unchanged": int}),
+        context (dict | None, see _context_plan, without descriptions),
+        timings (dict[str, float], seconds for "render", "write" and "total")
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if targets is None:
+        with _agents_lock():
+            targets = _deploy_targets()
+            return deploy_agents(
+                names, targets=targets, max_workers=max_workers, plan=plan
+            )
+
+    start = time.perf_counter()
+    config = _load_config()
+    private = set(config.get("private", []))
+
+    if plan is None and _context_limited(config):
+        plan = _context_plan(config)
+        names = list(dict.fromkeys([*names, *config.get("enabled", [])]))
+    skipped: list[str] = []
+    if plan:
+        skipped = [name for name in names if name in plan["skipped"]]
+        names = [name for name in names if name not in plan["skipped"]]
+
+    def read(name: str) -> str | None:
+        return _read_agent((PRIVATE_EXPERTS_DIR if name in private else EXPERTS_DIR) / name)
+
+    def description_override(name: str) -> str | None:
+        return plan["descriptions"][name] if plan and name in plan["trimmed"] else None
+
+    def render(job: tuple[Provider, str]) -> tuple[str, str]:
+        provider, name = job
+        body = strip_frontmatter(agents[name])
+        description = description_override(name) or extract_description(body)
+        content = provider.format_agent_md(name, description, body)
+        return content, hashlib.sha256(content.encode()).hexdigest()
+
+    manifest = _load_deploy_manifest()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        agents = dict(zip(names, executor.map(read, names)))
+        fingerprints = {
+            (provider, name): _agent_fingerprint(provider, agents[name], description_override(name))
+            for provider, _ in targets
+            for name in names
+            if agents[name] is not None
+        }
+        jobs = [
+            (provider, name)
+            for provider, agents_dir in targets
+            for name in names
+            if agents[name] is not None
+            and not _deployed_unchanged(
+                manifest,
+                f"{provider.name}/expert-{name}.md",
+                agents_dir / f"expert-{name}.md",
+                fingerprint=fingerprints[provider, name],
+            )
+        ]
+        rendered_agents = dict(zip(jobs, executor.map(render, jobs)))
+    rendered = time.perf_counter()
+
+    def write(target: tuple[Provider, Path]) -> tuple[set[str], set[str]]:
+        provider, agents_dir = target
+        written: set[str] = set()
+        unchanged: set[str] = set()
+        agents_dir.mkdir(parents=True, exist_ok=True)
+        for name in skipped:
+            provider.undeploy_agent(name, agents_dir=agents_dir)
+        for name in names:
+            if agents[name] is None:
+                continue
+            if (provider, name) not in rendered_agents:
+                unchanged.add(name)
+                continue
+            content, digest = rendered_agents[provider, name]
+            fingerprint = fingerprints[provider, name]
+            path = agents_dir / f"expert-{name}.md"
+            key = f"{provider.name}/{path.name}"
+            if _deployed_unchanged(manifest, key, path, sha256=digest):
+                # Same output from new inputs: only the fingerprint moves on
+                manifest[key]["fingerprint"] = fingerprint
+                unchanged.add(name)
+                continue
+            provider.deploy_agent(name, content, agents_dir=agents_dir)
+            _record_deploy(manifest, key, path, digest, fingerprint)
+            written.add(name)
+        return written, unchanged
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        outcomes = list(executor.map(write, targets))
+    if rendered_agents:
+        _save_deploy_manifest(manifest)
+    done = time.perf_counter()
+
+    failed = [name for name in names if agents[name] is None]
+    written_any = set().union(*(written for written, _ in outcomes))
+    return {
+        "deployed": [name for name in names if agents[name] is not None],
+        "written": [name for name in names if name in written_any],
+        "unchanged": [
+            name
+            for name in names
+            if agents[name] is not None and name not in written_any
+        ],
+        "failed": failed,
+        "skipped": skipped,
+        "rendered": len(rendered_agents),
+        "providers": {
+            provider.name: {"written": len(written), "unchanged": len(unchanged)}
+            for (provider, _), (written, unchanged) in zip(targets, outcomes)
+        },
+        "context": {k: v for k, v in plan.items() if k != "descriptions"} if plan else None,
+        "timings": {
+            "render": rendered - start,
+            "write": done - rendered,
+            "total": done - start,
+        },
+    }
+
+
+def outdated_agents() -> list[str]:
+    """Enabled experts whose deployed agent file no longer matches its inputs.
+
+    An agent is out of date when its agent.md, its provider's settings or its
+    context budget description changed since it was deployed (see
+    _agent_fingerprint), or its file was edited or removed. Only agent.md
+    files are read; deployed files are checked by stat against the deploy
+    manifest.
+    """
+    config = _load_config()
+    private = set(config.get("private", []))
+    plan = _context_plan(config) if _context_limited(config) else None
+    targets = _deploy_targets(config)
+    manifest = _load_deploy_manifest()
+
+    outdated: list[str] = []
+    for name in config.get("enabled", []):
+        if plan and name in plan["skipped"]:
+            continue
+        source = _read_agent((PRIVATE_EXPERTS_DIR if name in private else EXPERTS_DIR) / name)
+        if source is None:
+            continue
+        description = plan["descriptions"][name] if plan and name in plan["trimmed"] else None
+        for provider, agents_dir in targets:
+            path = agents_dir / f"expert-{name}.md"
+            fingerprint = _agent_fingerprint(provider, source, description)
+            key = f"{provider.name}/{path.name}"
+            if not _deployed_unchanged(manifest, key, path, fingerprint=fingerprint):
+                outdated.append(name)
+                break
+    return outdated
 
 
 def _undeploy_agent(name: str) -> None:
-    """Remove agents/expert-<name>.md if it exists."""
-    provider = _get_provider()
-    provider.undeploy_agent(name, agents_dir=AGENTS_DIR)
+    """Remove expert-<name>.md from every deploy target."""
+    with _agents_lock():
+        for provider, agents_dir in _deploy_targets():
+            provider.undeploy_agent(name, agents_dir=agents_dir)
 
 
 def _deploy_expert(name: str) -> bool:
-    """Deploy expert directory to active provider's expert location.
+    """Deploy expert directory to each deploy provider's expert location.
 
     Returns True if deployed, False if expert doesn't exist.
     """
@@ -274,24 +702,42 @@ def _deploy_expert(name: str) -> bool:
     if not source_dir.exists():
         return False
 
-    provider = _get_provider()
-    provider.deploy_expert(name, source_dir)
+    for provider, _ in _deploy_targets():
+        provider.deploy_expert(name, source_dir)
     return True
 
 
 def _undeploy_expert(name: str) -> None:
-    """Remove expert from active provider's expert location."""
-    provider = _get_provider()
-    provider.undeploy_expert(name)
+    """Remove expert from each deploy provider's expert location."""
+    for provider, _ in _deploy_targets():
+        provider.undeploy_expert(name)
 
 
-def _clone_repo(name: str, repos: dict, *, silent: bool = False) -> bool:
+def _clone_repo(
+    name: str,
+    repos: dict,
+    *,
+    silent: bool = False,
+    partial: bool = False,
+    cancellation_token: CancellationToken | None = None,
+) -> bool:
     """Clone a repo to cache repos dir if not already present.
 
+    The clone is made in a temporary sibling directory and renamed into
+    place once checked out, so an interrupted clone never looks complete;
+    its leftovers are removed by the next attempt.
+
     Args:
         name: Expert name
         repos: repos.json data
-        silent: If True, suppress output (for TUI usage)
+        silent: If True, suppress output (for TUI usage); git's error
+            output is kept on the raised CalledProcessError
+        partial: Make a blobless partial clone (--filter=blob:none), unless
+            the repos.json entry sets "partial": false. File contents are
+            then fetched on demand; servers without filter support send a
+            full clone instead.
+        cancellation_token: Once cancelled, a running git is terminated and
+            the clone fails with CalledProcessError
 
     Returns:
         True if repo is available (already cloned or newly cloned)
@@ -310,238 +756,1273 @@ def _clone_repo(name: str, repos: dict, *, silent: bool = False) -> bool:
     commit = repo.get("commit", "")
     ref_name = repo.get("ref_name", "")
 
-    # Determine clone command
+    tmp_dir = REPOS_DIR / f".{name}.clone"
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+
+    cmd = ["git", "clone", "--progress" if not silent else "--quiet"]
+    if partial and repo.get("partial", True):
+        cmd.append("--filter=blob:none")
     if commit:
-        subprocess.run(
-            [
-                "git",
-                "clone",
-                "--progress" if not silent else "--quiet",
-                remote,
-                str(repo_dir),
-            ],
-            check=True,
-            stdout=subprocess.DEVNULL if silent else None,
-            stderr=subprocess.DEVNULL if silent else None,
+        # The pinned commit is checked out below; skip checking out the
+        # default branch first
+        cmd.append("--no-checkout")
+    elif ref_name:
+        cmd.extend(["--branch", ref_name])
+    output = {
+        "stdout": subprocess.DEVNULL if silent else None,
+        "stderr": subprocess.PIPE if silent else None,
+        "text": True,
+    }
+
+    def run(args: list[str], **kwargs) -> None:
+        if cancellation_token is None:
+            subprocess.run(args, check=True, **output, **kwargs)
+            return
+        # In its own process group, so its transport helpers go with it
+        with subprocess.Popen(args, start_new_session=True, **output, **kwargs) as proc:
+            while True:
+                try:
+                    stdout, stderr = proc.communicate(timeout=0.2)
+                    break
+                except subprocess.TimeoutExpired:
+                    if cancellation_token.is_cancelled():
+                        try:
+                            os.killpg(proc.pid, signal.SIGTERM)
+                        except ProcessLookupError:
+                            pass  # Exited meanwhile
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, args, stdout, stderr)
+
+    try:
+        run([*cmd, remote, str(tmp_dir)])
+        if commit:
+            run(["git", "checkout", "--quiet", commit], cwd=str(tmp_dir))
+    except subprocess.CalledProcessError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    tmp_dir.rename(repo_dir)
+    return True
+
+
+def init_experts(
+    names: list[str], *, jobs: int = 4, partial: bool = True
+) -> Iterator[dict]:
+    """Clone experts' repos concurrently, deploying each expert once it's ready.
+
+    Up to `jobs` repos are cloned at a time (see _clone_repo). Experts whose
+    repo is already present, or that have no repos.json entry, are ready
+    straight away, as are experts whose clone failed. Each ready expert has
+    its directory deployed, and its agent file written into a staged
+    generation of each agents tree, while the remaining clones run; with a
+    context budget, under a plan made once up front. Once all are done,
+    redeploy_all_agents() completes the stages (librarian, stale files,
+    the context plan for every enabled expert) and activates them, so
+    assistants never see a half-initialized agents tree. Stopping early
+    terminates the clones still running.
+
+    Args:
+        names: Experts to set up
+        jobs: Maximum concurrent clones
+        partial: Make blobless partial clones where the remote allows it
+
+    Yields:
+        First {"event": "start", "total": int, "cloning": list[str]}, then
+        for each expert {"event": "ready" | "failed" (clone failed), "name":
+        str, "cloned": bool (newly cloned), "in_repos": bool, "deployed":
+        bool, "error": str | None}, and last {"event": "activated",
+        "result": dict (see redeploy_all_agents)}
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    repos = _load_repos()
+    cloning = [n for n in names if n in repos and not (REPOS_DIR / n).is_dir()]
+    yield {"event": "start", "total": len(names), "cloning": cloning}
+
+    # Deploying one expert under a fresh plan would redeploy every enabled
+    # expert each time; the final redeploy reconciles them all once
+    config = _load_config()
+    plan = _context_plan(config) if _context_limited(config) else None
+    written: set[str] = set()
+    rendered = 0
+
+    def ready(name: str, *, cloned: bool) -> dict:
+        nonlocal rendered
+        deployed = _deploy_expert(name)
+        if deployed:
+            result = deploy_agents([name], targets=stages, plan=plan)
+            written.update(result["written"])
+            rendered += result["rendered"]
+        return {
+            "event": "ready",
+            "name": name,
+            "cloned": cloned,
+            "in_repos": name in repos,
+            "deployed": deployed,
+            "error": None,
+        }
+
+    def clone_all() -> Iterator[dict]:
+        _ensure_repos_link()
+        token = CancellationToken()
+        executor = ThreadPoolExecutor(max_workers=max(1, jobs))
+        try:
+            futures = {
+                executor.submit(
+                    _clone_repo,
+                    name,
+                    repos,
+                    silent=True,
+                    partial=partial,
+                    cancellation_token=token,
+                ): name
+                for name in cloning
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                except (OSError, subprocess.CalledProcessError) as e:
+                    error = str(e)
+                    if isinstance(e, subprocess.CalledProcessError) and e.stderr:
+                        error = e.stderr.strip().splitlines()[0]
+                    # The expert's knowledge doesn't need its repo; deploy anyway
+                    yield {**ready(name, cloned=False), "event": "failed", "error": error}
+                    continue
+                # Deploys run here, one at a time, while other clones continue
+                yield ready(name, cloned=True)
+        finally:
+            # Only left with clones pending when the caller stopped early
+            token.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # Held until the stages are activated, so nothing else writes to agents/
+    # meanwhile; the caller stopping early releases it too
+    with _agents_lock():
+        stages = _stage_all_agents()
+        try:
+            for name in names:
+                if name not in cloning:
+                    yield ready(name, cloned=False)
+            if cloning:
+                yield from clone_all()
+            result = redeploy_all_agents(stages=stages)
+        except BaseException:
+            # Includes GeneratorExit when the caller stops early
+            for _, stage in stages:
+                shutil.rmtree(stage, ignore_errors=True)
+            raise
+    # Count agents written into the stages before activation too
+    written.update(result["written"])
+    result["written"] = [name for name in result["deployed"] if name in written]
+    result["unchanged"] = [name for name in result["unchanged"] if name not in written]
+    result["rendered"] += rendered
+    yield {"event": "activated", "result": result}
+
+
+def _analyze_repo(
+    name: str,
+    commit: str,
+    repo_dir: Path,
+    expert_dir: Path,
+    *,
+    is_update: bool = False,
+    background: bool = False,
+) -> subprocess.Popen | tuple[subprocess.Popen, Path, Path, object, object] | bool:
+    """Run AI analysis on a repo via the active provider's engine.
+
+    For create (is_update=False): generates 5 files (4 knowledge + agent.md).
+    For update (is_update=True): regenerates 4 knowledge files, preserves agent.md.
+
+    If background=True, returns (proc, stderr_path, stdout_path, stderr_file, stdout_file) tuple.
+    Otherwise, waits for completion and returns True on success.
+    """
+    commit_dir = expert_dir / commit
+
+    # Use centralized templates from templates.py
+    if is_update:
+        prompt = update_expert_prompt(name, commit, repo_dir, commit_dir)
+    else:
+        from hivemind_cli.templates import create_expert_prompt
+
+        prompt = create_expert_prompt(name, commit, repo_dir, commit_dir)
+
+    provider = _get_provider()
+    cmd = provider.build_analysis_command(
+        extra_dirs=[repo_dir, expert_dir],
+    )
+
+    # Run from common parent so the engine has filesystem access to both
+    # the repo and expert directories (matches async callers which already
+    # set cwd=staged_path)
+    cwd = Path(os.path.commonpath([repo_dir.resolve(), expert_dir.resolve()]))
+
+    if background:
+        # Create temp files for stderr and stdout - use NamedTemporaryFile
+        stderr_file = tempfile.NamedTemporaryFile(
+            mode="w",
+            prefix=f"hivemind-{name}-stderr-",
+            suffix=".log",
+            delete=False,  # Don't auto-delete, we'll read it later
         )
-        subprocess.run(
-            ["git", "checkout", "--quiet", commit],
-            cwd=str(repo_dir),
-            check=True,
+        stdout_file = tempfile.NamedTemporaryFile(
+            mode="w",
+            prefix=f"hivemind-{name}-stdout-",
+            suffix=".log",
+            delete=False,  # Don't auto-delete, we'll read it later
         )
-    elif ref_name:
-        subprocess.run(
-            [
-                "git",
-                "clone",
-                "--progress" if not silent else "--quiet",
-                "--branch",
-                ref_name,
-                remote,
-                str(repo_dir),
-            ],
-            check=True,
-            stdout=subprocess.DEVNULL if silent else None,
-            stderr=subprocess.DEVNULL if silent else None,
+        stderr_path = Path(stderr_file.name)
+        stdout_path = Path(stdout_file.name)
+
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            cwd=str(cwd),
         )
+        proc.stdin.write(prompt.encode())
+        proc.stdin.close()
+        # Don't close files yet - process needs them
+        return proc, stderr_path, stdout_path, stderr_file, stdout_file
     else:
-        subprocess.run(
-            [
-                "git",
-                "clone",
-                "--progress" if not silent else "--quiet",
-                remote,
-                str(repo_dir),
-            ],
-            check=True,
-            stdout=subprocess.DEVNULL if silent else None,
-            stderr=subprocess.DEVNULL if silent else None,
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=str(cwd),
         )
+        stdout, stderr = proc.communicate(input=prompt.encode())
+        if proc.returncode != 0:
+            err_output = (stderr or stdout or b"").decode().strip()
+            if err_output:
+                print(f"Analysis error: {err_output}", file=sys.stderr)
+            else:
+                print(
+                    f"Analysis failed with exit code {proc.returncode}",
+                    file=sys.stderr,
+                )
+            return False
 
+        # Validate expected output files exist (engine may exit 0 despite
+        # failing to write, e.g. OpenCode rejecting external directory access)
+        expected = [
+            "summary.md",
+            "code_structure.md",
+            "build_system.md",
+            "apis_and_interfaces.md",
+        ]
+        if not is_update:
+            expected.append("agent.md")
+        missing = [f for f in expected if not (commit_dir / f).exists()]
+        if missing:
+            print(
+                f"Analysis produced no output — missing: {', '.join(missing)}",
+                file=sys.stderr,
+            )
+            return False
+
+        return True
+
+
+def _file_signature(path: Path) -> list[int] | None:
+    """Return [mtime_ns, size] for a file, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _librarian_entry(name: str, expert_dir: Path, cache: dict) -> dict | None:
+    """Return the catalog descriptor for an expert, re-reading files only on change.
+
+    Descriptors (see catalog.build_descriptor) are cached in cache[name] keyed
+    by the HEAD commit and the mtime/size of HEAD/agent.md and HEAD/summary.md,
+    so they are built once after an expert is analyzed or switched.
+    """
+    from hivemind_cli.catalog import DESCRIPTOR_VERSION, build_descriptor
+
+    agent_md = expert_dir / "HEAD" / "agent.md"
+    summary_md = expert_dir / "HEAD" / "summary.md"
+    agent_sig = _file_signature(agent_md)
+    if agent_sig is None:
+        cache.pop(name, None)
+        return None
+
+    key = [
+        DESCRIPTOR_VERSION,
+        _get_head_commit(expert_dir),
+        agent_sig,
+        _file_signature(summary_md),
+    ]
+    cached = cache.get(name)
+    if cached and cached["key"] == key:
+        return cached["descriptor"]
+
+    # Extract description from body (not frontmatter)
+    description = ""
+    try:
+        description = extract_description(strip_frontmatter(agent_md.read_text()))
+    except OSError:
+        pass
+
+    summary = ""
+    try:
+        summary = summary_md.read_text()
+    except OSError:
+        pass
+
+    descriptor = build_descriptor(name, description, summary)
+    cache[name] = {"key": key, "descriptor": descriptor}
+    return descriptor
+
+
+def _librarian_entries(names: set[str]) -> dict[str, dict]:
+    """Return catalog descriptors for the given experts, in catalog order.
+
+    Experts without a HEAD/agent.md are left out.
+    """
+    cache_path = CACHE_DIR / "librarian_entries.json"
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+    cache_before = copy.deepcopy(cache)
+
+    entries: dict[str, dict] = {}
+
+    # Scan both public and private experts
+    for expert_base_dir in [EXPERTS_DIR, PRIVATE_EXPERTS_DIR]:
+        if not expert_base_dir.exists():
+            continue
+        for expert_dir in sorted(expert_base_dir.iterdir()):
+            if not expert_dir.is_dir():
+                continue
+            name = expert_dir.name
+
+            # Skip if not requested
+            if name not in names:
+                continue
+
+            entry = _librarian_entry(name, expert_dir, cache)
+            if entry is not None:
+                entries[name] = entry
+
+    if cache != cache_before:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, cache_path)
+
+    return entries
+
+
+def _librarian_budget() -> dict:
+    """Token budget settings from the "librarian" section of config.json."""
+    from hivemind_cli.catalog import DEFAULT_MAX_TOKENS
+
+    settings = _load_config().get("librarian", {})
+    return {
+        "max_tokens": settings.get("max_tokens", DEFAULT_MAX_TOKENS),
+        "priority": settings.get("priority", []),
+    }
+
+
+def _librarian_body(descriptors: list[dict], category: str | None = None) -> str:
+    """Build the librarian prompt body around a list of expert descriptors.
+
+    Entries are fitted to the configured token budget (see catalog.fit_catalog).
+    With a category, the body is for that category's librarian.
+    """
+    from hivemind_cli.catalog import estimate_tokens, fit_catalog
+
+    scope = f"every {category} expert" if category else "every registered expert"
+
+    def body(catalog: str) -> str:
+        return (
+            "# Hivemind Librarian\n\n"
+            f"You are the hivemind librarian. You know {scope} and what "
+            "they specialize in. When asked a question, identify which expert(s) are best "
+            "suited and recommend them by name.\n\n"
+            "## Expert Catalog\n\n"
+            f"{catalog}\n\n"
+            "## Instructions\n\n"
+            "1. Identify the most relevant expert(s) from the catalog\n"
+            "2. Respond with expert name(s) and why they're the right fit\n"
+            "3. If multiple experts are relevant, rank by relevance\n"
+            "4. If no expert matches, say so clearly\n"
+        )
+
+    # The budget covers the whole body, so entries get what the prose leaves
+    budget = _librarian_budget()
+    budget["max_tokens"] -= estimate_tokens(body(""))
+    catalog, _ = fit_catalog(descriptors, **budget)
+    # Generate catalog even if empty, so librarian reflects current state
+    return body(catalog or "No experts are currently enabled.")
+
+
+def librarian_size() -> dict:
+    """Estimated token size of the deployed librarian files (without frontmatter).
+
+    Returns:
+        dict with keys: files (dict[str, int], filename -> tokens),
+        max_tokens (int, budget per librarian)
+    """
+    from hivemind_cli.catalog import estimate_tokens
+
+    files = {}
+    for path in sorted(AGENTS_DIR.glob("librarian*.md")):
+        try:
+            files[path.name] = estimate_tokens(strip_frontmatter(path.read_text()))
+        except OSError:
+            continue
+    return {"files": files, "max_tokens": _librarian_budget()["max_tokens"]}
+
+
+def _context_limited(config: dict) -> bool:
+    """True if config.json sets a budget for deployed agent descriptions."""
+    settings = config.get("context", {})
+    return "max_tokens" in settings or "max_experts" in settings
+
+
+def _context_plan(config: dict) -> dict:
+    """Decide which enabled experts to deploy, and with what descriptions.
+
+    Assistants load every deployed agent's name and description into each
+    session. The "context" section of config.json caps that:
+
+        "context": {"max_tokens": 3000, "max_experts": 25, "priority": ["bazel*"]}
+
+    Descriptions come from the cached catalog descriptors and are fitted by
+    catalog.fit_descriptions; the librarians' own descriptions count against
+    max_tokens too (category librarians only for categories that keep an
+    expert). priority defaults to the librarian's, and within it the
+    most used experts (see expert_usage) are kept longest.
+
+    Returns:
+        dict with keys: descriptions (dict[str, str], deployed expert ->
+        description), agents (dict[str, int], deployed agent, librarians
+        included -> estimated tokens of its listing), trimmed (list[str]),
+        skipped (list[str], experts not deployed), tokens (int, every listing
+        untrimmed), fitted_tokens (int, the sum of agents), max_tokens
+        (int | None)
+    """
+    from hivemind_cli.catalog import fit_descriptions, listing_tokens
+
+    settings = config.get("context", {})
+    entries = _librarian_entries(set(config.get("enabled", [])))
+    full = {name: entry["description"] for name, entry in entries.items()}
+
+    priority = settings.get("priority", config.get("librarian", {}).get("priority", []))
+    usage = {name: stats["count"] for name, stats in expert_usage().items()}
+
+    def librarians_for(names) -> dict[str, int]:
+        """Listing tokens of the librarians deployed alongside these experts."""
+        librarians = {"librarian": LIBRARIAN_DESCRIPTION}
+        if config.get("categories"):
+            for category in _categorize(list(names), config["categories"]):
+                description = _category_librarian_description(category)
+                librarians[f"librarian-{category}"] = description
+        return {agent: listing_tokens(agent, text) for agent, text in librarians.items()}
+
+    def fit(librarian_tokens: dict[str, int]) -> tuple[dict[str, str], list[str]]:
+        return fit_descriptions(
+            full,
+            max_tokens=settings.get("max_tokens"),
+            max_experts=settings.get("max_experts"),
+            priority=priority,
+            usage=usage,
+            reserved=sum(librarian_tokens.values()),
+        )
+
+    # Only categories with a kept expert get a librarian, so narrow the
+    # reservation to them until it settles. A refit whose freed tokens bring
+    # back a dropped category is not taken; the previous fit stays in budget.
+    librarian_tokens = librarians_for(full)
+    fitted, skipped = fit(librarian_tokens)
+    while (kept := librarians_for(fitted)) != librarian_tokens:
+        refitted, reskipped = fit(kept)
+        if not librarians_for(refitted).keys() <= kept.keys():
+            break
+        librarian_tokens, fitted, skipped = kept, refitted, reskipped
+    librarian_tokens = librarians_for(fitted)
+
+    def listings(descriptions: dict[str, str]) -> dict[str, int]:
+        return librarian_tokens | {
+            f"expert-{name}": listing_tokens(f"expert-{name}", text)
+            for name, text in descriptions.items()
+        }
+
+    agents = listings(fitted)
+    return {
+        "descriptions": fitted,
+        "agents": agents,
+        "trimmed": [name for name in fitted if fitted[name] != full[name]],
+        "skipped": skipped,
+        "tokens": sum(listings(full).values()),
+        "fitted_tokens": sum(agents.values()),
+        "max_tokens": settings.get("max_tokens"),
+    }
+
+
+def context_usage() -> dict:
+    """Measure what the deployed agents add to every assistant session.
+
+    Counts come from _context_plan, the same descriptions deploy_agents
+    writes, so per-agent figures add up to its fitted_tokens.
+
+    Returns:
+        dict with the keys of _context_plan except descriptions, plus
+        limited (bool, whether a budget is set)
+    """
+    config = _load_config()
+    plan = _context_plan(config)
+    del plan["descriptions"]
+    return {**plan, "limited": _context_limited(config)}
+
+
+def refresh_usage() -> dict:
+    """Count expert delegations in the deploy providers' session transcripts.
+
+    Only what was appended since the last scan is read (see usage.UsageIndex).
+
+    Returns:
+        dict with keys: transcripts (int, transcripts read), experts (dict,
+        expert name -> {"count": int, "last_used": float})
+    """
+    from hivemind_cli.usage import UsageIndex
+
+    path = CACHE_DIR / "usage.json"
+    index = UsageIndex.load(path)
+    transcripts = [
+        transcript
+        for provider, _ in _deploy_targets()
+        for transcript in provider.transcript_files()
+    ]
+    read = index.refresh(transcripts)
+    index.save(path)
+    return {"transcripts": read, "experts": index.experts}
+
+
+def expert_usage() -> dict[str, dict]:
+    """Expert name -> {"count", "last_used"} as of the last refresh_usage()."""
+    from hivemind_cli.usage import UsageIndex
+
+    return UsageIndex.load(CACHE_DIR / "usage.json").experts
+
+
+def _router_body(groups: dict[str, list[str]]) -> str:
+    """Build the top-level librarian body that routes to category librarians."""
+    sections = [
+        f"### librarian-{category}\n"
+        + ", ".join(f"expert-{name}" for name in names)
+        for category, names in groups.items()
+    ]
+    catalog = "\n\n".join(sections) if sections else "No experts are currently enabled."
+
+    return (
+        "# Hivemind Librarian\n\n"
+        "You are the hivemind librarian. Experts are grouped into categories, and "
+        "each category has its own librarian that knows its experts in detail.\n\n"
+        "## Categories\n\n"
+        f"{catalog}\n\n"
+        "## Instructions\n\n"
+        "1. Identify the category (or categories) that fit the question\n"
+        "2. If the right expert is clear from its name, recommend it directly\n"
+        "3. Otherwise delegate to the category librarian(s) to pick the expert\n"
+        "4. If no category matches, say so clearly\n"
+    )
+
+
+def _category_librarian_description(category: str) -> str:
+    return (
+        f"Hivemind {category} librarian -- knows the {category} expert "
+        "agents and their capabilities. Ask it to pick the right "
+        f"{category} expert for a question."
+    )
+
+
+def _categorize(names: list[str], categories: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Group expert names by the first category whose glob patterns match.
+
+    Args:
+        names: Expert names, in catalog order
+        categories: Category -> list of fnmatch patterns (config "categories")
+
+    Returns:
+        dict of category -> expert names; unmatched experts go to "other"
+    """
+    groups: dict[str, list[str]] = {category: [] for category in categories}
+    groups["other"] = groups.get("other", [])
+    for name in names:
+        for category, patterns in categories.items():
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                groups[category].append(name)
+                break
+        else:
+            groups["other"].append(name)
+    return {category: members for category, members in groups.items() if members}
+
+
+def _category_members(category: str) -> list[str]:
+    """Return all experts (enabled or not) in a config category."""
+    categories = _load_config().get("categories", {})
+    return _categorize(_expert_names(), categories).get(category, [])
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write content unless the file already has the same content hash."""
+    try:
+        current = hashlib.sha256(path.read_bytes()).digest()
+    except OSError:
+        current = None
+    if current == hashlib.sha256(content.encode()).digest():
+        return False
+
+    # Replace rather than overwrite, so hard links in other generations of
+    # the agents tree keep their content
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content)
+    os.replace(tmp, path)
     return True
 
 
-def _analyze_repo(
-    name: str,
-    commit: str,
-    repo_dir: Path,
-    expert_dir: Path,
+def _update_librarian(targets: list[tuple[Provider, Path]] | None = None) -> dict:
+    """Regenerate agents/librarian.md from enabled experts with valid HEAD/agent.md.
+
+    Catalog entries come from a per-expert cache (see _librarian_entry), and
+    files are only rewritten when their content actually changes. When
+    config.json defines "categories", librarian.md becomes a small router and
+    each category gets its own agents/librarian-<category>.md catalog.
+
+    Args:
+        targets: (provider, agents dir) pairs to write to, e.g. staged
+            trees (default: _deploy_targets(), under _agents_lock())
+
+    Returns:
+        dict with keys: written, unchanged, removed (int, librarian file
+        counts summed over targets)
+    """
+    if targets is None:
+        with _agents_lock():
+            return _update_librarian(_deploy_targets())
+
+    # Load config to get enabled experts (minus any the context budget skips)
+    config = _load_config()
+    names = set(config.get("enabled", []))
+    if _context_limited(config):
+        names -= set(_context_plan(config)["skipped"])
+    entries = _librarian_entries(names)
+
+    # Bodies are shared; only frontmatter differs between providers
+    bodies: dict[str, tuple[str, str | None, str | None]] = {}
+    categories = config.get("categories")
+    if categories:
+        groups = _categorize(list(entries), categories)
+        for category, names in groups.items():
+            bodies[f"librarian-{category}.md"] = (
+                _librarian_body([entries[n] for n in names], category=category),
+                f"librarian-{category}",
+                _category_librarian_description(category),
+            )
+        bodies["librarian.md"] = (_router_body(groups), None, None)
+    else:
+        bodies["librarian.md"] = (_librarian_body(list(entries.values())), None, None)
+
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    for provider, agents_dir in targets:
+        # Remove librarians of categories that no longer have enabled experts
+        if agents_dir.exists():
+            for stale in agents_dir.glob("librarian-*.md"):
+                if stale.name not in bodies:
+                    stale.unlink()
+                    counts["removed"] += 1
+
+        # Format with provider-specific frontmatter
+        for filename, (body, name, description) in bodies.items():
+            kwargs = {"name": name, "description": description} if name else {}
+            content = provider.format_librarian_md(body, **kwargs)
+            if _write_if_changed(agents_dir / filename, content):
+                counts["written"] += 1
+            else:
+                counts["unchanged"] += 1
+    return counts
+
+
+def _routing_index() -> RoutingIndex:
+    """Load the local routing index, re-indexing experts whose docs changed."""
+    from hivemind_cli.routing import RoutingIndex
+
+    index_path = CACHE_DIR / "routing_index.json"
+    index = RoutingIndex.load(index_path)
+    if index.refresh({name: _get_expert_dir(name) for name in _expert_names()}):
+        index.save(index_path)
+    return index
+
+
+def _doc_files() -> dict[Path, str]:
+    """Map every searchable markdown file to its expert.
+
+    Covers experts/*/HEAD/*.md (public and private) and external_docs/*/**.md.
+    """
+    files: dict[Path, str] = {}
+    for name in _expert_names():
+        head = _get_expert_dir(name) / "HEAD"
+        if head.is_dir():
+            for path in sorted(head.glob("*.md")):
+                files[path] = name
+    if EXTERNAL_DOCS_DIR.is_dir():
+        for docs_dir in sorted(EXTERNAL_DOCS_DIR.iterdir()):
+            if docs_dir.is_dir():
+                for path in sorted(docs_dir.rglob("*.md")):
+                    files[path] = docs_dir.name
+    return files
+
+
+def search_docs(
+    terms: str, *, expert: str | None = None, limit: int = 20
+) -> list[SearchHit]:
+    """Full-text search over knowledge docs and crawled docs.
+
+    The index (~/.cache/hivemind/search.db) is refreshed first, re-reading
+    only files whose mtime or size changed.
+    """
+    from hivemind_cli.search import SearchIndex
+
+    index = SearchIndex(CACHE_DIR / "search.db")
+    try:
+        index.refresh(_doc_files())
+        return index.search(terms, expert=expert, limit=limit)
+    finally:
+        index.close()
+
+
+def rank_experts(
+    question: str, limit: int | None = None, *, semantic: bool = False
+) -> list[dict]:
+    """Rank enabled experts for a question with the local index.
+
+    No engine is called, so this returns in milliseconds.
+
+    Args:
+        question: Free-text question
+        limit: Maximum number of results
+        semantic: Rank by n-gram vector similarity (needs numpy) instead of BM25,
+            which also matches paraphrases and inflected words
+
+    Returns:
+        list of dicts with keys: name (str), score (float), description (str),
+        best match first
+
+    Raises:
+        ImportError: semantic is set and numpy is not installed
+    """
+    enabled = _load_config().get("enabled", [])
+    index = _routing_index()
+    if semantic:
+        from hivemind_cli.semantic import SemanticIndex
+
+        vectors = SemanticIndex(CACHE_DIR / "semantic")
+        vectors.refresh(index)
+        ranked = vectors.rank(question, enabled, limit)
+    else:
+        ranked = index.rank(question, enabled, limit)
+    return [
+        {
+            "name": name,
+            "score": score,
+            "description": index.experts[name]["description"],
+        }
+        for name, score in ranked
+    ]
+
+
+# --- Core Operations ---
+
+
+def add_expert(
+    url: str,
+    ref: str | None = None,
+    *,
+    private: bool = False,
+    on_progress: ProgressCallback | None = None,
+    silent: bool = True,
+    deploy: bool = True,
+) -> dict:
+    """Register a new repo expert: clone, analyze, enable and deploy it.
+
+    All work happens in a temp directory; nothing is installed unless
+    analysis succeeds.
+
+    Args:
+        url: Git remote URL (the expert name is derived from it)
+        ref: Tag, branch, or commit to pin
+        private: Store under private-experts/ and private-repos.json
+        on_progress: Progress callback function
+        silent: If False, let git print clone progress to the terminal
+        deploy: Deploy the expert and regenerate the librarian; callers
+            that serialize deploys themselves pass False
+
+    Returns:
+        dict with keys: success (bool), name (str), commit (str | None),
+                        error (str | None), already_exists (bool | None)
+    """
+    name = url.rstrip("/").split("/")[-1].removesuffix(".git")
+
+    def report(phase: UpdatePhase, message: str, **kwargs) -> None:
+        if on_progress:
+            on_progress(ProgressInfo(name, phase, message, **kwargs))
+
+    if (EXPERTS_DIR / name).is_dir() or (PRIVATE_EXPERTS_DIR / name).is_dir():
+        return {
+            "success": False,
+            "name": name,
+            "error": f"Expert '{name}' already exists",
+            "already_exists": True,
+        }
+
+    # Resolve commit from ref (if provided)
+    commit = ""
+    ref_name = ref or ""
+    if ref:
+        report(UpdatePhase.CHECKING, f"Resolving ref '{ref}'...")
+        try:
+            result = subprocess.run(
+                ["git", "ls-remote", url, ref],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            if result.stdout.strip():
+                commit = result.stdout.strip().split()[0]
+            else:
+                commit = ref
+                ref_name = ref
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            commit = ref
+
+    tmpdir = tempfile.mkdtemp(prefix=f"hivemind-{name}-")
+    tmp_repo = Path(tmpdir) / "repo"
+    tmp_expert = Path(tmpdir) / "expert"
+    tmp_expert.mkdir()
+    quiet = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL} if silent else {}
+
+    try:
+        report(UpdatePhase.CLONING, f"Cloning {name}...")
+        clone = ["git", "clone", "--quiet" if silent else "--progress"]
+        try:
+            if commit and ref_name:
+                subprocess.run([*clone, url, str(tmp_repo)], check=True, **quiet)
+                subprocess.run(
+                    ["git", "checkout", "--quiet", commit],
+                    cwd=str(tmp_repo),
+                    check=True,
+                    **quiet,
+                )
+            elif ref_name:
+                subprocess.run(
+                    [*clone, "--branch", ref_name, url, str(tmp_repo)],
+                    check=True,
+                    **quiet,
+                )
+            else:
+                subprocess.run([*clone, url, str(tmp_repo)], check=True, **quiet)
+
+            # Resolve commit hash from clone if not pinned
+            if not commit:
+                commit = subprocess.run(
+                    ["git", "rev-parse", "HEAD"],
+                    cwd=str(tmp_repo),
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.strip()
+        except subprocess.CalledProcessError:
+            return {"success": False, "name": name, "error": f"Failed to clone {url}"}
+
+        (tmp_expert / commit).mkdir(parents=True, exist_ok=True)
+        report(
+            UpdatePhase.STAGING,
+            f"Created staging experts/{name}/{commit[:12]}/",
+            new_commit=commit,
+        )
+
+        report(UpdatePhase.ANALYZING, f"Running AI analysis of {name}...")
+        if not _analyze_repo(name, commit, tmp_repo, tmp_expert):
+            return {
+                "success": False,
+                "name": name,
+                "commit": commit,
+                "error": f"AI analysis failed for {name}",
+            }
+
+        # --- Success: move everything to final locations ---
+        report(UpdatePhase.COMMITTING, f"Installing {name}...")
+        _ensure_repos_link()
+        final_repo = REPOS_DIR / name
+        if final_repo.exists():
+            shutil.rmtree(final_repo)
+        shutil.move(str(tmp_repo), str(final_repo))
+
+        base_dir = PRIVATE_EXPERTS_DIR if private else EXPERTS_DIR
+        base_dir.mkdir(parents=True, exist_ok=True)
+        expert_dir = base_dir / name
+        shutil.move(str(tmp_expert), str(expert_dir))
+
+        report(UpdatePhase.UPDATING_HEAD, f"HEAD → {commit[:12]}", new_commit=commit)
+        (expert_dir / "HEAD").symlink_to(commit)
+
+        entry = {"remote": url, "commit": commit, "ref_name": ref_name}
+        _set_repo(name, entry, private=private)
+
+        # Enable in config and mark as private if needed
+        with _editing_config() as config:
+            if name not in config["enabled"]:
+                config["enabled"].append(name)
+            if name in config["disabled"]:
+                config["disabled"].remove(name)
+            if private:
+                config.setdefault("private", [])
+                if name not in config["private"]:
+                    config["private"].append(name)
+
+        if deploy:
+            _deploy_agent(name)
+            _deploy_expert(name)
+            report(UpdatePhase.UPDATING_LIBRARIAN, "Updating librarian...")
+            _update_librarian()
+
+        return {"success": True, "name": name, "commit": commit}
+
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _answer_cache() -> AnswerCache:
+    """Answer cache configured from the "query_cache" section of config.json."""
+    from hivemind_cli.answer_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, AnswerCache
+    from hivemind_cli.scheduler import parse_interval
+
+    settings = _load_config().get("query_cache", {})
+    return AnswerCache(
+        CACHE_DIR / "answers.json",
+        ttl=parse_interval(settings.get("ttl", DEFAULT_TTL)),
+        max_entries=settings.get("max_entries", DEFAULT_MAX_ENTRIES),
+    )
+
+
+def _stream_query(
+    provider: Provider,
+    cmd: list[str],
+    prompt: str,
+    on_output: Callable[[str], None],
+    timeout: float | None,
+    on_subprocess_start: Callable[[int], None] | None = None,
+) -> tuple[int | None, str, str]:
+    """Run a streaming engine query, passing answer text on as it arrives.
+
+    The engine runs in its own session so that a timeout or Ctrl-C
+    (KeyboardInterrupt, re-raised) kills it along with any children. Callers
+    running this off the main thread get the session's pid through
+    on_subprocess_start so they can kill it themselves.
+
+    Returns:
+        (exit code or None on timeout, answer text, stderr)
+    """
+    import threading
+
+    stderr_file = tempfile.TemporaryFile(mode="w+")
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=stderr_file,
+        text=True,
+        start_new_session=True,
+    )
+    if on_subprocess_start:
+        on_subprocess_start(proc.pid)
+
+    def kill() -> None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def feed() -> None:
+        try:
+            proc.stdin.write(prompt)
+            proc.stdin.close()
+        except (BrokenPipeError, ValueError):
+            pass
+
+    expired = threading.Event()
+
+    def expire() -> None:
+        expired.set()
+        kill()
+
+    timer = threading.Timer(timeout, expire) if timeout else None
+    threading.Thread(target=feed, daemon=True).start()
+    if timer:
+        timer.start()
+    answer: list[str] = []
+    try:
+        for line in proc.stdout:
+            text = provider.parse_query_stream(line)
+            if text:
+                answer.append(text)
+                on_output(text)
+        proc.wait()
+    except BaseException:
+        kill()
+        proc.wait()
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        proc.stdout.close()
+
+    stderr_file.seek(0)
+    stderr = stderr_file.read()
+    stderr_file.close()
+    return None if expired.is_set() else proc.returncode, "".join(answer), stderr
+
+
+def query_librarian(
+    question: str,
+    top_k: int | None = None,
     *,
-    is_update: bool = False,
-    background: bool = False,
-) -> subprocess.Popen | tuple[subprocess.Popen, Path, Path, object, object] | bool:
-    """Run AI analysis on a repo via the active provider's engine.
-
-    For create (is_update=False): generates 5 files (4 knowledge + agent.md).
-    For update (is_update=True): regenerates 4 knowledge files, preserves agent.md.
+    use_cache: bool = True,
+    on_output: Callable[[str], None] | None = None,
+    timeout: float | None = None,
+) -> dict:
+    """Ask the librarian which expert(s) can help with a question.
 
-    If background=True, returns (proc, stderr_path, stdout_path, stderr_file, stdout_file) tuple.
-    Otherwise, waits for completion and returns True on success.
-    """
-    commit_dir = expert_dir / commit
+    Answers are cached per question and librarian prompt (see answer_cache),
+    so repeats skip the engine until the catalog changes.
 
-    # Use centralized templates from templates.py
-    if is_update:
-        prompt = update_expert_prompt(name, commit, repo_dir, commit_dir)
-    else:
-        from hivemind_cli.templates import create_expert_prompt
+    Args:
+        question: Question to route
+        top_k: If set, only send the catalog entries of the top_k experts from
+            the local routing index instead of the whole librarian
+        use_cache: Look up and store the answer in the answer cache
+        on_output: Stream the answer: called with each chunk of text as the
+            engine produces it (once with the whole answer on a cache hit)
+        timeout: Seconds before the engine is killed and the query fails
 
-        prompt = create_expert_prompt(name, commit, repo_dir, commit_dir)
+    Returns:
+        dict with keys: success (bool), answer (str), error (str | None),
+                        candidates (list[str] | None), cached (bool)
+    """
+    librarian = AGENTS_DIR / "librarian.md"
+    if not librarian.exists():
+        return {"success": False, "answer": "", "error": "librarian.md not found"}
 
     provider = _get_provider()
-    cmd = provider.build_analysis_command(
-        extra_dirs=[repo_dir, expert_dir],
-    )
+    config = _load_config()
+    candidates = None
+    system_prompt = librarian.read_text()
+    if top_k:
+        candidates = [match["name"] for match in rank_experts(question, top_k)]
+        # No keyword overlap at all: let the full catalog decide
+        if candidates:
+            entries = _librarian_entries(set(candidates))
+            system_prompt = provider.format_librarian_md(
+                _librarian_body([entries[n] for n in candidates if n in entries])
+            )
+    elif config.get("categories"):
+        # A one-shot query can't delegate, so route to the categories of the
+        # best local matches and send their catalogs instead of the router
+        matches = [match["name"] for match in rank_experts(question, 3)]
+        groups = _categorize(config["enabled"], config["categories"])
+        chosen = [c for c, names in groups.items() if set(names) & set(matches)]
+        if chosen:
+            candidates = [n for c in chosen for n in groups[c]]
+            entries = _librarian_entries(set(candidates))
+            system_prompt = provider.format_librarian_md(
+                _librarian_body(
+                    [entries[n] for n in candidates if n in entries],
+                    category=" and ".join(chosen),
+                )
+            )
 
-    # Run from common parent so the engine has filesystem access to both
-    # the repo and expert directories (matches async callers which already
-    # set cwd=staged_path)
-    cwd = Path(os.path.commonpath([repo_dir.resolve(), expert_dir.resolve()]))
+    if use_cache:
+        from hivemind_cli.answer_cache import cache_key
 
-    if background:
-        # Create temp files for stderr and stdout - use NamedTemporaryFile
-        stderr_file = tempfile.NamedTemporaryFile(
-            mode="w",
-            prefix=f"hivemind-{name}-stderr-",
-            suffix=".log",
-            delete=False,  # Don't auto-delete, we'll read it later
-        )
-        stdout_file = tempfile.NamedTemporaryFile(
-            mode="w",
-            prefix=f"hivemind-{name}-stdout-",
-            suffix=".log",
-            delete=False,  # Don't auto-delete, we'll read it later
-        )
-        stderr_path = Path(stderr_file.name)
-        stdout_path = Path(stdout_file.name)
+        cache = _answer_cache()
+        key = cache_key(question, system_prompt)
+        answer = cache.get(key)
+        if answer is not None:
+            if on_output:
+                on_output(answer)
+            return {
+                "success": True,
+                "answer": answer,
+                "candidates": candidates,
+                "cached": True,
+            }
 
-        proc = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=stdout_file,
-            stderr=stderr_file,
-            cwd=str(cwd),
+    prompt = f"{system_prompt}\n\n{question}"
+    if on_output:
+        returncode, stdout, stderr = _stream_query(
+            provider, provider.build_query_command(stream=True), prompt, on_output, timeout
         )
-        proc.stdin.write(prompt.encode())
-        proc.stdin.close()
-        # Don't close files yet - process needs them
-        return proc, stderr_path, stdout_path, stderr_file, stdout_file
     else:
-        proc = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=str(cwd),
-        )
-        stdout, stderr = proc.communicate(input=prompt.encode())
-        if proc.returncode != 0:
-            err_output = (stderr or stdout or b"").decode().strip()
-            if err_output:
-                print(f"Analysis error: {err_output}", file=sys.stderr)
-            else:
-                print(
-                    f"Analysis failed with exit code {proc.returncode}",
-                    file=sys.stderr,
-                )
-            return False
-
-        # Validate expected output files exist (engine may exit 0 despite
-        # failing to write, e.g. OpenCode rejecting external directory access)
-        expected = [
-            "summary.md",
-            "code_structure.md",
-            "build_system.md",
-            "apis_and_interfaces.md",
-        ]
-        if not is_update:
-            expected.append("agent.md")
-        missing = [f for f in expected if not (commit_dir / f).exists()]
-        if missing:
-            print(
-                f"Analysis produced no output — missing: {', '.join(missing)}",
-                file=sys.stderr,
+        try:
+            result = subprocess.run(
+                provider.build_query_command(),
+                input=prompt,
+                text=True,
+                capture_output=True,
+                timeout=timeout,
             )
-            return False
+            returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+        except subprocess.TimeoutExpired as e:
+            returncode, stdout, stderr = None, e.stdout or "", ""
+            if isinstance(stdout, bytes):
+                stdout = stdout.decode(errors="replace")
+    if returncode != 0:
+        if returncode is None:
+            error = f"Query timed out after {timeout:g}s"
+        else:
+            error = stderr.strip() or f"Query failed with exit code {returncode}"
+        return {
+            "success": False,
+            "answer": stdout.strip(),
+            "error": error,
+            "candidates": candidates,
+            "cached": False,
+        }
 
-        return True
+    answer = stdout.strip()
+    if use_cache and answer:
+        cache.put(key, answer)
+    return {"success": True, "answer": answer, "candidates": candidates, "cached": False}
 
 
-def _update_librarian() -> None:
-    """Regenerate agents/librarian.md from enabled experts with valid HEAD/agent.md."""
-    # Load config to get enabled experts
-    config = _load_config()
-    enabled_experts = set(config.get("enabled", []))
+def ask_experts(
+    question: str,
+    *,
+    max_experts: int = 3,
+    tie_ratio: float = 0.8,
+    on_output: Callable[[str, str], None] | None = None,
+    timeout: float | None = None,
+) -> list[dict]:
+    """Route a question with the local index and ask the chosen experts directly.
 
-    entries: list[str] = []
+    The best match is always asked; other top matches scoring within
+    tie_ratio of it are asked too, in parallel. Each expert runs as its
+    deployed agent, so no librarian round-trip is needed.
 
-    # Scan both public and private experts
-    for expert_base_dir in [EXPERTS_DIR, PRIVATE_EXPERTS_DIR]:
-        if not expert_base_dir.exists():
-            continue
-        for expert_dir in sorted(expert_base_dir.iterdir()):
-            if not expert_dir.is_dir():
-                continue
-            name = expert_dir.name
+    Args:
+        question: Question to answer
+        max_experts: Most experts to ask at once
+        tie_ratio: Score fraction of the best match that counts as a tie
+        on_output: Called with (expert name, text chunk) as answers stream in
+        timeout: Seconds before each engine is killed
 
-            # Skip if not enabled
-            if name not in enabled_experts:
-                continue
+    Returns:
+        One dict per expert asked, best match first, with keys: name (str),
+        score (float), success (bool), answer (str), error (str | None).
+        Empty if no expert matches.
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-            agent_md = expert_dir / "HEAD" / "agent.md"
-            if not agent_md.exists():
-                continue
+    matches = rank_experts(question, max_experts)
+    if not matches:
+        return []
+    chosen = [m for m in matches if m["score"] >= matches[0]["score"] * tie_ratio]
 
-            # Extract description from body (not frontmatter)
-            description = ""
-            try:
-                text = agent_md.read_text()
-                body = strip_frontmatter(text)
-                description = extract_description(body)
-            except OSError:
-                pass
+    provider = _get_provider()
+    pids: list[int] = []
+
+    def ask(match: dict) -> dict:
+        name = match["name"]
+        result = {"name": name, "score": match["score"], "success": False, "answer": ""}
+        if not (AGENTS_DIR / f"expert-{name}.md").exists():
+            return {**result, "error": f"expert-{name} is not deployed (run hivemind redeploy)"}
+        returncode, answer, stderr = _stream_query(
+            provider,
+            provider.build_ask_command(f"expert-{name}", stream=True),
+            question,
+            (lambda text: on_output(name, text)) if on_output else (lambda text: None),
+            timeout,
+            on_subprocess_start=pids.append,
+        )
+        if returncode is None:
+            error = f"Timed out after {timeout:g}s"
+        elif returncode != 0:
+            error = stderr.strip() or f"Engine failed with exit code {returncode}"
+        else:
+            error = None
+        return {**result, "success": error is None, "answer": answer.strip(), "error": error}
 
-            # Read first ~5 lines of summary.md
-            summary_lines = ""
-            summary_md = expert_dir / "HEAD" / "summary.md"
+    executor = ThreadPoolExecutor(max_workers=len(chosen))
+    futures = [executor.submit(ask, match) for match in chosen]
+    try:
+        return [future.result() for future in futures]
+    except BaseException:
+        # Workers block on engine output; killing the engines releases them
+        for pid in pids:
             try:
-                lines = summary_md.read_text().splitlines()
-                summary_lines = "\n".join(lines[:5])
-            except OSError:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
                 pass
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-            entry = f"### expert-{name}\n{description}\n\n{summary_lines}"
-            entries.append(entry)
 
-    # Generate catalog even if empty, so librarian reflects current state
-    catalog = (
-        "\n\n---\n\n".join(entries) if entries else "No experts are currently enabled."
-    )
+def query_librarian_batch(
+    questions: list[str],
+    *,
+    jobs: int = 4,
+    top_k: int | None = None,
+    use_cache: bool = True,
+    timeout: float | None = None,
+) -> Iterator[dict]:
+    """Ask the librarian many questions, running up to `jobs` engines at once.
 
-    # Build librarian body
-    librarian_body = (
-        "# Hivemind Librarian\n\n"
-        "You are the hivemind librarian. You know every registered expert and what "
-        "they specialize in. When asked a question, identify which expert(s) are best "
-        "suited and recommend them by name.\n\n"
-        "## Expert Catalog\n\n"
-        f"{catalog}\n\n"
-        "## Instructions\n\n"
-        "1. Identify the most relevant expert(s) from the catalog\n"
-        "2. Respond with expert name(s) and why they're the right fit\n"
-        "3. If multiple experts are relevant, rank by relevance\n"
-        "4. If no expert matches, say so clearly\n"
-    )
+    Results are yielded in input order as soon as each one (and every
+    question before it) is answered.
 
-    # Format with provider-specific frontmatter
-    provider = _get_provider()
-    content = provider.format_librarian_md(librarian_body)
+    Args:
+        questions: Questions to route
+        jobs: Maximum concurrent engine calls
+        top_k, use_cache, timeout: As for query_librarian()
 
-    AGENTS_DIR.mkdir(parents=True, exist_ok=True)
-    (AGENTS_DIR / "librarian.md").write_text(content)
+    Yields:
+        query_librarian() result dicts plus question (str) and
+        latency (float, seconds)
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
+    # Refresh the shared caches once up front so workers only read them
+    config = _load_config()
+    if top_k or config.get("categories"):
+        _routing_index()
+        _librarian_entries(set(config.get("enabled", [])))
+
+    def ask(question: str) -> dict:
+        start = time.monotonic()
+        result = query_librarian(
+            question, top_k=top_k, use_cache=use_cache, timeout=timeout
+        )
+        latency = round(time.monotonic() - start, 3)
+        return {"question": question, **result, "latency": latency}
 
-# --- Core Operations ---
+    executor = ThreadPoolExecutor(max_workers=max(1, jobs))
+    try:
+        futures = [executor.submit(ask, question) for question in questions]
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def update_expert(
@@ -549,18 +2030,35 @@ def update_expert(
     on_progress: ProgressCallback | None = None,
     *,
     skip_analysis: bool = False,
+    cancellation_token: CancellationToken | None = None,
 ) -> dict:
     """Update a single expert with progress reporting.
 
+    A cancelled token stops the update before the checkout of the new
+    commit; after that it runs to completion.
+
     Returns:
-        dict with keys: success (bool), new_commit (str), old_commit (str), error (str | None)
+        dict with keys: success (bool), new_commit (str), old_commit (str),
+        error (str | None), cancelled (bool | None)
     """
+
+    def cancelled() -> bool:
+        return bool(cancellation_token and cancellation_token.is_cancelled())
+
+    cancelled_result = {
+        "success": False,
+        "error": "Update cancelled by user",
+        "cancelled": True,
+    }
+
     repos, is_private = _get_repos_for_expert(name)
 
     if name not in repos:
         return {"success": False, "error": f"{name} not in repos"}
 
     # Phase 1: Clone/fetch
+    if cancelled():
+        return cancelled_result
     if on_progress:
         on_progress(ProgressInfo(name, UpdatePhase.CLONING, "Cloning repository..."))
 
@@ -569,6 +2067,8 @@ def update_expert(
 
     repo_dir = REPOS_DIR / name
 
+    if cancelled():
+        return cancelled_result
     if on_progress:
         on_progress(
             ProgressInfo(name, UpdatePhase.FETCHING, "Fetching latest commits...")
@@ -585,6 +2085,8 @@ def update_expert(
         return {"success": False, "error": f"Failed to fetch: {e.stderr.decode()}"}
 
     # Get latest commit
+    if cancelled():
+        return cancelled_result
     if on_progress:
         on_progress(ProgressInfo(name, UpdatePhase.CHECKING, "Checking for updates..."))
 
@@ -615,6 +2117,8 @@ def update_expert(
         }
 
     # Phase 2: Stage for analysis
+    if cancelled():
+        return cancelled_result
     if on_progress:
         on_progress(
             ProgressInfo(
@@ -772,11 +2276,7 @@ def update_expert(
         head_link.symlink_to(new_commit)
 
         # Update repos.json or private-repos.json
-        repos[name]["commit"] = new_commit
-        if is_private:
-            _save_private_repos(repos)
-        else:
-            _save_repos(repos)
+        _record_commit(name, new_commit)
 
         return {
             "success": True,
@@ -792,7 +2292,7 @@ async def update_expert_async_internal(
     name: str,
     on_progress: ProgressCallback | None = None,
     on_subprocess_start: Callable[[int], None] | None = None,
-    cancellation_token: "CancellationToken | None" = None,
+    cancellation_token: CancellationToken | None = None,
 ) -> dict:
     """Async version of update_expert with cancellation support.
 
@@ -806,7 +2306,7 @@ async def update_expert_async_internal(
         dict with keys: success (bool), new_commit (str), old_commit (str),
                         error (str | None), cancelled (bool | None)
     """
-    from hivemind_cli.tui.operations import CancellationToken
+    import asyncio
 
     def _check_cancellation(phase: str):
         """Check if operation was cancelled (except during risky phases)."""
@@ -1089,9 +2589,8 @@ async def update_expert_async_internal(
             head_link.unlink()
         head_link.symlink_to(new_commit)
 
-        # Update repos.json
-        repos[name]["commit"] = new_commit
-        _save_repos(repos)
+        # Update repos.json or private-repos.json
+        _record_commit(name, new_commit)
 
         return {
             "success": True,
@@ -1299,7 +2798,8 @@ async def switch_version_async(
     target_commit: str,
     on_progress: ProgressCallback | None = None,
     on_subprocess_start: Callable[[int], None] | None = None,
-    cancellation_token: "CancellationToken | None" = None,
+    cancellation_token: CancellationToken | None = None,
+    deploy: bool = True,
 ) -> dict:
     """Switch expert to a different version (async with cancellation support).
 
@@ -1309,12 +2809,14 @@ async def switch_version_async(
         on_progress: Progress callback function
         on_subprocess_start: Called with subprocess PID when analysis starts
         cancellation_token: Token to check for cancellation requests
+        deploy: Redeploy the expert's agent file; callers that serialize
+            deploys themselves pass False
 
     Returns:
         dict with keys: success (bool), old_commit (str), new_commit (str),
                         error (str | None), cancelled (bool | None)
     """
-    from hivemind_cli.tui.operations import CancellationToken
+    import asyncio
 
     def _check_cancellation(phase: str):
         """Check if operation was cancelled (except during risky phases)."""
@@ -1598,14 +3100,11 @@ async def switch_version_async(
         head_link.symlink_to(target_commit)
 
         # Redeploy agent file with updated content
-        _deploy_agent(name)
+        if deploy:
+            _deploy_agent(name)
 
         # Update repos.json or private-repos.json
-        repos[name]["commit"] = target_commit
-        if is_private:
-            _save_private_repos(repos)
-        else:
-            _save_repos(repos)
+        _record_commit(name, target_commit)
 
         return {
             "success": True,
@@ -1659,30 +3158,49 @@ def enable_expert(name: str) -> dict:
     Returns:
         dict with keys: success (bool), already_enabled (bool), error (str | None)
     """
-    expert_dir = _get_expert_dir(name)
-    if not expert_dir.is_dir():
-        return {"success": False, "error": f"Expert '{name}' not found"}
+    return enable_experts([name])[name]
 
-    config = _load_config()
-    already_enabled = name in config["enabled"]
 
-    if not already_enabled:
-        config["enabled"].append(name)
-        if name in config["disabled"]:
-            config["disabled"].remove(name)
-        _save_config(config)
+def enable_experts(names: list[str]) -> dict[str, dict]:
+    """Enable several experts with one config write and one librarian update.
 
-    repos, is_private = _get_repos_for_expert(name)
-    if not _clone_repo(name, repos, silent=True):
-        return {"success": False, "error": "Failed to clone repository"}
+    Returns:
+        dict mapping each name to an enable_expert() result
+    """
+    results: dict[str, dict] = {}
+    with _editing_config() as config:
+        for name in names:
+            expert_dir = _get_expert_dir(name)
+            if not expert_dir.is_dir():
+                results[name] = {"success": False, "error": f"Expert '{name}' not found"}
+                continue
+
+            already_enabled = name in config["enabled"]
+            if not already_enabled:
+                config["enabled"].append(name)
+                if name in config["disabled"]:
+                    config["disabled"].remove(name)
+            results[name] = {"success": True, "already_enabled": already_enabled}
+
+    for name, result in results.items():
+        if not result["success"]:
+            continue
+        repos, is_private = _get_repos_for_expert(name)
+        try:
+            cloned = _clone_repo(name, repos, silent=True)
+        except subprocess.CalledProcessError:
+            cloned = False
+        if not cloned:
+            results[name] = {"success": False, "error": "Failed to clone repository"}
+            continue
+        _deploy_expert(name)
 
-    _deploy_agent(name)
-    _deploy_expert(name)
+    deploy_agents([name for name, result in results.items() if result["success"]])
 
     # Update librarian to reflect enabled experts
     _update_librarian()
 
-    return {"success": True, "already_enabled": already_enabled}
+    return results
 
 
 def disable_expert(name: str) -> dict:
@@ -1691,54 +3209,346 @@ def disable_expert(name: str) -> dict:
     Returns:
         dict with keys: success (bool), already_disabled (bool), error (str | None)
     """
-    expert_dir = _get_expert_dir(name)
-    if not expert_dir.is_dir():
-        return {"success": False, "error": f"Expert '{name}' not found"}
+    return disable_experts([name])[name]
 
-    config = _load_config()
-    already_disabled = name not in config["enabled"] and name in config["disabled"]
 
-    if not already_disabled:
-        if name in config["enabled"]:
-            config["enabled"].remove(name)
-        if name not in config["disabled"]:
-            config["disabled"].append(name)
-        _save_config(config)
+def disable_experts(names: list[str]) -> dict[str, dict]:
+    """Disable several experts with one config write and one librarian update.
+
+    Returns:
+        dict mapping each name to a disable_expert() result
+    """
+    results: dict[str, dict] = {}
+    with _editing_config() as config:
+        for name in names:
+            expert_dir = _get_expert_dir(name)
+            if not expert_dir.is_dir():
+                results[name] = {"success": False, "error": f"Expert '{name}' not found"}
+                continue
+
+            already_disabled = name not in config["enabled"] and name in config["disabled"]
+            if not already_disabled:
+                if name in config["enabled"]:
+                    config["enabled"].remove(name)
+                if name not in config["disabled"]:
+                    config["disabled"].append(name)
+            results[name] = {"success": True, "already_disabled": already_disabled}
 
-    _undeploy_agent(name)
-    _undeploy_expert(name)
+    for name, result in results.items():
+        if result["success"]:
+            _undeploy_agent(name)
+            _undeploy_expert(name)
 
     # Update librarian to reflect enabled experts
     _update_librarian()
 
-    return {"success": True, "already_disabled": already_disabled}
+    return results
+
+
+def _generations_dir(agents_dir: Path) -> Path:
+    """Where staged trees of an agents dir live (agents/ -> .agents/)."""
+    return agents_dir.with_name(f".{agents_dir.name}")
+
+
+def _agent_generations(agents_dir: Path) -> list[Path]:
+    """Staged trees of an agents dir, oldest first."""
+    generations_dir = _generations_dir(agents_dir)
+    if not generations_dir.is_dir():
+        return []
+    return sorted(
+        (p for p in generations_dir.iterdir() if p.name.isdigit()),
+        key=lambda p: int(p.name),
+    )
+
+
+def _stage_agents(agents_dir: Path) -> Path:
+    """Create the next agents tree, pre-filled with hard links to the current one.
+
+    Hard links keep unchanged files' inodes and mtimes. Writers must replace
+    files in the stage rather than write into them. The caller holds
+    _agents_lock() until the stage is activated or removed.
+    """
+    generations_dir = _generations_dir(agents_dir)
+    generations_dir.mkdir(parents=True, exist_ok=True)
+    generations = _agent_generations(agents_dir)
+    number = int(generations[-1].name) + 1 if generations else 1
+    # mkdir claims the number, even against writers that don't hold the lock
+    while True:
+        stage = generations_dir / str(number)
+        try:
+            stage.mkdir()
+            break
+        except FileExistsError:
+            number += 1
+    if agents_dir.is_dir():
+        for path in agents_dir.iterdir():
+            if path.is_file() and not path.is_symlink():
+                os.link(path, stage / path.name)
+    return stage
+
 
+def _stage_all_agents() -> list[tuple[Provider, Path]]:
+    """Stage every deploy target's agents tree (see _stage_agents).
 
-def redeploy_all_agents() -> dict:
+    Returns:
+        (provider, staged generation) pairs, in _deploy_targets() order
+    """
+    stages: list[tuple[Provider, Path]] = []
+    try:
+        for provider, agents_dir in _deploy_targets():
+            stages.append((provider, _stage_agents(agents_dir)))
+    except BaseException:
+        for _, stage in stages:
+            shutil.rmtree(stage, ignore_errors=True)
+        raise
+    return stages
+
+
+def _stage_changed(agents_dir: Path, stage: Path) -> bool:
+    """True if a staged tree differs from the active one.
+
+    Files are compared by inode: the stage starts as hard links to the
+    active tree, and writers replace rather than modify files.
+    """
+
+    def files(directory: Path) -> dict[str, int]:
+        if not directory.is_dir():
+            return {}
+        return {
+            path.name: path.stat().st_ino
+            for path in directory.iterdir()
+            if path.is_file() and not path.name.startswith(".")
+        }
+
+    return files(agents_dir) != files(stage)
+
+
+def _exchange_paths(a: Path, b: Path) -> bool:
+    """Atomically swap two paths with renameat2(RENAME_EXCHANGE).
+
+    Returns:
+        False if the platform or filesystem doesn't support the swap
+    """
+    import ctypes
+    import errno
+
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False  # Not Linux, or glibc older than 2.28
+    at_fdcwd, rename_exchange = -100, 2
+    if renameat2(at_fdcwd, os.fsencode(a), at_fdcwd, os.fsencode(b), rename_exchange):
+        error = ctypes.get_errno()
+        if error in (errno.ENOSYS, errno.EINVAL):
+            return False
+        raise OSError(error, os.strerror(error), str(b))
+    return True
+
+
+def _activate_agents(agents_dir: Path, generation: Path) -> None:
+    """Atomically point an agents dir at a generation.
+
+    agents/ is a symlink into .agents/, so readers see either the old or the
+    new tree, never a mix. The previously active generation is kept for
+    rollback_agents(); generations older than it are deleted. The caller
+    holds _agents_lock().
+    """
+    tmp = agents_dir.with_name(f".{agents_dir.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    tmp.symlink_to(generation.relative_to(agents_dir.parent))
+
+    if agents_dir.is_symlink():
+        previous = agents_dir.resolve()
+        os.replace(tmp, agents_dir)
+    elif agents_dir.is_dir():
+        # First staged deploy: the plain directory becomes generation 0.
+        # rename() can't put a symlink over a directory, so swap the two;
+        # where that isn't supported agents/ is briefly missing.
+        previous = _generations_dir(agents_dir) / "0"
+        if _exchange_paths(tmp, agents_dir):
+            tmp.rename(previous)
+        else:
+            agents_dir.rename(previous)
+            os.replace(tmp, agents_dir)
+    else:
+        previous = None
+        os.replace(tmp, agents_dir)
+
+    # Newer generations may be stages still being built, so only older ones go
+    if previous is not None and previous.name.isdigit():
+        for old in _agent_generations(agents_dir):
+            if int(old.name) < int(previous.name) and old.name != generation.name:
+                shutil.rmtree(old, ignore_errors=True)
+
+
+def rollback_agents() -> dict:
+    """Switch agents/ (and other deployed providers' agents dirs) back to the
+    previously deployed generation.
+
+    Returns:
+        dict with keys: success (bool), generation (str), error (str | None)
+    """
+    with _agents_lock():
+        rollbacks: list[tuple[Path, Path]] = []
+        for _, agents_dir in _deploy_targets():
+            active = agents_dir.resolve() if agents_dir.is_symlink() else None
+            others = [g for g in _agent_generations(agents_dir) if g != active]
+            if active is not None and others:
+                rollbacks.append((agents_dir, others[-1]))
+        if not rollbacks:
+            return {"success": False, "error": "No previous deployment to roll back to"}
+        for agents_dir, generation in rollbacks:
+            _activate_agents(agents_dir, generation)
+    return {"success": True, "generation": rollbacks[0][1].name}
+
+
+def redeploy_all_agents(
+    *, stages: list[tuple[Provider, Path]] | None = None
+) -> dict:
     """Regenerate all enabled agent files with current provider settings.
 
     Used after changing provider config (tools, model, etc.) to apply changes
-    to all deployed agent files without re-running AI analysis.
+    to all deployed agent files without re-running AI analysis. With
+    "deploy_all_providers", every enabled provider is redeployed in the same
+    pass (see deploy_agents).
+
+    Each complete tree (agents, librarian, stale files removed) is built in a
+    staged generation and swapped in atomically; nothing is swapped if no
+    file changed. Unchanged agent files keep their mtimes.
+
+    Args:
+        stages: (provider, staged generation) pairs from
+            _stage_all_agents() that agents were already deployed into, with
+            the caller holding _agents_lock() (see init_experts); default:
+            stage afresh under the lock
 
     Returns:
-        dict with keys: success (bool), deployed (list[str]), failed (list[str])
+        dict with keys: success (bool), plus those of deploy_agents, plus
+        removed (list[str]), librarian (dict, see _update_librarian) and
+        librarian_updated (bool); timings also has "librarian"
     """
-    config = _load_config()
-    enabled = config.get("enabled", [])
-
-    deployed: list[str] = []
-    failed: list[str] = []
+    if stages is None:
+        with _agents_lock():
+            return redeploy_all_agents(stages=_stage_all_agents())
 
-    for name in enabled:
-        if _deploy_agent(name):
-            deployed.append(name)
+    enabled = _load_config().get("enabled", [])
+    targets = _deploy_targets()
+    try:
+        result = deploy_agents(enabled, targets=stages)
+
+        removed: set[str] = set()
+        for provider, stage in stages:
+            for path in sorted(stage.glob("expert-*.md")):
+                name = path.stem.removeprefix("expert-")
+                if name not in enabled:
+                    provider.undeploy_agent(name, agents_dir=stage)
+                    removed.add(name)
+
+        # Regenerate librarian too
+        start = time.perf_counter()
+        librarian = _update_librarian(stages)
+        elapsed = time.perf_counter() - start
+        result["timings"]["librarian"] = elapsed
+        result["timings"]["total"] += elapsed
+    except BaseException:
+        for _, stage in stages:
+            shutil.rmtree(stage, ignore_errors=True)
+        raise
+
+    librarian_updated = bool(librarian["written"] or librarian["removed"])
+    for (_, agents_dir), (_, stage) in zip(targets, stages):
+        if _stage_changed(agents_dir, stage) or not agents_dir.is_symlink():
+            _activate_agents(agents_dir, stage)
         else:
-            failed.append(name)
+            shutil.rmtree(stage)
 
-    # Regenerate librarian too
-    _update_librarian()
+    return {
+        "success": True,
+        **result,
+        "removed": sorted(removed),
+        "librarian": librarian,
+        "librarian_updated": librarian_updated,
+    }
+
+
+def redeploy_experts(names: list[str]) -> dict:
+    """Redeploy some experts' agent files and the librarian in place.
+
+    Unlike redeploy_all_agents no generation is staged; every other agent
+    file is left untouched, and the librarian re-reads only the catalog
+    entries of experts whose files changed.
+
+    Returns:
+        dict with the keys of deploy_agents, plus librarian (dict, see
+        _update_librarian); timings also has "librarian"
+    """
+    result = deploy_agents(names)
+    start = time.perf_counter()
+    result["librarian"] = _update_librarian()
+    elapsed = time.perf_counter() - start
+    result["timings"]["librarian"] = elapsed
+    result["timings"]["total"] += elapsed
+    return result
+
+
+def watch_agents(
+    *,
+    polling: bool = False,
+    redeploy_all: Callable[[], dict] = redeploy_all_agents,
+    redeploy: Callable[[list[str]], dict] = redeploy_experts,
+) -> Iterator[dict]:
+    """Redeploy agents as their sources are saved, until interrupted.
+
+    Watches HEAD/agent.md and HEAD/summary.md of every enabled expert, and
+    config.json. A saved expert has only its own agent file and librarian
+    entry regenerated (see redeploy_experts). A config.json change runs
+    redeploy_all_agents, which only rewrites files whose content changed,
+    and updates the set of watched experts.
 
-    return {"success": True, "deployed": deployed, "failed": failed}
+    Args:
+        polling: Poll for changes instead of using inotify
+        redeploy_all: Runs the config.json redeploy (e.g. through the daemon)
+        redeploy: Runs the redeploy of saved experts
+
+    Yields:
+        First {"event": "start", "experts": int, "backend": "inotify" |
+        "polling"}, then for each redeploy {"event": "redeploy",
+        "trigger": expert name or "config.json", "result": dict}
+    """
+    from hivemind_cli.watch import Watcher
+
+    def watched_files() -> dict[Path, str]:
+        files = {CONFIG_JSON: "config.json"}
+        for name in _load_config().get("enabled", []):
+            head = _get_expert_dir(name) / "HEAD"
+            files[head / "agent.md"] = name
+            files[head / "summary.md"] = name
+        return files
+
+    files = watched_files()
+    with Watcher(files, polling=polling) as watcher:
+        yield {
+            "event": "start",
+            "experts": len(set(files.values())) - 1,
+            "backend": watcher.backend,
+        }
+        while True:
+            changed = watcher.wait()
+            if "config.json" in changed:
+                yield {
+                    "event": "redeploy",
+                    "trigger": "config.json",
+                    "result": redeploy_all(),
+                }
+            else:
+                for name in sorted(changed):
+                    yield {
+                        "event": "redeploy",
+                        "trigger": name,
+                        "result": redeploy([name]),
+                    }
+            # HEAD may now point elsewhere, or the enabled set changed
+            watcher.update(watched_files())
 
 
 def switch_provider(provider_name: str) -> dict:
@@ -1750,17 +3560,14 @@ def switch_provider(provider_name: str) -> dict:
     Returns:
         dict with keys: success (bool), error (str | None), old_provider (str), new_provider (str)
     """
-    from hivemind_cli.providers import PROVIDER_CLASSES
-
-    if provider_name not in PROVIDER_CLASSES:
-        available = ", ".join(PROVIDER_CLASSES)
-        return {
-            "success": False,
-            "error": f"Unknown provider '{provider_name}'. Available: {available}",
-        }
+    try:
+        load_provider_class(provider_name)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
 
-    config = _load_config()
-    old_provider = config.get("active_provider", "claude")
+    with _editing_config() as config:
+        old_provider = config.get("active_provider", "claude")
+        config["active_provider"] = provider_name
 
     if old_provider == provider_name:
         return {
@@ -1770,9 +3577,6 @@ def switch_provider(provider_name: str) -> dict:
             "already_active": True,
         }
 
-    config["active_provider"] = provider_name
-    _save_config(config)
-
     return {
         "success": True,
         "old_provider": old_provider,
@@ -0,0 +1,82 @@
+"""Optional long-running hivemind daemon, reachable over a Unix socket.
+
+The daemon keeps config and provider state in memory, owns the update job
+queue and the analysis engine subprocesses, and serves requests from the CLI
+and TUI. When no daemon is running, clients run operations in-process.
+
+This module only holds the client side and must stay cheap to import; the
+server lives in hivemind_cli.daemon.server.
+
+Protocol: one newline-delimited JSON request per connection,
+
+    {"method": "update", "params": {"names": ["bazel"], "wait": true}}
+
+answered by zero or more {"event": {...}} lines followed by a final
+{"result": ...} or {"error": "..."} line.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+from pathlib import Path
+from typing import Callable
+
+SOCKET_PATH = Path.home() / ".cache" / "hivemind" / "daemon.sock"
+LOG_PATH = SOCKET_PATH.with_name("daemon.log")
+
+
+class DaemonError(Exception):
+    """Raised when the daemon rejects or fails a request."""
+
+
+class DaemonClient:
+    """Synchronous client for the hivemind daemon."""
+
+    def __init__(self, socket_path: Path = SOCKET_PATH):
+        self._socket_path = socket_path
+
+    @classmethod
+    def connect(cls, socket_path: Path = SOCKET_PATH) -> DaemonClient | None:
+        """Return a client if a daemon is listening on socket_path, else None."""
+        if not socket_path.exists():
+            return None
+        client = cls(socket_path)
+        try:
+            client.call("ping")
+        except (OSError, DaemonError):
+            return None
+        return client
+
+    def call(
+        self,
+        method: str,
+        params: dict | None = None,
+        on_event: Callable[[dict], None] | None = None,
+    ):
+        """Send a request and return its result.
+
+        Args:
+            method: RPC method name (e.g. "enable", "update", "status")
+            params: Method parameters
+            on_event: Called with each event streamed before the result
+
+        Raises:
+            DaemonError: If the daemon reports an error
+            OSError: If the daemon can't be reached
+        """
+        request = json.dumps({"method": method, "params": params or {}})
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(self._socket_path))
+            sock.sendall(request.encode() + b"\n")
+            with sock.makefile("r", encoding="utf-8") as stream:
+                for line in stream:
+                    message = json.loads(line)
+                    if "event" in message:
+                        if on_event:
+                            on_event(message["event"])
+                    elif "error" in message:
+                        raise DaemonError(message["error"])
+                    else:
+                        return message.get("result")
+        raise DaemonError("daemon closed the connection without a result")
@@ -0,0 +1,5 @@
+"""Allow running the daemon as `python -m hivemind_cli.daemon`."""
+
+from hivemind_cli.daemon.server import main
+
+main()
@@ -0,0 +1,391 @@
+"""Hivemind daemon server: job queue and RPC handlers."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from hivemind_cli import scheduler
+from hivemind_cli.core import (
+    CancellationToken,
+    ProgressInfo,
+    _get_expert_dir,
+    _load_config,
+    disable_experts,
+    enable_experts,
+    expert_usage,
+    redeploy_all_agents,
+    redeploy_experts,
+    refresh_usage,
+    rollback_agents,
+    update_expert,
+    update_expert_async_internal,
+)
+from hivemind_cli.daemon import SOCKET_PATH, DaemonClient
+
+# Finished jobs kept around for `hivemind daemon status`
+JOB_HISTORY = 50
+
+# Seconds between checks for experts due a scheduled refresh
+SCHEDULE_TICK = 60
+
+# Seconds between scans of assistant transcripts for expert usage
+USAGE_REFRESH = 60 * 60
+
+
+@dataclass
+class Job:
+    """A queued or running expert update."""
+
+    id: int
+    expert: str
+    skip_analysis: bool = False
+    scheduled: bool = False
+    status: str = "queued"  # queued, running, success, failed, cancelled
+    message: str = ""
+    result: dict | None = None
+    created: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+    # Budget reservation (see scheduler.reserve_analysis) for analyzed jobs
+    reserved: float | None = None
+    token: CancellationToken = field(default_factory=CancellationToken)
+    listeners: list[asyncio.Queue] = field(default_factory=list)
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "expert": self.expert,
+            "status": self.status,
+            "scheduled": self.scheduled,
+            "message": self.message,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def _progress_event(info: ProgressInfo) -> dict:
+    """Convert a ProgressInfo into a JSON-serializable event."""
+    event = dataclasses.asdict(info)
+    event["phase"] = info.phase.value
+    return event
+
+
+class HivemindDaemon:
+    """Serves hivemind operations over a Unix socket."""
+
+    def __init__(self, socket_path: Path = SOCKET_PATH):
+        self._socket_path = socket_path
+        self._jobs: dict[int, Job] = {}
+        self._next_job_id = 1
+        self._started = time.time()
+        # Serializes operations that write config.json, agents/ and librarian.md
+        self._state_lock = asyncio.Lock()
+        self._queue: asyncio.Queue[Job] = asyncio.Queue()
+        self._stopping = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    # --- Lifecycle ---
+
+    async def serve(self) -> None:
+        """Run until a shutdown request arrives."""
+        if DaemonClient.connect(self._socket_path):
+            raise RuntimeError(f"daemon already running on {self._socket_path}")
+
+        self._loop = asyncio.get_running_loop()
+        self._socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._socket_path.unlink(missing_ok=True)
+
+        server = await asyncio.start_unix_server(
+            self._handle_connection, path=str(self._socket_path)
+        )
+        os.chmod(self._socket_path, 0o600)
+
+        max_jobs = _load_config().get("daemon", {}).get("max_jobs", 2)
+        workers = [asyncio.create_task(self._worker()) for _ in range(max_jobs)]
+        workers.append(asyncio.create_task(self._schedule_loop()))
+
+        try:
+            await self._stopping.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            for job in self._jobs.values():
+                if job.active:
+                    job.token.cancel()
+            # Workers notice cancelled tokens within a poll interval and
+            # terminate their engine subprocesses
+            await asyncio.wait(workers, timeout=10)
+            for worker in workers:
+                worker.cancel()
+            self._socket_path.unlink(missing_ok=True)
+
+    # --- Connections ---
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        async def emit(event: dict) -> None:
+            writer.write(json.dumps({"event": event}).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+                method = request["method"]
+                params = request.get("params") or {}
+            except (json.JSONDecodeError, KeyError, TypeError):
+                reply = {"error": "malformed request"}
+            else:
+                handler = getattr(self, f"_rpc_{method}", None)
+                if handler is None:
+                    reply = {"error": f"unknown method '{method}'"}
+                else:
+                    try:
+                        reply = {"result": await handler(params, emit)}
+                    except Exception as e:
+                        reply = {"error": f"{type(e).__name__}: {e}"}
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass  # Client went away; any jobs it started keep running
+        finally:
+            writer.close()
+
+    # --- Jobs ---
+
+    def _enqueue_update(
+        self, name: str, skip_analysis: bool, scheduled: bool = False
+    ) -> Job:
+        """Queue an update, reusing an active job for the same expert."""
+        for job in self._jobs.values():
+            if job.expert == name and job.active:
+                return job
+
+        job = Job(
+            id=self._next_job_id,
+            expert=name,
+            skip_analysis=skip_analysis,
+            scheduled=scheduled,
+        )
+        self._next_job_id += 1
+        if not skip_analysis:
+            # Count the analysis now, so jobs still in flight hold back the
+            # scheduler's budget
+            try:
+                job.reserved = scheduler.reserve_analysis()
+            except OSError:
+                pass
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        self._prune_jobs()
+        return job
+
+    def _prune_jobs(self) -> None:
+        finished = [job for job in self._jobs.values() if not job.active]
+        for job in finished[:-JOB_HISTORY]:
+            del self._jobs[job.id]
+
+    def _publish(self, job: Job, info: ProgressInfo) -> None:
+        job.message = info.message
+        event = _progress_event(info)
+        for listener in job.listeners:
+            listener.put_nowait(("progress", event))
+
+    def _finish(self, job: Job, result: dict) -> None:
+        job.result = result
+        job.finished = time.time()
+        if result.get("cancelled"):
+            job.status = "cancelled"
+        elif result.get("success"):
+            job.status = "success"
+        else:
+            job.status = "failed"
+        job.message = result.get("error") or ""
+        try:
+            scheduler.record_update(
+                job.expert,
+                result,
+                analyzed=not job.skip_analysis,
+                reserved=job.reserved,
+            )
+        except OSError:
+            pass  # Losing a timestamp only means an earlier refresh next time
+        for listener in job.listeners:
+            listener.put_nowait(("done", job.id))
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if not job.active:
+                continue  # Cancelled while queued
+            job.status = "running"
+            job.started = time.time()
+            try:
+                result = await self._run_update(job)
+            except Exception as e:
+                result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+            self._finish(job, result)
+
+    async def _run_update(self, job: Job) -> dict:
+        if job.skip_analysis:
+            # The sync path reports progress from a worker thread
+            def on_progress(info: ProgressInfo) -> None:
+                self._loop.call_soon_threadsafe(self._publish, job, info)
+
+            result = await asyncio.to_thread(
+                update_expert,
+                job.expert,
+                on_progress,
+                skip_analysis=True,
+                cancellation_token=job.token,
+            )
+        else:
+            result = await update_expert_async_internal(
+                job.expert,
+                on_progress=lambda info: self._publish(job, info),
+                cancellation_token=job.token,
+            )
+
+        # The new HEAD only reaches agents/ here, so the deploy is ordered
+        # with enables, disables and redeploys
+        if result.get("success") and not result.get("already_up_to_date"):
+            async with self._state_lock:
+                await asyncio.to_thread(redeploy_experts, [job.expert])
+        return result
+
+    async def _schedule_loop(self) -> None:
+        """Periodically queue experts whose refresh policy says they are due."""
+        usage_refreshed = 0.0
+        while not self._stopping.is_set():
+            try:
+                if time.time() - usage_refreshed >= USAGE_REFRESH:
+                    await asyncio.to_thread(refresh_usage)
+                    usage_refreshed = time.time()
+                self._queue_due_experts()
+            except (OSError, ValueError) as e:
+                print(f"scheduler: {e}", flush=True)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), SCHEDULE_TICK)
+            except asyncio.TimeoutError:
+                pass
+
+    def _queue_due_experts(self) -> None:
+        config = _load_config()
+        schedule = config.get("schedule")
+        if not schedule:
+            return
+        names = config["enabled"]
+        active = [job for job in self._jobs.values() if job.active]
+        entries = scheduler.due(
+            names,
+            schedule,
+            scheduler.load_state(),
+            {name: _get_expert_dir(name) for name in names},
+            running={job.expert for job in active},
+            running_scheduled=sum(1 for job in active if job.scheduled),
+            usage=expert_usage(),
+        )
+        for entry in entries:
+            self._enqueue_update(
+                entry.name, entry.policy.skip_analysis, scheduled=True
+            )
+
+    async def _wait_for_jobs(self, jobs: list[Job], emit) -> None:
+        """Stream progress of jobs to a client until all of them finish."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            job.listeners.append(queue)
+        try:
+            pending = {job.id for job in jobs if job.active}
+            while pending:
+                kind, payload = await queue.get()
+                if kind == "progress":
+                    await emit(payload)
+                else:
+                    pending.discard(payload)
+        finally:
+            for job in jobs:
+                job.listeners.remove(queue)
+
+    # --- RPC methods ---
+
+    async def _rpc_ping(self, params: dict, emit) -> dict:
+        return {"pid": os.getpid()}
+
+    async def _rpc_status(self, params: dict, emit) -> dict:
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self._started,
+            "jobs": [job.to_dict() for job in self._jobs.values()],
+        }
+
+    async def _rpc_enable(self, params: dict, emit) -> dict:
+        async with self._state_lock:
+            results = await asyncio.to_thread(enable_experts, params.get("names", []))
+        return {"results": results}
+
+    async def _rpc_disable(self, params: dict, emit) -> dict:
+        async with self._state_lock:
+            results = await asyncio.to_thread(disable_experts, params.get("names", []))
+        return {"results": results}
+
+    async def _rpc_redeploy(self, params: dict, emit) -> dict:
+        names = params.get("names")
+        async with self._state_lock:
+            if names:
+                return await asyncio.to_thread(redeploy_experts, names)
+            return await asyncio.to_thread(redeploy_all_agents)
+
+    async def _rpc_rollback(self, params: dict, emit) -> dict:
+        async with self._state_lock:
+            return await asyncio.to_thread(rollback_agents)
+
+    async def _rpc_update(self, params: dict, emit) -> dict:
+        names = params.get("names") or _load_config()["enabled"]
+        skip_analysis = params.get("skip_analysis", False)
+        jobs = [self._enqueue_update(name, skip_analysis) for name in names]
+
+        if not params.get("wait", True):
+            return {"jobs": [job.to_dict() for job in jobs]}
+
+        await self._wait_for_jobs(jobs, emit)
+        return {"results": {job.expert: job.result for job in jobs}}
+
+    async def _rpc_cancel(self, params: dict, emit) -> dict:
+        cancelled = []
+        for job in self._jobs.values():
+            if not job.active:
+                continue
+            if job.id == params.get("id") or job.expert == params.get("name"):
+                job.token.cancel()
+                if job.status == "queued":
+                    self._finish(
+                        job,
+                        {"success": False, "error": "Update cancelled", "cancelled": True},
+                    )
+                cancelled.append(job.id)
+        return {"cancelled": cancelled}
+
+    async def _rpc_shutdown(self, params: dict, emit) -> dict:
+        self._stopping.set()
+        return {"stopping": True}
+
+
+def main() -> None:
+    """Run the daemon in the foreground."""
+    try:
+        asyncio.run(HivemindDaemon().serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,569 @@
+"""Provider abstraction for multi-platform AI coding agent support.
+
+Each provider (Claude Code, OpenCode, etc.) defines how to:
+- Format agent files (frontmatter + body)
+- Build analysis engine commands
+- Deploy agents, experts, commands, and rules to the provider's directory
+- Initialize the provider's directory structure
+
+Providers are plugins: a subclass of Provider registered under the
+"hivemind.providers" entry point group, e.g. in a plugin's pyproject.toml:
+
+    [project.entry-points."hivemind.providers"]
+    myengine = "hivemind_myengine:MyEngineProvider"
+
+A provider's module is only imported when that provider is used. The
+built-in providers live in hivemind_cli.providers.claude and .opencode.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+# --- Helpers ---
+
+
+def extract_description(body: str) -> str:
+    """Extract description from agent.md body (first paragraph after heading).
+
+    Expects format:
+        # Expert: Name
+        <blank line>
+        Description paragraph...
+        <blank line>
+        ## Next Section
+
+    Falls back to the first paragraph under an '## Overview' section if no
+    paragraph is found directly under the h1 heading.
+
+    Returns:
+        Description string, or empty string if not found.
+    """
+    lines = body.strip().splitlines()
+
+    def _first_paragraph(start_idx: int) -> str:
+        """Return the first non-empty paragraph starting from start_idx."""
+        paragraph_lines: list[str] = []
+        for line in lines[start_idx:]:
+            stripped = line.strip()
+            if not stripped and not paragraph_lines:
+                continue
+            if stripped.startswith("#") or (not stripped and paragraph_lines):
+                break
+            paragraph_lines.append(stripped)
+        return " ".join(paragraph_lines)
+
+    # Find h1 heading index
+    h1_idx = next((i for i, l in enumerate(lines) if l.startswith("# ")), None)
+    if h1_idx is None:
+        return ""
+
+    # Try direct paragraph under h1
+    result = _first_paragraph(h1_idx + 1)
+    if result:
+        return result
+
+    # Fallback: first paragraph under ## Overview
+    for i, line in enumerate(lines):
+        if line.strip().lower() == "## overview":
+            result = _first_paragraph(i + 1)
+            if result:
+                return result
+
+    return ""
+
+
+def strip_frontmatter(content: str) -> str:
+    """Remove YAML frontmatter from markdown content.
+
+    Handles content with or without frontmatter.
+    """
+    if not content.startswith("---"):
+        return content
+
+    parts = content.split("---", 2)
+    if len(parts) >= 3:
+        return parts[2].lstrip("\n")
+    return content
+
+
+def replace_expert_paths(body: str, *, old_base: str, new_base: str) -> str:
+    """Replace expert base directory paths in agent body.
+
+    Args:
+        body: Agent markdown body
+        old_base: Path prefix to replace (e.g. "{EXPERTS_DIR}")
+        new_base: Replacement path prefix (e.g. "~/.claude/experts")
+    """
+    return body.replace(old_base, new_base)
+
+
+# --- Default provider configs ---
+
+
+DEFAULT_CLAUDE_CONFIG: dict = {
+    "enabled": True,
+    "engine": "claude -p --verbose --dangerously-skip-permissions",
+    "home_dir": "~/.claude",
+    "settings": {
+        "model": "sonnet",
+        "tools": [
+            "Read",
+            "Grep",
+            "Glob",
+            "Bash",
+            "mcp__context7__resolve-library-id",
+            "mcp__context7__get-library-docs",
+        ],
+    },
+}
+
+DEFAULT_OPENCODE_CONFIG: dict = {
+    "enabled": False,
+    "engine": "opencode run",
+    "home_dir": "~/.config/opencode",
+    "settings": {
+        "model": "github-copilot/claude-sonnet-4",
+        "temperature": 0.1,
+        "tools": {
+            "read": True,
+            "grep": True,
+            "glob": True,
+            "bash": True,
+        },
+    },
+}
+
+LIBRARIAN_DESCRIPTION = (
+    "Hivemind librarian -- knows every expert agent and their capabilities. "
+    "Ask the librarian to find the right expert for a question before "
+    "delegating to specialists."
+)
+
+
+# --- Provider Base Class ---
+
+
+class Provider(ABC):
+    """Abstract base for AI coding platform providers."""
+
+    # Config section used when config.json has none for this provider
+    default_config: dict = {}
+
+    # Bump when format_agent_md output changes for the same inputs, so
+    # deployed agents are regenerated
+    template_version: int = 1
+
+    def __init__(self, config: dict):
+        """Initialize provider from its config section.
+
+        Args:
+            config: Provider config dict with keys: enabled, engine, home_dir, settings
+        """
+        self._config = config
+        self._home_dir = Path(os.path.expanduser(config.get("home_dir", "")))
+        self._engine = config.get("engine", "")
+        self._settings = config.get("settings", {})
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Provider identifier (e.g. 'claude', 'opencode')."""
+
+    @property
+    @abstractmethod
+    def rules_file_name(self) -> str:
+        """Filename for the rules file in the provider's home directory.
+
+        E.g. "CLAUDE.md" for Claude Code, "AGENTS.md" for OpenCode.
+        """
+
+    @property
+    def home_dir(self) -> Path:
+        """Provider's home directory (e.g. ~/.claude, ~/.config/opencode)."""
+        return self._home_dir
+
+    @property
+    def engine(self) -> str:
+        """Analysis engine command string."""
+        return self._engine
+
+    @property
+    def settings(self) -> dict:
+        """Provider-specific settings (model, tools, temperature, etc.)."""
+        return self._settings
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this provider is enabled."""
+        return self._config.get("enabled", False)
+
+    @property
+    def experts_base_path(self) -> str:
+        """Base path for experts as it appears in agent bodies.
+
+        Used for path replacement at deploy time.
+        E.g. "~/.claude/experts" or "~/.config/opencode/experts"
+        """
+        home = self._config.get("home_dir", "")
+        return f"{home}/experts"
+
+    # --- Agent formatting ---
+
+    @abstractmethod
+    def format_agent_md(self, name: str, description: str, body: str) -> str:
+        """Wrap platform-neutral body with provider-specific frontmatter.
+
+        Args:
+            name: Expert name (e.g. "bazel")
+            description: Expert description for frontmatter
+            body: Platform-neutral markdown body (no frontmatter)
+
+        Returns:
+            Complete agent.md content with provider frontmatter + transformed body
+        """
+
+    @abstractmethod
+    def format_librarian_md(
+        self,
+        body: str,
+        *,
+        name: str = "librarian",
+        description: str = LIBRARIAN_DESCRIPTION,
+    ) -> str:
+        """Wrap librarian body with provider-specific frontmatter.
+
+        Args:
+            body: Librarian markdown body (no frontmatter)
+            name: Agent name (category librarians are "librarian-<category>")
+            description: Agent description for frontmatter
+
+        Returns:
+            Complete librarian.md content with provider frontmatter
+        """
+
+    # --- Analysis engine ---
+
+    @abstractmethod
+    def build_analysis_command(
+        self,
+        *,
+        extra_dirs: list[Path] | None = None,
+    ) -> list[str]:
+        """Build subprocess command for AI analysis.
+
+        Args:
+            extra_dirs: Additional directories to make available to the engine
+
+        Returns:
+            Command list suitable for subprocess.Popen
+        """
+
+    @abstractmethod
+    def build_query_command(self, *, stream: bool = False) -> list[str]:
+        """Build subprocess command for librarian queries.
+
+        Args:
+            stream: Ask the engine to emit the answer incrementally; each
+                stdout line is then passed through parse_query_stream()
+
+        Returns:
+            Command list suitable for subprocess.run (prompt via stdin)
+        """
+
+    @abstractmethod
+    def build_ask_command(self, agent: str, *, stream: bool = False) -> list[str]:
+        """Build subprocess command that runs a deployed agent on one question.
+
+        Args:
+            agent: Deployed agent name (e.g. "expert-bazel")
+            stream: As for build_query_command()
+
+        Returns:
+            Command list suitable for subprocess.run (question via stdin)
+        """
+
+    def parse_query_stream(self, line: str) -> str:
+        """Extract answer text from one line of streamed query output.
+
+        Args:
+            line: stdout line (with its newline) from a stream=True query command
+
+        Returns:
+            Text to append to the answer (may be empty)
+        """
+        return line
+
+    # --- Deployment ---
+
+    @abstractmethod
+    def deploy_agent(self, name: str, content: str, *, agents_dir: Path) -> None:
+        """Deploy a generated agent file.
+
+        The file must be replaced atomically (see _replace_file): it may be
+        read by a running assistant, or hard linked into another generation
+        of the agents tree.
+
+        Args:
+            name: Expert name
+            content: Full agent.md content (with frontmatter)
+            agents_dir: Hivemind's agents/ directory
+        """
+
+    @abstractmethod
+    def undeploy_agent(self, name: str, *, agents_dir: Path) -> None:
+        """Remove a deployed agent file.
+
+        Args:
+            name: Expert name
+            agents_dir: Hivemind's agents/ directory
+        """
+
+    @abstractmethod
+    def deploy_expert(self, name: str, source_dir: Path) -> None:
+        """Deploy expert directory to provider's expert location.
+
+        Args:
+            name: Expert name
+            source_dir: Path to expert directory in hivemind
+        """
+
+    @abstractmethod
+    def undeploy_expert(self, name: str) -> None:
+        """Remove expert from provider's expert location.
+
+        Args:
+            name: Expert name
+        """
+
+    @abstractmethod
+    def init_dirs(
+        self,
+        *,
+        agents_dir: Path,
+        commands_dir: Path,
+        rules_source: Path,
+        settings_source: Path | None = None,
+    ) -> list[tuple[str, str]]:
+        """Initialize provider directory structure and deploy symlinks.
+
+        Args:
+            agents_dir: Hivemind's agents/ directory
+            commands_dir: Hivemind's commands/ directory
+            rules_source: Path to HIVEMIND.md rules file in hivemind root
+            settings_source: Path to settings.json in hivemind (Claude only)
+
+        Returns:
+            List of (label, status_message) tuples for display
+        """
+
+    @abstractmethod
+    def status_symlinks(
+        self,
+        *,
+        agents_dir: Path,
+        commands_dir: Path,
+        rules_source: Path,
+        settings_source: Path | None = None,
+    ) -> list[tuple[str, Path, Path]]:
+        """Return symlink checks for the status dashboard.
+
+        Each tuple is (display_name, expected_target, link_path).
+
+        Args:
+            agents_dir: Hivemind's agents/ directory
+            commands_dir: Hivemind's commands/ directory
+            rules_source: Path to HIVEMIND.md rules file in hivemind root
+            settings_source: Path to settings.json in hivemind (Claude only)
+
+        Returns:
+            List of (display_name, expected_target, link_path) tuples
+        """
+
+    def agent_fingerprint(self) -> str:
+        """Identify everything besides agent.md that format_agent_md depends on.
+
+        Deployed agents whose fingerprint still matches are not regenerated.
+        Covers the provider name, template_version and settings (model,
+        tools, temperature, ...).
+        """
+        settings = json.dumps(self._settings, sort_keys=True)
+        return f"{self.name}:{self.template_version}:{settings}"
+
+    def transcript_files(self) -> list[Path]:
+        """Local session transcripts, scanned by `hivemind usage` for delegations.
+
+        Providers that keep no local transcripts return an empty list.
+        """
+        return []
+
+
+# --- Provider Registry ---
+
+
+ENTRY_POINT_GROUP = "hivemind.providers"
+
+# Built-in providers, resolved without scanning installed entry points so
+# they also work from a source checkout
+BUILTIN_PROVIDERS: dict[str, str] = {
+    "claude": "hivemind_cli.providers.claude:ClaudeProvider",
+    "opencode": "hivemind_cli.providers.opencode:OpenCodeProvider",
+}
+
+_provider_classes: dict[str, type[Provider]] = {}
+_plugin_providers: dict[str, str] | None = None
+
+
+def _plugins() -> dict[str, str]:
+    """Provider name -> "module:attr" for installed provider plugins."""
+    global _plugin_providers
+    if _plugin_providers is None:
+        from importlib.metadata import entry_points
+
+        _plugin_providers = {
+            ep.name: ep.value
+            for ep in entry_points(group=ENTRY_POINT_GROUP)
+            if ep.name not in BUILTIN_PROVIDERS
+        }
+    return _plugin_providers
+
+
+def provider_names() -> list[str]:
+    """Names of all available providers, built-in and plugin, sorted."""
+    return sorted({**BUILTIN_PROVIDERS, **_plugins()})
+
+
+def load_provider_class(name: str) -> type[Provider]:
+    """Import a provider's class by name.
+
+    Only the selected provider's module is imported; installed plugins are
+    only looked up for names that aren't built in.
+
+    Raises:
+        ValueError: If the provider is unknown, fails to import, or isn't a
+            Provider subclass
+    """
+    if name in _provider_classes:
+        return _provider_classes[name]
+
+    target = BUILTIN_PROVIDERS.get(name) or _plugins().get(name)
+    if target is None:
+        raise ValueError(
+            f"Unknown provider '{name}'. Available: {', '.join(provider_names())}"
+        )
+
+    import importlib
+
+    module_name, _, attr = target.partition(":")
+    try:
+        cls = getattr(importlib.import_module(module_name), attr)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Failed to load provider '{name}' ({target}): {e}") from e
+    if not (isinstance(cls, type) and issubclass(cls, Provider)):
+        raise ValueError(f"Provider '{name}' ({target}) is not a Provider subclass")
+
+    _provider_classes[name] = cls
+    return cls
+
+
+def get_provider(name: str, provider_config: dict) -> Provider:
+    """Create a provider instance by name.
+
+    Args:
+        name: Provider name (e.g. "claude", "opencode")
+        provider_config: Provider's config dict from config.json
+
+    Returns:
+        Provider instance
+
+    Raises:
+        ValueError: If provider name is not recognized or fails to load
+    """
+    return load_provider_class(name)(provider_config)
+
+
+def get_active_provider(config: dict) -> Provider:
+    """Get the active provider from full config.
+
+    Args:
+        config: Full config.json dict
+
+    Returns:
+        Active provider instance
+    """
+    active = config.get("active_provider", "claude")
+    provider_config = config.get("providers", {}).get(active)
+    if provider_config is None:
+        provider_config = load_provider_class(active).default_config
+    return get_provider(active, provider_config)
+
+
+def get_deploy_providers(config: dict) -> list[Provider]:
+    """Get the providers that deploys write to, active provider first.
+
+    With "deploy_all_providers": true in config.json, every other provider
+    marked "enabled" is deployed alongside the active one.
+
+    Args:
+        config: Full config.json dict
+
+    Returns:
+        Provider instances
+    """
+    providers = [get_active_provider(config)]
+    if config.get("deploy_all_providers"):
+        for name, provider_config in config.get("providers", {}).items():
+            if (
+                name != providers[0].name
+                and provider_config.get("enabled")
+                and name in provider_names()
+            ):
+                providers.append(get_provider(name, provider_config))
+    return providers
+
+
+# --- Internal Helpers ---
+
+
+def _setup_symlink(target: Path, link: Path, label: str) -> tuple[str, str]:
+    """Create or update a symlink, returning status for display.
+
+    Args:
+        target: What the symlink should point to
+        link: Where to create the symlink
+        label: Display label for status messages
+
+    Returns:
+        (label, status_message) tuple
+    """
+    if link.is_symlink():
+        current = link.resolve()
+        if current == target.resolve():
+            return (label, "already correct")
+        link.unlink()
+    elif link.is_dir():
+        backup = link.with_name(link.name + ".bak")
+        link.rename(backup)
+        return (label, f"backed up existing dir to {backup.name}/, created symlink")
+    elif link.exists():
+        link.unlink()
+
+    link.symlink_to(target)
+    return (label, f"-> {target}")
+
+
+def _replace_file(path: Path, content: str) -> None:
+    """Write a file by renaming a temp file over it.
+
+    Readers see the old or the new content, never a partial write, and hard
+    links to the old file (e.g. in other agents tree generations) keep
+    their content. A symlink at path is replaced, not followed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content)
+    os.replace(tmp, path)
@@ -0,0 +1,269 @@
+"""Claude Code provider."""
+
+from __future__ import annotations
+
+import shlex
+import shutil
+from pathlib import Path
+
+from hivemind_cli.providers import (
+    DEFAULT_CLAUDE_CONFIG,
+    LIBRARIAN_DESCRIPTION,
+    Provider,
+    _replace_file,
+    _setup_symlink,
+    replace_expert_paths,
+)
+
+
+class ClaudeProvider(Provider):
+    """Claude Code platform provider."""
+
+    default_config = DEFAULT_CLAUDE_CONFIG
+
+    @property
+    def name(self) -> str:
+        return "claude"
+
+    @property
+    def rules_file_name(self) -> str:
+        return "CLAUDE.md"
+
+    @property
+    def experts_base_path(self) -> str:
+        return "~/.claude/experts"
+
+    def format_agent_md(self, name: str, description: str, body: str) -> str:
+        """Format agent.md with Claude Code YAML frontmatter."""
+        tools = self._settings.get("tools", [])
+        model = self._settings.get("model", "sonnet")
+
+        # Tools is a list of strings, joined with commas
+        tools_str = ", ".join(tools) if isinstance(tools, list) else str(tools)
+
+        frontmatter = (
+            f"---\n"
+            f"name: expert-{name}\n"
+            f"description: {description}\n"
+            f"tools: {tools_str}\n"
+            f"model: {model}\n"
+            f"---\n\n"
+        )
+
+        # Replace expert paths in body to match this provider
+        transformed = replace_expert_paths(
+            body,
+            old_base="{EXPERTS_DIR}",
+            new_base=self.experts_base_path,
+        )
+
+        return frontmatter + transformed
+
+    def format_librarian_md(
+        self,
+        body: str,
+        *,
+        name: str = "librarian",
+        description: str = LIBRARIAN_DESCRIPTION,
+    ) -> str:
+        """Format librarian.md with Claude Code YAML frontmatter."""
+        tools = self._settings.get("tools", [])
+        model = self._settings.get("model", "sonnet")
+
+        # Librarian uses a subset of tools (no Write, no MCP)
+        librarian_tools = [t for t in tools if t in ("Read", "Grep", "Glob")]
+        if not librarian_tools:
+            librarian_tools = ["Read", "Grep", "Glob"]
+        tools_str = ", ".join(librarian_tools)
+
+        frontmatter = (
+            f"---\n"
+            f"name: {name}\n"
+            f'description: "{description}"\n'
+            f"tools: {tools_str}\n"
+            f"model: {model}\n"
+            f"---\n\n"
+        )
+
+        return frontmatter + body
+
+    def build_analysis_command(
+        self,
+        *,
+        extra_dirs: list[Path] | None = None,
+    ) -> list[str]:
+        """Build claude -p command for analysis."""
+        # Parse engine string into base command
+        cmd = shlex.split(self._engine)
+
+        # Add tools (analysis needs Write too)
+        analysis_tools = list(self._settings.get("tools", []))
+        if "Write" not in analysis_tools:
+            analysis_tools.append("Write")
+        # Strip MCP tools for analysis (they're for runtime, not analysis)
+        analysis_tools = [t for t in analysis_tools if not t.startswith("mcp__")]
+        cmd.extend(["--allowedTools", ",".join(analysis_tools)])
+
+        # Add model
+        model = self._settings.get("model", "sonnet")
+        cmd.extend(["--model", model])
+
+        # Add extra directories
+        if extra_dirs:
+            for d in extra_dirs:
+                cmd.extend(["--add-dir", str(d)])
+
+        return cmd
+
+    def build_query_command(self, *, stream: bool = False) -> list[str]:
+        """Build claude -p command for librarian queries."""
+        model = self._settings.get("model", "sonnet")
+        cmd = ["claude", "-p", "--model", model]
+        if stream:
+            cmd.extend(
+                ["--output-format", "stream-json", "--include-partial-messages", "--verbose"]
+            )
+        return cmd
+
+    def build_ask_command(self, agent: str, *, stream: bool = False) -> list[str]:
+        """Build claude -p --agent command with the agent's runtime tools."""
+        tools = [t for t in self._settings.get("tools", []) if t != "Write"]
+        cmd = self.build_query_command(stream=stream)
+        cmd.extend(["--agent", agent])
+        if tools:
+            cmd.extend(["--allowedTools", ",".join(tools)])
+        return cmd
+
+    def parse_query_stream(self, line: str) -> str:
+        """Return the text delta from a stream-json event, ignoring other events."""
+        import json
+
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return ""
+        if event.get("type") != "stream_event":
+            return ""
+        inner = event.get("event", {})
+        delta = inner.get("delta", {})
+        if inner.get("type") == "content_block_delta" and delta.get("type") == "text_delta":
+            return delta.get("text", "")
+        return ""
+
+    def deploy_agent(self, name: str, content: str, *, agents_dir: Path) -> None:
+        """Write agent file to agents/ directory."""
+        # Also replaces an old symlink (migrating from symlink to file)
+        _replace_file(agents_dir / f"expert-{name}.md", content)
+
+    def undeploy_agent(self, name: str, *, agents_dir: Path) -> None:
+        """Remove agent file from agents/ directory."""
+        agent_file = agents_dir / f"expert-{name}.md"
+        if agent_file.is_symlink() or agent_file.exists():
+            agent_file.unlink()
+
+    def deploy_expert(self, name: str, source_dir: Path) -> None:
+        """Create symlink ~/.claude/experts/<name> -> source_dir."""
+        provider_experts = self._home_dir / "experts"
+        provider_experts.mkdir(parents=True, exist_ok=True)
+
+        expert_link = provider_experts / name
+        if expert_link.is_symlink():
+            if expert_link.resolve() == source_dir.resolve():
+                return  # Already correct
+            expert_link.unlink()
+        elif expert_link.exists():
+            if expert_link.is_dir():
+                shutil.rmtree(expert_link)
+            else:
+                expert_link.unlink()
+
+        expert_link.symlink_to(source_dir)
+
+    def undeploy_expert(self, name: str) -> None:
+        """Remove ~/.claude/experts/<name> symlink."""
+        expert_link = self._home_dir / "experts" / name
+        if expert_link.is_symlink() or expert_link.exists():
+            if expert_link.is_dir() and not expert_link.is_symlink():
+                shutil.rmtree(expert_link)
+            else:
+                expert_link.unlink()
+
+    def init_dirs(
+        self,
+        *,
+        agents_dir: Path,
+        commands_dir: Path,
+        rules_source: Path,
+        settings_source: Path | None = None,
+    ) -> list[tuple[str, str]]:
+        """Initialize ~/.claude directory structure with symlinks."""
+        results: list[tuple[str, str]] = []
+
+        self._home_dir.mkdir(parents=True, exist_ok=True)
+
+        # agents/ symlink
+        agents_link = self._home_dir / "agents"
+        results.append(_setup_symlink(agents_dir, agents_link, "agents/"))
+
+        # commands/ symlink
+        commands_link = self._home_dir / "commands"
+        results.append(_setup_symlink(commands_dir, commands_link, "commands/"))
+
+        # Rules file symlink (e.g. CLAUDE.md)
+        rules_link = self._home_dir / self.rules_file_name
+        results.append(_setup_symlink(rules_source, rules_link, self.rules_file_name))
+
+        # settings.json symlink
+        if settings_source and settings_source.exists():
+            settings_link = self._home_dir / "settings.json"
+            results.append(
+                _setup_symlink(settings_source, settings_link, "settings.json")
+            )
+
+        # experts/ directory (real dir, not symlink)
+        experts_dir = self._home_dir / "experts"
+        experts_dir.mkdir(parents=True, exist_ok=True)
+        results.append(("experts/", "directory ready"))
+
+        return results
+
+    def transcript_files(self) -> list[Path]:
+        """Session transcripts under ~/.claude/projects/.
+
+        Subagent transcripts (<session>/subagents/ and agent-*.jsonl) are
+        left out: the delegation that started one is already in its parent
+        session, and counting both would count it twice.
+        """
+        return sorted(
+            path
+            for path in (self._home_dir / "projects").rglob("*.jsonl")
+            if "subagents" not in path.parts and not path.name.startswith("agent-")
+        )
+
+    def status_symlinks(
+        self,
+        *,
+        agents_dir: Path,
+        commands_dir: Path,
+        rules_source: Path,
+        settings_source: Path | None = None,
+    ) -> list[tuple[str, Path, Path]]:
+        """Return symlink checks for Claude Code provider."""
+        checks = [
+            (f"{self._home_dir}/agents/", agents_dir, self._home_dir / "agents"),
+            (f"{self._home_dir}/commands/", commands_dir, self._home_dir / "commands"),
+            (
+                f"{self._home_dir}/{self.rules_file_name}",
+                rules_source,
+                self._home_dir / self.rules_file_name,
+            ),
+        ]
+        if settings_source:
+            checks.append(
+                (
+                    f"{self._home_dir}/settings.json",
+                    settings_source,
+                    self._home_dir / "settings.json",
+                )
+            )
+        return checks
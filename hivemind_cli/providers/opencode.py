@@ -0,0 +1,234 @@
+"""OpenCode provider."""
+
+from __future__ import annotations
+
+import os
+import shlex
+import shutil
+from pathlib import Path
+
+from hivemind_cli.providers import (
+    DEFAULT_OPENCODE_CONFIG,
+    LIBRARIAN_DESCRIPTION,
+    Provider,
+    _replace_file,
+    _setup_symlink,
+    replace_expert_paths,
+)
+
+
+class OpenCodeProvider(Provider):
+    """OpenCode platform provider."""
+
+    default_config = DEFAULT_OPENCODE_CONFIG
+
+    @property
+    def name(self) -> str:
+        return "opencode"
+
+    @property
+    def rules_file_name(self) -> str:
+        return "AGENTS.md"
+
+    @property
+    def experts_base_path(self) -> str:
+        return "~/.config/opencode/experts"
+
+    def format_agent_md(self, name: str, description: str, body: str) -> str:
+        """Format agent.md with OpenCode YAML frontmatter."""
+        model = self._settings.get("model", "anthropic/claude-sonnet-4-20250514")
+        temperature = self._settings.get("temperature", 0.1)
+        tools = self._settings.get("tools", {})
+
+        # Build YAML frontmatter
+        lines = [
+            "---",
+            f"description: {description}",
+            "mode: subagent",
+            f"model: {model}",
+            f"temperature: {temperature}",
+        ]
+
+        # Tools as YAML map
+        if isinstance(tools, dict) and tools:
+            lines.append("tools:")
+            for tool_name, enabled in sorted(tools.items()):
+                lines.append(f"  {tool_name}: {str(enabled).lower()}")
+
+        # External directory permissions for repo, docs, and expert knowledge
+        lines.append("permission:")
+        lines.append("  external_directory:")
+        lines.append(f'    "~/.cache/hivemind/repos/{name}/**": allow')
+        lines.append(f'    "~/.cache/hivemind/external_docs/{name}/**": allow')
+        lines.append(f'    "{self.experts_base_path}/{name}/**": allow')
+
+        lines.append("---")
+        lines.append("")
+        lines.append("")
+
+        frontmatter = "\n".join(lines)
+
+        # Replace expert paths in body to match this provider
+        transformed = replace_expert_paths(
+            body,
+            old_base="{EXPERTS_DIR}",
+            new_base=self.experts_base_path,
+        )
+
+        return frontmatter + transformed
+
+    def format_librarian_md(
+        self,
+        body: str,
+        *,
+        name: str = "librarian",
+        description: str = LIBRARIAN_DESCRIPTION,
+    ) -> str:
+        """Format librarian.md with OpenCode YAML frontmatter.
+
+        OpenCode names agents after their file, so name is not written.
+        """
+        model = self._settings.get("model", "anthropic/claude-sonnet-4-20250514")
+        temperature = self._settings.get("temperature", 0.1)
+
+        lines = [
+            "---",
+            f'description: "{description}"',
+            "mode: subagent",
+            f"model: {model}",
+            f"temperature: {temperature}",
+            "tools:",
+            "  read: true",
+            "  grep: true",
+            "  glob: true",
+            "---",
+            "",
+            "",
+        ]
+
+        return "\n".join(lines) + body
+
+    def build_analysis_command(
+        self,
+        *,
+        extra_dirs: list[Path] | None = None,
+    ) -> list[str]:
+        """Build opencode run command for analysis."""
+        cmd = shlex.split(self._engine)
+
+        # Add model
+        model = self._settings.get("model", "github-copilot/claude-sonnet-4")
+        cmd.extend(["--model", model])
+
+        return cmd
+
+    def build_query_command(self, *, stream: bool = False) -> list[str]:
+        """Build opencode run command for librarian queries.
+
+        opencode run already writes the answer as it is generated.
+        """
+        cmd = shlex.split(self._engine)
+        model = self._settings.get("model", "github-copilot/claude-sonnet-4")
+        cmd.extend(["--model", model])
+        return cmd
+
+    def build_ask_command(self, agent: str, *, stream: bool = False) -> list[str]:
+        """Build opencode run --agent command."""
+        return [*self.build_query_command(stream=stream), "--agent", agent]
+
+    def deploy_agent(self, name: str, content: str, *, agents_dir: Path) -> None:
+        """Write agent file to agents/ directory.
+
+        OpenCode reads from agents/ the same way, just uses regular files.
+        """
+        # Also replaces an old symlink (migrating from symlink to file)
+        _replace_file(agents_dir / f"expert-{name}.md", content)
+
+    def undeploy_agent(self, name: str, *, agents_dir: Path) -> None:
+        """Remove agent file from agents/ directory."""
+        agent_file = agents_dir / f"expert-{name}.md"
+        if agent_file.is_symlink() or agent_file.exists():
+            agent_file.unlink()
+
+    def deploy_expert(self, name: str, source_dir: Path) -> None:
+        """Create symlink in provider's experts directory."""
+        provider_experts = self._home_dir / "experts"
+        provider_experts.mkdir(parents=True, exist_ok=True)
+
+        expert_link = provider_experts / name
+        if expert_link.is_symlink():
+            if expert_link.resolve() == source_dir.resolve():
+                return
+            expert_link.unlink()
+        elif expert_link.exists():
+            if expert_link.is_dir():
+                shutil.rmtree(expert_link)
+            else:
+                expert_link.unlink()
+
+        expert_link.symlink_to(source_dir)
+
+    def undeploy_expert(self, name: str) -> None:
+        """Remove expert from provider's experts directory."""
+        expert_link = self._home_dir / "experts" / name
+        if expert_link.is_symlink() or expert_link.exists():
+            if expert_link.is_dir() and not expert_link.is_symlink():
+                shutil.rmtree(expert_link)
+            else:
+                expert_link.unlink()
+
+    def init_dirs(
+        self,
+        *,
+        agents_dir: Path,
+        commands_dir: Path,
+        rules_source: Path,
+        settings_source: Path | None = None,
+    ) -> list[tuple[str, str]]:
+        """Initialize ~/.config/opencode directory structure."""
+        results: list[tuple[str, str]] = []
+
+        self._home_dir.mkdir(parents=True, exist_ok=True)
+
+        # agents/ symlink
+        agents_link = self._home_dir / "agents"
+        results.append(_setup_symlink(agents_dir, agents_link, "agents/"))
+
+        # commands/ symlink
+        commands_link = self._home_dir / "commands"
+        results.append(_setup_symlink(commands_dir, commands_link, "commands/"))
+
+        # Rules file symlink (e.g. AGENTS.md)
+        rules_link = self._home_dir / self.rules_file_name
+        results.append(_setup_symlink(rules_source, rules_link, self.rules_file_name))
+
+        # experts/ directory
+        experts_dir = self._home_dir / "experts"
+        experts_dir.mkdir(parents=True, exist_ok=True)
+        results.append(("experts/", "directory ready"))
+
+        return results
+
+    def transcript_files(self) -> list[Path]:
+        """Message parts in OpenCode's data dir, one JSON file per part."""
+        data_home = Path(os.environ.get("XDG_DATA_HOME") or "~/.local/share").expanduser()
+        return sorted((data_home / "opencode" / "storage" / "part").rglob("*.json"))
+
+    def status_symlinks(
+        self,
+        *,
+        agents_dir: Path,
+        commands_dir: Path,
+        rules_source: Path,
+        settings_source: Path | None = None,
+    ) -> list[tuple[str, Path, Path]]:
+        """Return symlink checks for OpenCode provider."""
+        return [
+            (f"{self._home_dir}/agents/", agents_dir, self._home_dir / "agents"),
+            (f"{self._home_dir}/commands/", commands_dir, self._home_dir / "commands"),
+            (
+                f"{self._home_dir}/{self.rules_file_name}",
+                rules_source,
+                self._home_dir / self.rules_file_name,
+            ),
+        ]
@@ -0,0 +1,211 @@
+"""Offline expert routing with a BM25 index over expert docs.
+
+Each expert is indexed as one document built from its agent.md description,
+the "## Expertise" section of agent.md and its knowledge docs, with the
+description and expertise weighted higher. Term counts are persisted per
+expert together with a signature of the source files, so refreshing the
+index only re-reads experts whose docs changed.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+from hivemind_cli.providers import extract_description, strip_frontmatter
+
+INDEX_VERSION = 1
+
+KNOWLEDGE_DOCS = (
+    "summary.md",
+    "code_structure.md",
+    "build_system.md",
+    "apis_and_interfaces.md",
+)
+
+# Repeat counts for each part of an expert's document
+DESCRIPTION_WEIGHT = 3
+EXPERTISE_WEIGHT = 2
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = frozenset(
+    """a about an and are as at be by can do does for from how i if in into is
+    it its me my of on or should so that the their then there these this to
+    use used using was what when where which while who why will with without
+    you your""".split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_\-.]*[a-z0-9]|[a-z0-9]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, also emitting parts of compound names.
+
+    "rules_img" yields "rules_img", "rules" and "img".
+    """
+    terms: list[str] = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        terms.append(token)
+        parts = re.split(r"[_\-.]", token)
+        if len(parts) > 1:
+            terms.extend(p for p in parts if p and p not in STOPWORDS)
+    return terms
+
+
+def extract_expertise(body: str) -> str:
+    """Return the text of the "## Expertise" section of an agent.md body."""
+    lines: list[str] = []
+    inside = False
+    for line in body.splitlines():
+        if line.startswith("## "):
+            if inside:
+                break
+            inside = line[3:].strip().lower() == "expertise"
+            continue
+        if inside:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def index_expert(expert_dir: Path) -> dict:
+    """Build the index entry (description and weighted term counts) for an expert."""
+    head = expert_dir / "HEAD"
+    body = strip_frontmatter(_read(head / "agent.md"))
+    description = extract_description(body)
+
+    terms: Counter = Counter()
+    for term in tokenize(expert_dir.name):
+        terms[term] += DESCRIPTION_WEIGHT
+    for term in tokenize(description):
+        terms[term] += DESCRIPTION_WEIGHT
+    for term in tokenize(extract_expertise(body)):
+        terms[term] += EXPERTISE_WEIGHT
+    for doc in KNOWLEDGE_DOCS:
+        terms.update(tokenize(_read(head / doc)))
+    return {
+        "description": description,
+        "terms": dict(terms),
+        "length": sum(terms.values()),
+    }
+
+
+def _signature(expert_dir: Path) -> list:
+    """HEAD target plus mtime/size of every indexed file."""
+    head = expert_dir / "HEAD"
+    try:
+        signature: list = [os.readlink(head)]
+    except OSError:
+        signature = [None]
+    for doc in ("agent.md", *KNOWLEDGE_DOCS):
+        try:
+            st = (head / doc).stat()
+            signature.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            signature.append(None)
+    return signature
+
+
+class RoutingIndex:
+    """Per-expert term counts with BM25 ranking."""
+
+    def __init__(self, experts: dict[str, dict] | None = None):
+        # name -> {"signature", "description", "terms": {term: count}, "length"}
+        self.experts: dict[str, dict] = experts or {}
+
+    @classmethod
+    def load(cls, path: Path) -> RoutingIndex:
+        """Load a saved index, or return an empty one if missing or stale."""
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data["experts"])
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "experts": self.experts}))
+        os.replace(tmp, path)
+
+    def refresh(self, expert_dirs: dict[str, Path]) -> bool:
+        """Re-index experts whose docs changed and drop ones that are gone.
+
+        Args:
+            expert_dirs: Expert name -> expert directory for every known expert
+
+        Returns:
+            True if the index changed
+        """
+        changed = False
+        for name in list(self.experts):
+            if name not in expert_dirs:
+                del self.experts[name]
+                changed = True
+
+        for name, expert_dir in expert_dirs.items():
+            signature = _signature(expert_dir)
+            entry = self.experts.get(name)
+            if entry and entry["signature"] == signature:
+                continue
+            self.experts[name] = {"signature": signature, **index_expert(expert_dir)}
+            changed = True
+        return changed
+
+    def rank(
+        self, question: str, names: list[str] | None = None, limit: int | None = None
+    ) -> list[tuple[str, float]]:
+        """Rank experts for a question by BM25 score, best first.
+
+        Args:
+            question: Free-text question
+            names: Restrict ranking to these experts (default: all indexed)
+            limit: Maximum number of results
+
+        Returns:
+            (expert name, score) pairs with a positive score
+        """
+        pool = self.experts if names is None else names
+        candidates = [n for n in pool if n in self.experts]
+        query = set(tokenize(question))
+        if not candidates or not query:
+            return []
+
+        docs = [self.experts[n] for n in candidates]
+        avg_length = sum(d["length"] for d in docs) / len(docs) or 1
+        idf = {}
+        for term in query:
+            df = sum(1 for d in docs if term in d["terms"])
+            if df:
+                idf[term] = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+
+        scores: list[tuple[str, float]] = []
+        for name, doc in zip(candidates, docs):
+            norm = K1 * (1 - B + B * doc["length"] / avg_length)
+            score = 0.0
+            for term, weight in idf.items():
+                tf = doc["terms"].get(term, 0)
+                if tf:
+                    score += weight * tf * (K1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((name, score))
+
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:limit] if limit else scores
@@ -0,0 +1,407 @@
+"""Background refresh scheduling for experts.
+
+Policies come from the "schedule" section of config.json:
+
+    "schedule": {
+      "default": {"interval": "1d"},
+      "experts": {
+        "bazel": {"cron": "0 3 * * *"},
+        "rich": {"interval": "12h", "skip_analysis": true},
+        "dendritic": null
+      },
+      "max_concurrent": 2,
+      "max_analyses_per_day": 10,
+      "min_age": "6h",
+      "idle_after": "30d"
+    }
+
+An expert entry of null opts that expert out of scheduling. The daemon checks
+due experts periodically; when they last ran is kept in
+~/.cache/hivemind/schedule.json so it survives daemon restarts.
+
+Usage counts from assistant transcripts (see usage.py) steer the scheduler:
+experts due at the same time are refreshed most used first, so the analysis
+budget goes to the experts that get asked. Experts not used within
+"idle_after" are not refreshed at all.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+STATE_PATH = Path.home() / ".cache" / "hivemind" / "schedule.json"
+
+DAY = 24 * 60 * 60
+
+_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": DAY, "w": 7 * DAY}
+
+
+def parse_interval(value: str | int | float) -> float:
+    """Parse an interval like "90s", "30m", "12h", "1d" or "2w" into seconds.
+
+    Bare numbers are taken as seconds.
+
+    Raises:
+        ValueError: If the interval is malformed or not positive
+    """
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        text = value.strip().lower()
+        unit = _UNITS.get(text[-1:])
+        try:
+            seconds = float(text[:-1]) * unit if unit else float(text)
+        except ValueError:
+            raise ValueError(f"Invalid interval '{value}'") from None
+    if seconds <= 0:
+        raise ValueError(f"Interval must be positive, got '{value}'")
+    return seconds
+
+
+# --- Cron expressions ---
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> set[int]:
+    """Parse one cron field (supports *, lists, ranges and steps)."""
+    values: set[int] = set()
+    for part in field.split(","):
+        spec, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start_text, end_text = spec.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(spec)
+            end = high if step_text else start
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"Invalid cron field '{field}'")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    The month always has to match. As in Vixie cron, a day field starting
+    with "*" (including steps like "*/2") counts as unrestricted; when
+    neither day field is, a day matching either of them runs.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.expression = expression
+        self._minutes = _parse_cron_field(fields[0], 0, 59)
+        self._hours = _parse_cron_field(fields[1], 0, 23)
+        self._days = _parse_cron_field(fields[2], 1, 31)
+        self._months = _parse_cron_field(fields[3], 1, 12)
+        # Cron allows both 0 and 7 for Sunday; datetime uses Monday=0
+        weekdays = {d % 7 for d in _parse_cron_field(fields[4], 0, 7)}
+        self._weekdays = {(d - 1) % 7 for d in weekdays}
+        self._any_day = fields[2].startswith("*")
+        self._any_weekday = fields[4].startswith("*")
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self._days
+        weekday_ok = dt.weekday() in self._weekdays
+        # Standard cron: when both day fields are restricted, either may match
+        if not self._any_day and not self._any_weekday:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, timestamp: float) -> float:
+        """Return the first matching time strictly after timestamp (local time)."""
+        dt = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0)
+        dt += timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self._months or not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+            elif dt.hour not in self._hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+            elif dt.minute not in self._minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt.timestamp()
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+
+# --- Policies ---
+
+
+@dataclass
+class Policy:
+    """When and how an expert is refreshed in the background."""
+
+    interval: float | None = None
+    cron: CronSchedule | None = None
+    skip_analysis: bool = False
+
+    @classmethod
+    def from_config(cls, entry: dict) -> Policy:
+        skip_analysis = bool(entry.get("skip_analysis", False))
+        if "cron" in entry:
+            return cls(cron=CronSchedule(entry["cron"]), skip_analysis=skip_analysis)
+        if "interval" in entry:
+            return cls(
+                interval=parse_interval(entry["interval"]), skip_analysis=skip_analysis
+            )
+        raise ValueError(f"Schedule entry needs 'cron' or 'interval': {entry}")
+
+    def describe(self) -> str:
+        if self.cron:
+            text = f"cron {self.cron.expression}"
+        else:
+            text = f"every {_format_duration(self.interval)}"
+        return text + (" (no analysis)" if self.skip_analysis else "")
+
+    def next_run(self, last_run: float | None, now: float) -> float:
+        """Next time the expert is due; never-run interval experts are due now."""
+        if self.cron:
+            return self.cron.next_after(last_run if last_run is not None else now)
+        if last_run is None:
+            return now
+        return last_run + self.interval
+
+
+def policy_for(name: str, schedule: dict) -> Policy | None:
+    """Return the expert's policy, falling back to the default policy."""
+    experts = schedule.get("experts", {})
+    if name in experts:
+        entry = experts[name]
+    else:
+        entry = schedule.get("default")
+    return Policy.from_config(entry) if entry else None
+
+
+def _format_duration(seconds: float) -> str:
+    for unit, size in (("w", 7 * DAY), ("d", DAY), ("h", 3600), ("m", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
+
+
+# --- State ---
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    """Load scheduler state: per-expert last runs and recent analysis times."""
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    state.setdefault("experts", {})
+    state.setdefault("analyses", [])
+    return state
+
+
+def save_state(state: dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def reserve_analysis(path: Path = STATE_PATH) -> float:
+    """Count an analysis against the budget as its job is dispatched.
+
+    Returns:
+        The reservation, to pass to record_update() once the job finishes
+    """
+    now = time.time()
+    state = load_state(path)
+    state["analyses"] = [t for t in state["analyses"] if t > now - DAY] + [now]
+    save_state(state, path)
+    return now
+
+
+def record_update(
+    name: str,
+    result: dict,
+    *,
+    analyzed: bool,
+    reserved: float | None = None,
+    path: Path = STATE_PATH,
+) -> None:
+    """Record the outcome of an update so the scheduler can skip fresh experts.
+
+    Args:
+        name: Expert name
+        result: Result dict from core.update_expert / update_expert_async_internal
+        analyzed: Whether the update ran AI analysis. Updated and failed
+            runs count against the budget, since a failing analysis still
+            costs engine time.
+        reserved: Reservation from reserve_analysis(), if the job was
+            counted at dispatch. It is released if the update turns out
+            up to date or is cancelled.
+    """
+    now = time.time()
+    state = load_state(path)
+    analyses = [t for t in state["analyses"] if t > now - DAY and t != reserved]
+    if result.get("cancelled"):
+        if reserved is not None:
+            state["analyses"] = analyses
+            save_state(state, path)
+        return
+    if result.get("success"):
+        outcome = "up_to_date" if result.get("already_up_to_date") else "updated"
+    else:
+        outcome = "failed"
+    state["experts"][name] = {"last_run": now, "outcome": outcome}
+    if analyzed and outcome != "up_to_date":
+        analyses.append(reserved or now)
+    state["analyses"] = analyses
+    save_state(state, path)
+
+
+def last_run(name: str, state: dict, expert_dir: Path) -> float | None:
+    """When the expert was last refreshed, by the scheduler or by hand.
+
+    Manual updates that moved HEAD are visible through the HEAD symlink's mtime.
+    """
+    times = []
+    recorded = state["experts"].get(name, {}).get("last_run")
+    if recorded:
+        times.append(recorded)
+    try:
+        times.append((expert_dir / "HEAD").lstat().st_mtime)
+    except OSError:
+        pass
+    return max(times) if times else None
+
+
+# --- Planning ---
+
+
+@dataclass
+class ScheduleEntry:
+    """Planned refresh of one expert."""
+
+    name: str
+    policy: Policy
+    last_run: float | None
+    next_run: float
+
+
+def idle(names: list[str], schedule: dict, usage: dict[str, dict] | None) -> list[str]:
+    """Experts not used within schedule["idle_after"], which are not refreshed.
+
+    Nothing is idle without usage data (usage empty or None).
+    """
+    if "idle_after" not in schedule or not usage:
+        return []
+    cutoff = time.time() - parse_interval(schedule["idle_after"])
+    return [name for name in names if usage.get(name, {}).get("last_used", 0) < cutoff]
+
+
+def invalid_policies(names: list[str], schedule: dict) -> dict[str, str]:
+    """Experts whose policy can't be parsed, with the error; they never run."""
+    invalid: dict[str, str] = {}
+    for name in names:
+        try:
+            policy_for(name, schedule)
+        except ValueError as e:
+            invalid[name] = str(e)
+    return invalid
+
+
+def upcoming(
+    names: list[str],
+    schedule: dict,
+    state: dict,
+    expert_dirs: dict[str, Path],
+    usage: dict[str, dict] | None = None,
+) -> list[ScheduleEntry]:
+    """Return the schedule for the given experts, soonest first.
+
+    Experts with no policy or an invalid one (see invalid_policies), and
+    idle experts, are left out.
+    """
+    now = time.time()
+    min_age = parse_interval(schedule["min_age"]) if "min_age" in schedule else 0
+    skipped = set(idle(names, schedule, usage))
+    entries: list[ScheduleEntry] = []
+    for name in names:
+        if name in skipped:
+            continue
+        try:
+            policy = policy_for(name, schedule)
+        except ValueError:
+            continue
+        if policy is None:
+            continue
+        last = last_run(name, state, expert_dirs[name])
+        next_time = policy.next_run(last, now)
+        if last is not None:
+            next_time = max(next_time, last + min_age)
+        entries.append(ScheduleEntry(name, policy, last, next_time))
+    entries.sort(key=lambda e: e.next_run)
+    return entries
+
+
+def analyses_left(schedule: dict, state: dict) -> int | None:
+    """Remaining analyses in the rolling 24h budget, or None if unlimited."""
+    limit = schedule.get("max_analyses_per_day")
+    if limit is None:
+        return None
+    now = time.time()
+    used = sum(1 for t in state["analyses"] if t > now - DAY)
+    return max(0, limit - used)
+
+
+def due(
+    names: list[str],
+    schedule: dict,
+    state: dict,
+    expert_dirs: dict[str, Path],
+    *,
+    running: set[str],
+    running_scheduled: int,
+    usage: dict[str, dict] | None = None,
+) -> list[ScheduleEntry]:
+    """Pick experts to start now under the concurrency and cost budget.
+
+    Args:
+        names: Enabled experts
+        schedule: "schedule" section of config.json
+        state: Scheduler state from load_state()
+        expert_dirs: Expert name -> expert directory
+        running: Experts with a queued or running job (never started twice)
+        running_scheduled: Scheduled jobs still in flight
+        usage: Expert name -> {"count", "last_used"} (see usage.UsageIndex)
+    """
+    now = time.time()
+    slots = schedule.get("max_concurrent", 1) - running_scheduled
+    budget = analyses_left(schedule, state)
+    usage = usage or {}
+
+    # Of the experts due now, the most used go first
+    due_now = [
+        entry
+        for entry in upcoming(names, schedule, state, expert_dirs, usage)
+        if entry.next_run <= now
+    ]
+    due_now.sort(key=lambda e: -usage.get(e.name, {}).get("count", 0))
+
+    picked: list[ScheduleEntry] = []
+    for entry in due_now:
+        if slots <= 0:
+            break
+        if entry.name in running:
+            continue
+        if not entry.policy.skip_analysis:
+            if budget is not None and budget <= 0:
+                continue
+            if budget is not None:
+                budget -= 1
+        picked.append(entry)
+        slots -= 1
+    return picked
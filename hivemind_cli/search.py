@@ -0,0 +1,211 @@
+"""Full-text search over knowledge docs and crawled external docs.
+
+The index is a SQLite FTS5 table with one row per markdown section (a
+heading and the text up to the next heading), so every term of a query can
+match anywhere in the section; hits point at the line of the first match.
+A side table records each file's mtime and size; refresh() re-indexes only
+files that changed and drops files that are gone, so searches stay fast
+without rescanning file contents.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+# Snippet highlight markers, replaced by the caller's own styling
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+# Bumped when the layout changes; older indexes are rebuilt from scratch
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    expert TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+-- Rowids of each file's sections, so a file is dropped without scanning
+-- the FTS table's unindexed path column
+CREATE TABLE IF NOT EXISTS section_rows (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS section_rows_path ON section_rows (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS sections USING fts5(
+    text,
+    path UNINDEXED,
+    expert UNINDEXED,
+    line UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+_DROP = """
+DROP TABLE IF EXISTS lines;
+DROP TABLE IF EXISTS sections;
+DROP TABLE IF EXISTS section_rows;
+DROP TABLE IF EXISTS files;
+"""
+
+_HEADING_RE = re.compile(r"#{1,6}\s")
+_FENCE_RE = re.compile(r"\s*(```|~~~)")
+
+
+def split_sections(text: str) -> Iterator[tuple[int, str]]:
+    """Split markdown into (first line number, text) sections at headings.
+
+    Lines starting with # inside fenced code blocks are not headings.
+    Sections with no text are skipped.
+    """
+    start, lines, fenced = 1, [], False
+    for number, line in enumerate(text.splitlines(), 1):
+        if _FENCE_RE.match(line):
+            fenced = not fenced
+        elif not fenced and _HEADING_RE.match(line) and lines:
+            if any(part.strip() for part in lines):
+                yield start, "\n".join(lines)
+            start, lines = number, []
+        lines.append(line)
+    if any(part.strip() for part in lines):
+        yield start, "\n".join(lines)
+
+
+@dataclass
+class SearchHit:
+    """One matching section, located at its first match."""
+
+    path: Path
+    line: int
+    expert: str
+    snippet: str  # Matches wrapped in MATCH_START/MATCH_END
+    score: float  # Higher is better
+
+
+def build_query(terms: str) -> str:
+    """Turn free text into an FTS5 query matching sections with every term.
+
+    Terms are quoted so FTS5 operators in user input are taken literally; a
+    trailing * keeps prefix matching (e.g. "deploy*").
+    """
+    parts = []
+    for token in terms.split():
+        prefix = token.endswith("*")
+        words = re.findall(r"\w+", token)
+        if not words:
+            continue
+        phrase = '"' + " ".join(words) + '"'
+        parts.append(phrase + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """Persistent, incrementally updated FTS5 index of markdown docs."""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        (version,) = self._db.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            self._db.executescript(_DROP)
+            self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def refresh(self, files: dict[Path, str]) -> tuple[int, int]:
+        """Bring the index in line with the given files.
+
+        Args:
+            files: Markdown file -> expert it belongs to
+
+        Returns:
+            (files re-indexed, files removed)
+        """
+        known = {
+            Path(path): (mtime_ns, size)
+            for path, mtime_ns, size in self._db.execute(
+                "SELECT path, mtime_ns, size FROM files"
+            )
+        }
+
+        changed: list[tuple[Path, str, int, int]] = []
+        for path, expert in files.items():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if known.get(path) != (st.st_mtime_ns, st.st_size):
+                changed.append((path, expert, st.st_mtime_ns, st.st_size))
+        removed = [path for path in known if path not in files]
+
+        if not changed and not removed:
+            return 0, 0
+
+        with self._db:
+            for path in removed:
+                self._delete(path)
+            for path, expert, mtime_ns, size in changed:
+                self._delete(path)
+                try:
+                    text = path.read_text(errors="replace")
+                except OSError:
+                    continue
+                for number, section in split_sections(text):
+                    row = self._db.execute(
+                        "INSERT INTO section_rows (path) VALUES (?)", (str(path),)
+                    ).lastrowid
+                    self._db.execute(
+                        "INSERT INTO sections (rowid, text, path, expert, line) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (row, section, str(path), expert, number),
+                    )
+                self._db.execute(
+                    "INSERT INTO files (path, expert, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                    (str(path), expert, mtime_ns, size),
+                )
+        return len(changed), len(removed)
+
+    def _delete(self, path: Path) -> None:
+        self._db.execute(
+            "DELETE FROM sections WHERE rowid IN "
+            "(SELECT id FROM section_rows WHERE path = ?)",
+            (str(path),),
+        )
+        self._db.execute("DELETE FROM section_rows WHERE path = ?", (str(path),))
+        self._db.execute("DELETE FROM files WHERE path = ?", (str(path),))
+
+    def search(
+        self, terms: str, *, expert: str | None = None, limit: int = 20
+    ) -> list[SearchHit]:
+        """Return the best matching sections, best first."""
+        query = build_query(terms)
+        if not query:
+            return []
+
+        sql = (
+            "SELECT path, line, expert, "
+            f"snippet(sections, 0, '{MATCH_START}', '{MATCH_END}', '…', 16), "
+            f"highlight(sections, 0, '{MATCH_START}', '{MATCH_END}'), "
+            "bm25(sections) FROM sections WHERE sections MATCH ?"
+        )
+        params: list = [query]
+        if expert:
+            sql += " AND expert = ?"
+            params.append(expert)
+        sql += " ORDER BY bm25(sections) LIMIT ?"
+        params.append(limit)
+
+        hits = []
+        for path, line, name, snippet, marked, score in self._db.execute(sql, params):
+            # Point at the line of the section's first match
+            line = int(line) + marked[: marked.find(MATCH_START)].count("\n")
+            snippet = " ".join(snippet.split())
+            hits.append(SearchHit(Path(path), line, name, snippet, -score))
+        return hits
@@ -0,0 +1,154 @@
+"""Offline semantic expert routing with hashed n-gram vectors.
+
+Each expert's weighted terms (from the routing index) are expanded into
+word and character n-gram features and hashed into a fixed number of
+dimensions, so no vocabulary, network access or model download is needed.
+Character n-grams let paraphrases and inflections ("containers", "shell-less")
+still overlap with the docs' wording.
+
+Vectors live in memory-mapped float32 files under the cache directory:
+counts.f32 holds raw per-expert feature counts (recomputed only for experts
+whose docs changed) and vectors.f32 the TF-IDF weighted, L2-normalized rows,
+so a query is a single matrix-vector product.
+
+Requires numpy (the "semantic" extra).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from hivemind_cli.routing import RoutingIndex, tokenize
+
+DIM = 1 << 13
+NGRAM_SIZES = (3, 4, 5)
+WORD_WEIGHT = 2
+
+
+def _features(terms: Counter | dict[str, int]) -> Counter:
+    """Expand term counts into hashed word and character n-gram counts."""
+    features: Counter = Counter()
+    for term, count in terms.items():
+        features[zlib.crc32(f"w:{term}".encode()) & (DIM - 1)] += WORD_WEIGHT * count
+        padded = f"<{term}>"
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                features[zlib.crc32(padded[i : i + n].encode()) & (DIM - 1)] += count
+    return features
+
+
+def _row(terms: dict[str, int]) -> np.ndarray:
+    row = np.zeros(DIM, dtype=np.float32)
+    features = _features(terms)
+    if features:
+        row[list(features)] = list(features.values())
+    return row
+
+
+class SemanticIndex:
+    """Memory-mapped TF-IDF matrix over hashed n-gram features."""
+
+    def __init__(self, directory: Path):
+        self._dir = directory
+        self._meta_path = directory / "meta.json"
+        try:
+            self._meta = json.loads(self._meta_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            self._meta = {}
+        if self._meta.get("dim") != DIM:
+            self._meta = {"dim": DIM, "names": [], "signatures": {}}
+
+    @property
+    def names(self) -> list[str]:
+        return self._meta["names"]
+
+    def _open(self, filename: str, rows: int, mode: str = "r") -> np.ndarray:
+        return np.memmap(self._dir / filename, dtype=np.float32, mode=mode, shape=(rows, DIM))
+
+    def refresh(self, routing: RoutingIndex) -> bool:
+        """Rebuild rows for experts whose routing index entry changed.
+
+        Returns:
+            True if the index changed
+        """
+        names = sorted(routing.experts)
+        signatures = {n: routing.experts[n]["signature"] for n in names}
+        if names == self.names and signatures == self._meta["signatures"]:
+            return False
+
+        old_rows = {name: i for i, name in enumerate(self.names)}
+        old_counts = self._open("counts.f32", len(self.names)) if self.names else None
+
+        counts = np.zeros((len(names), DIM), dtype=np.float32)
+        for i, name in enumerate(names):
+            if name in old_rows and self._meta["signatures"].get(name) == signatures[name]:
+                counts[i] = old_counts[old_rows[name]]
+            else:
+                counts[i] = _row(routing.experts[name]["terms"])
+        del old_counts
+
+        # TF-IDF with sublinear term frequency, then L2-normalize each row
+        df = np.count_nonzero(counts, axis=0)
+        idf = (np.log((1 + len(names)) / (1 + df)) + 1).astype(np.float32)
+        vectors = np.log1p(counts) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        self._dir.mkdir(parents=True, exist_ok=True)
+        for filename, array in (
+            ("counts.f32", counts),
+            ("vectors.f32", vectors),
+            ("idf.f32", idf[np.newaxis, :]),
+        ):
+            tmp = self._dir / f".{filename}.{os.getpid()}.tmp"
+            array.astype(np.float32).tofile(tmp)
+            os.replace(tmp, self._dir / filename)
+
+        self._meta = {"dim": DIM, "names": names, "signatures": signatures}
+        tmp = self._dir / f".meta.json.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(self._meta))
+        os.replace(tmp, self._meta_path)
+        return True
+
+    def rank(
+        self, question: str, names: list[str] | None = None, limit: int | None = None
+    ) -> list[tuple[str, float]]:
+        """Rank experts by cosine similarity to the question, best first.
+
+        Args:
+            question: Free-text question
+            names: Restrict ranking to these experts (default: all indexed)
+            limit: Maximum number of results
+
+        Returns:
+            (expert name, similarity) pairs with a positive similarity
+        """
+        if not self.names:
+            return []
+        query = _row(Counter(tokenize(question)))
+        if not query.any():
+            return []
+
+        idf = self._open("idf.f32", 1)[0]
+        query = np.log1p(query) * idf
+        query /= np.linalg.norm(query)
+        scores = self._open("vectors.f32", len(self.names)) @ query
+
+        allowed = set(names) if names is not None else None
+        order = np.argsort(-scores)
+        results: list[tuple[str, float]] = []
+        for i in order:
+            name = self.names[i]
+            score = float(scores[i])
+            if score <= 0 or (limit and len(results) >= limit):
+                break
+            if allowed is None or name in allowed:
+                results.append((name, score))
+        return results
+
@@ -6,33 +6,20 @@ import asyncio
 from typing import TYPE_CHECKING
 
 from hivemind_cli.core import (
+    CancellationToken,
     UpdatePhase,
     ProgressInfo,
     update_expert,
-    enable_expert,
-    disable_expert,
+    enable_experts,
+    disable_experts,
 )
+from hivemind_cli.daemon import DaemonClient
 from hivemind_cli.tui.models import OperationStatus
 
 if TYPE_CHECKING:
     from hivemind_cli.tui.screens.main_screen import MainScreen
 
 
-class CancellationToken:
-    """Token to signal and check for cancellation."""
-
-    def __init__(self):
-        self._cancelled = False
-
-    def cancel(self):
-        """Signal cancellation."""
-        self._cancelled = True
-
-    def is_cancelled(self) -> bool:
-        """Check if cancelled."""
-        return self._cancelled
-
-
 def create_tui_progress_callback(screen: MainScreen, expert_name: str):
     """Create a progress callback that updates the TUI."""
 
@@ -51,6 +38,32 @@ def create_tui_progress_callback(screen: MainScreen, expert_name: str):
     return on_progress
 
 
+async def _update_via_daemon(
+    client: DaemonClient,
+    expert_name: str,
+    on_progress,
+    token: CancellationToken,
+) -> dict:
+    """Run an update through the daemon's job queue, forwarding its progress."""
+    loop = asyncio.get_running_loop()
+
+    def on_event(event: dict) -> None:
+        info = ProgressInfo(**{**event, "phase": UpdatePhase(event["phase"])})
+        loop.call_soon_threadsafe(on_progress, info)
+
+    call = asyncio.ensure_future(
+        asyncio.to_thread(client.call, "update", {"names": [expert_name]}, on_event)
+    )
+    cancel_sent = False
+    while not call.done():
+        if token.is_cancelled() and not cancel_sent:
+            await asyncio.to_thread(client.call, "cancel", {"name": expert_name})
+            cancel_sent = True
+        await asyncio.wait({call}, timeout=0.5)
+
+    return call.result()["results"][expert_name]
+
+
 async def update_expert_async(screen: MainScreen, expert_name: str, token: CancellationToken):
     """Async wrapper for updating an expert with cancellation support."""
     from hivemind_cli.core import update_expert_async_internal
@@ -62,12 +75,16 @@ async def update_expert_async(screen: MainScreen, expert_name: str, token: Cance
         screen.register_subprocess_pid(expert_name, pid)
 
     try:
-        result = await update_expert_async_internal(
-            expert_name,
-            on_progress=callback,
-            on_subprocess_start=on_pid,
-            cancellation_token=token,
-        )
+        client = DaemonClient.connect()
+        if client:
+            result = await _update_via_daemon(client, expert_name, callback, token)
+        else:
+            result = await update_expert_async_internal(
+                expert_name,
+                on_progress=callback,
+                on_subprocess_start=on_pid,
+                cancellation_token=token,
+            )
 
         if result.get("cancelled"):
             screen.notify(f"{expert_name}: cancelled", severity="warning")
@@ -102,32 +119,46 @@ async def update_expert_async(screen: MainScreen, expert_name: str, token: Cance
         screen.app.refresh_experts()
 
 
-def enable_expert_sync(screen: MainScreen, expert_name: str):
-    """Synchronous wrapper for enabling an expert in the TUI."""
-    result = enable_expert(expert_name)
+def enable_experts_sync(screen: MainScreen, expert_names: list[str]):
+    """Synchronous wrapper for enabling experts in the TUI."""
+    client = DaemonClient.connect()
+    if client:
+        results = client.call("enable", {"names": expert_names})["results"]
+    else:
+        results = enable_experts(expert_names)
 
-    if result["success"]:
-        if result["already_enabled"]:
-            screen.notify(f"{expert_name}: already enabled", severity="information")
+    for expert_name, result in results.items():
+        if result["success"]:
+            if result["already_enabled"]:
+                screen.notify(f"{expert_name}: already enabled", severity="information")
+            else:
+                screen.notify(f"Enabled: {expert_name}", severity="information")
         else:
-            screen.notify(f"Enabled: {expert_name}", severity="information")
-    else:
-        screen.notify(f"Failed to enable {expert_name}: {result['error']}", severity="error")
+            screen.notify(
+                f"Failed to enable {expert_name}: {result['error']}", severity="error"
+            )
 
     screen.app.refresh_experts()
 
 
-def disable_expert_sync(screen: MainScreen, expert_name: str):
-    """Synchronous wrapper for disabling an expert in the TUI."""
-    result = disable_expert(expert_name)
+def disable_experts_sync(screen: MainScreen, expert_names: list[str]):
+    """Synchronous wrapper for disabling experts in the TUI."""
+    client = DaemonClient.connect()
+    if client:
+        results = client.call("disable", {"names": expert_names})["results"]
+    else:
+        results = disable_experts(expert_names)
 
-    if result["success"]:
-        if result["already_disabled"]:
-            screen.notify(f"{expert_name}: already disabled", severity="information")
+    for expert_name, result in results.items():
+        if result["success"]:
+            if result["already_disabled"]:
+                screen.notify(f"{expert_name}: already disabled", severity="information")
+            else:
+                screen.notify(f"Disabled: {expert_name}", severity="warning")
         else:
-            screen.notify(f"Disabled: {expert_name}", severity="warning")
-    else:
-        screen.notify(f"Failed to disable {expert_name}: {result['error']}", severity="error")
+            screen.notify(
+                f"Failed to disable {expert_name}: {result['error']}", severity="error"
+            )
 
     screen.app.refresh_experts()
 
@@ -12,8 +12,8 @@ from hivemind_cli.tui.models import ExpertRow, OperationStatus
 from hivemind_cli.tui.widgets import ExpertTable, SearchBar
 from hivemind_cli.tui.operations import (
     update_expert_async,
-    enable_expert_sync,
-    disable_expert_sync,
+    enable_experts_sync,
+    disable_experts_sync,
 )
 
 
@@ -158,8 +158,7 @@ class MainScreen(Screen):
                 selected = [current.name]
 
         if selected:
-            for name in selected:
-                enable_expert_sync(self, name)
+            enable_experts_sync(self, selected)
 
             # Clear selections
             table.clear_selection()
@@ -175,8 +174,7 @@ class MainScreen(Screen):
                 selected = [current.name]
 
         if selected:
-            for name in selected:
-                disable_expert_sync(self, name)
+            disable_experts_sync(self, selected)
 
             # Clear selections
             table.clear_selection()
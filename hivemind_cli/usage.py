@@ -0,0 +1,187 @@
+"""Expert usage counted from local assistant session transcripts.
+
+Assistants record each subagent delegation in their transcripts as a tool
+call with "subagent_type": "expert-<name>". UsageIndex counts these per
+session, along with when each expert was last used. Transcripts are
+append-only, so each file is read on from where the previous scan stopped; a
+file that shrank or was replaced is recounted from the start. OpenCode keeps
+a session as many small JSON part files, rewritten as a tool call
+progresses; only parts changed since the last scan are read, and each part
+is counted once. Sessions whose files the assistant has since deleted are
+folded into a retired total, so history outlives its cleanup without the
+index growing with it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+
+INDEX_VERSION = 2
+
+_DELEGATION_RE = re.compile(rb'"subagent_type"\s*:\s*"expert-([\w.\-]+)"')
+_TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"]+)"')
+_SESSION_RE = re.compile(rb'"sessionID"\s*:\s*"([^"]+)"')
+
+
+def _line_time(line: bytes, default: float) -> float:
+    """Time a transcript line was written, from its "timestamp" if it has one."""
+    match = _TIMESTAMP_RE.search(line)
+    if match:
+        try:
+            text = match.group(1).decode().replace("Z", "+00:00")
+            return datetime.fromisoformat(text).timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+def _count(entry: dict, name: str, used: float) -> None:
+    entry["counts"][name] = entry["counts"].get(name, 0) + 1
+    entry["last_used"][name] = max(entry["last_used"].get(name, 0), used)
+
+
+class UsageIndex:
+    """Persistent per-session delegation counts."""
+
+    def __init__(
+        self,
+        sessions: dict[str, dict] | None = None,
+        retired: dict | None = None,
+        scanned_at: float = 0.0,
+    ):
+        # Session -> {"counts": {name: n}, "last_used": {name: t}}, plus "ino"
+        # and "offset" for a .jsonl transcript (keyed by its path), or
+        # "parts" (paths of the parts counted) for a session of JSON parts
+        self.sessions = sessions or {}
+        # Totals of sessions whose files are gone
+        self.retired = retired or {"counts": {}, "last_used": {}}
+        self.scanned_at = scanned_at
+
+    @classmethod
+    def load(cls, path: Path) -> UsageIndex:
+        """Load saved counts, or return an empty index if missing or stale."""
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data["sessions"], data["retired"], data["scanned_at"])
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "version": INDEX_VERSION,
+                    "scanned_at": self.scanned_at,
+                    "sessions": self.sessions,
+                    "retired": self.retired,
+                }
+            )
+        )
+        os.replace(tmp, path)
+
+    def refresh(self, transcripts: list[Path]) -> int:
+        """Count delegations added to transcripts since the last scan.
+
+        Sessions whose files no longer exist are then retired.
+
+        Returns:
+            Number of transcripts read
+        """
+        started = time.time()
+        read = 0
+        for path in transcripts:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if path.suffix == ".json":
+                read += self._read_part(path, st)
+            else:
+                read += self._read_transcript(path, st)
+        self._retire_deleted()
+        # Parts written while this scan ran are read again next time
+        self.scanned_at = started
+        return read
+
+    def _read_transcript(self, path: Path, st: os.stat_result) -> int:
+        """Count what was appended to a .jsonl transcript; returns 1 if read."""
+        entry = self.sessions.get(str(path))
+        if entry and entry["ino"] == st.st_ino and entry["offset"] == st.st_size:
+            return 0
+        if entry is None or entry["ino"] != st.st_ino or st.st_size < entry["offset"]:
+            entry = {"ino": st.st_ino, "offset": 0, "counts": {}, "last_used": {}}
+            self.sessions[str(path)] = entry
+
+        try:
+            with open(path, "rb") as f:
+                f.seek(entry["offset"])
+                data = f.read()
+        except OSError:
+            return 0
+
+        # Leave a partly written last line for the next scan
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if b"expert-" not in line:
+                continue
+            for match in _DELEGATION_RE.finditer(line):
+                _count(entry, match.group(1).decode(), _line_time(line, st.st_mtime))
+        entry["offset"] += end
+        return 1
+
+    def _read_part(self, path: Path, st: os.stat_result) -> int:
+        """Count a JSON message part into its session; returns 1 if read."""
+        if st.st_mtime < self.scanned_at:
+            return 0
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return 0
+
+        names = [match.group(1).decode() for match in _DELEGATION_RE.finditer(data)]
+        if not names:
+            return 1
+        match = _SESSION_RE.search(data)
+        session = match.group(1).decode() if match else str(path.parent)
+        entry = self.sessions.setdefault(
+            session, {"counts": {}, "last_used": {}, "parts": []}
+        )
+        if str(path) in entry["parts"]:
+            return 1  # A rewrite of a part already counted
+        entry["parts"].append(str(path))
+        for name in names:
+            _count(entry, name, _line_time(data, st.st_mtime))
+        return 1
+
+    def _retire_deleted(self) -> None:
+        """Fold sessions whose files are all gone into the retired totals."""
+        for session, entry in list(self.sessions.items()):
+            files = entry.get("parts") or [session]
+            if any(os.path.exists(file) for file in files):
+                continue
+            for name, count in entry["counts"].items():
+                self.retired["counts"][name] = self.retired["counts"].get(name, 0) + count
+                self.retired["last_used"][name] = max(
+                    self.retired["last_used"].get(name, 0), entry["last_used"][name]
+                )
+            del self.sessions[session]
+
+    @property
+    def experts(self) -> dict[str, dict]:
+        """Expert name -> {"count": delegations, "last_used": timestamp}."""
+        totals: dict[str, dict] = {}
+        for entry in [*self.sessions.values(), self.retired]:
+            for name, count in entry["counts"].items():
+                total = totals.setdefault(name, {"count": 0, "last_used": 0.0})
+                total["count"] += count
+                total["last_used"] = max(total["last_used"], entry["last_used"][name])
+        return totals
@@ -0,0 +1,173 @@
+"""Change detection for a set of files, with inotify or polling.
+
+Watcher reports which watched files changed by comparing each file's inode,
+mtime and size. On Linux, inotify watches on the files' directories wake it
+as soon as something is written, renamed or deleted there; elsewhere (or
+with polling=True) it re-checks every interval. Directories are watched
+rather than files so editors that save by renaming a temp file over the
+original are still seen.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import time
+from pathlib import Path
+
+POLL_INTERVAL = 0.5
+
+# Quiet period after the first event, so a save's write/rename burst is
+# handled once
+DEBOUNCE = 0.02
+
+# inotify(7) flags
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_MASK = (
+    _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+
+
+def _signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API."""
+
+    def __init__(self):
+        import ctypes
+
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add(self, directory: Path) -> int | None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _MASK)
+        return wd if wd >= 0 else None
+
+    def remove(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def drain(self) -> None:
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _open_inotify() -> _Inotify | None:
+    try:
+        return _Inotify()
+    except (OSError, AttributeError):
+        # No inotify on this platform (AttributeError: symbol missing from libc)
+        return None
+
+
+class Watcher:
+    """Waits for changes to a set of files, each labeled with a key."""
+
+    def __init__(
+        self,
+        files: dict[Path, str],
+        *,
+        polling: bool = False,
+        interval: float = POLL_INTERVAL,
+    ):
+        self._interval = interval
+        self._inotify = None if polling else _open_inotify()
+        self._watches: dict[Path, int] = {}
+        self._files: dict[Path, str] = {}
+        self._signatures: dict[Path, tuple[int, int, int] | None] = {}
+        self.update(files)
+
+    def __enter__(self) -> Watcher:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def backend(self) -> str:
+        return "polling" if self._inotify is None else "inotify"
+
+    def update(self, files: dict[Path, str]) -> None:
+        """Replace the watched files.
+
+        Newly watched files start from their current state; files already
+        watched keep theirs, so changes made meanwhile are still reported.
+        """
+        self._files = dict(files)
+        self._signatures = {
+            path: self._signatures[path] if path in self._signatures else _signature(path)
+            for path in files
+        }
+        if self._inotify is None:
+            return
+
+        # Each file's directory, plus its parent so a directory that is
+        # swapped or created (e.g. a re-pointed HEAD symlink) is noticed
+        dirs: set[Path] = set()
+        for path in files:
+            dirs.add(path.parent.resolve())
+            dirs.add(path.parent.parent.resolve())
+        for directory in set(self._watches) - dirs:
+            self._inotify.remove(self._watches.pop(directory))
+        for directory in dirs - set(self._watches):
+            wd = self._inotify.add(directory)
+            if wd is not None:
+                self._watches[directory] = wd
+
+    def wait(self, timeout: float | None = None) -> set[str]:
+        """Block until watched files change.
+
+        Returns:
+            Keys of the changed files (empty if the timeout expired first)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._inotify is None:
+                time.sleep(self._interval if remaining is None else min(self._interval, remaining))
+            else:
+                ready, _, _ = select.select([self._inotify.fd], [], [], remaining)
+                if ready:
+                    time.sleep(DEBOUNCE)
+                    self._inotify.drain()
+
+            changed = self._changed()
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def _changed(self) -> set[str]:
+        changed: set[str] = set()
+        for path, key in self._files.items():
+            signature = _signature(path)
+            if signature != self._signatures[path]:
+                self._signatures[path] = signature
+                changed.add(key)
+        return changed
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Fail when importing the CLI module gets slower than the startup budget.
+
+Runs `python -X importtime -c "import hivemind_cli.cli"` a few times, takes the
+fastest cumulative import time, and also checks that modules which commands
+are supposed to import lazily were not pulled in at startup.
+
+Usage:
+    python scripts/check_import_time.py                  # Default budget
+    python scripts/check_import_time.py --budget-ms 80   # Custom budget
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+HIVEMIND_ROOT = Path(__file__).resolve().parent.parent
+MODULE = "hivemind_cli.cli"
+
+# Modules that must only be imported by the commands that need them
+LAZY_MODULES = [
+    "asyncio",
+    "rich.console",
+    "rich.traceback",
+    "hivemind_cli.core",
+    "hivemind_cli.providers",
+    "hivemind_cli.templates",
+    "textual",
+    "crawl4ai",
+]
+
+
+def measure(module: str) -> tuple[int, set[str]]:
+    """Import module in a fresh interpreter.
+
+    Returns:
+        (cumulative import time of module in microseconds, imported module names)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(HIVEMIND_ROOT),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0
+    imported: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            total = int(cumulative.strip())
+    return total, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=120.0,
+        help="Maximum cumulative import time in milliseconds (default: 120)",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of fresh interpreters to measure (fastest wins, default: 5)",
+    )
+    args = parser.parse_args()
+
+    samples = [measure(MODULE) for _ in range(args.runs)]
+    best_us = min(total for total, _ in samples)
+    imported = samples[0][1]
+
+    failed = False
+    eager = [m for m in LAZY_MODULES if m in imported]
+    if eager:
+        print(f"FAIL: {MODULE} eagerly imports: {', '.join(eager)}")
+        failed = True
+
+    best_ms = best_us / 1000
+    if best_ms > args.budget_ms:
+        print(f"FAIL: {MODULE} imports in {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        failed = True
+    else:
+        print(f"OK: {MODULE} imports in {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())